@@ -0,0 +1,3 @@
+#!/bin/bash
+
+cd "$(dirname "$0")/src" && python3 -m benchmarks "$@"
\ No newline at end of file
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-python3 src/main.py
+python3 src/main.py build "$@"
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the site generator.
+
+Run from the repository root with ./bench.sh, or from src with python3 -m benchmarks.
+"""
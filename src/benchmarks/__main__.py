@@ -0,0 +1,66 @@
+from typing import List, Optional
+import argparse
+import sys
+
+from benchmarks import memory
+from benchmarks.corpus import CORPUS_KINDS, write_corpus
+from benchmarks.runner import DEFAULT_THRESHOLD, compare_results, load_results, run_benchmarks, save_results, select_scenarios
+
+def print_comparisons(comparisons: List[dict]) -> bool:
+    regressed = False
+    for entry in comparisons:
+        flag = "REGRESSION" if entry["regression"] else ""
+        regressed = regressed or entry["regression"]
+        print(f"{entry['name']:<40} {entry['baseline'] * 1000:>10.2f}ms {entry['current'] * 1000:>10.2f}ms {entry['ratio']:>6.2f}x {flag}")
+    return regressed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Run the site generator benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the benchmark scenarios")
+    run_parser.add_argument("scenarios", nargs="*", help="shell-style patterns selecting scenarios (default: all)")
+    run_parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario")
+    run_parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    run_parser.add_argument("--baseline", help="compare against saved results and fail on regressions")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before flagging a regression")
+    run_parser.add_argument("--list", action="store_true", help="list the selected scenarios without running them")
+
+    compare_parser = commands.add_parser("compare", help="compare two saved results files")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before flagging a regression")
+
+    corpus_parser = commands.add_parser("corpus", help="write a synthetic content directory")
+    corpus_parser.add_argument("directory")
+    corpus_parser.add_argument("--kind", choices=CORPUS_KINDS, default="short")
+    corpus_parser.add_argument("--pages", type=int, default=1000)
+    corpus_parser.add_argument("--seed", type=int, default=0)
+
+    memory_parser = commands.add_parser("memory", help="report bytes per node")
+    memory_parser.add_argument("--count", type=int, default=100_000, help="number of nodes to allocate per measurement")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        names = select_scenarios(args.scenarios)
+        if args.list:
+            print("\n".join(names))
+            return 0
+        data = run_benchmarks(names, args.repeat, lambda name, timing: print(f"{name:<40} {timing['best'] * 1000:>10.2f}ms"))
+        if args.output:
+            save_results(args.output, data)
+        if args.baseline:
+            print()
+            return 1 if print_comparisons(compare_results(data, load_results(args.baseline), args.threshold)) else 0
+    elif args.command == "compare":
+        comparisons = compare_results(load_results(args.current), load_results(args.baseline), args.threshold)
+        return 1 if print_comparisons(comparisons) else 0
+    elif args.command == "corpus":
+        paths = write_corpus(args.directory, args.kind, args.pages, args.seed)
+        print(f"Wrote {len(paths)} pages into {args.directory}")
+    elif args.command == "memory":
+        memory.report(args.count)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+from typing import List
+import os
+import random
+
+WORDS = (
+    "static site generator markdown page content render build template node text "
+    "bold italic code link image paragraph heading list quote fast slow cache index"
+).split()
+
+CORPUS_KINDS = ("short", "huge", "link_dense", "delimiter_heavy")
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def generate_paragraph(rng: random.Random, inline_density: float = 0.2) -> str:
+    """
+    Generates one paragraph of prose with inline markdown mixed in.
+
+    Args:
+        rng (random.Random): Source of randomness, seeded by the caller.
+        inline_density (float): Probability that each phrase carries inline markup.
+
+    Returns:
+        str: A single-line paragraph.
+    """
+    parts = []
+    for _ in range(rng.randint(4, 12)):
+        phrase = _words(rng, rng.randint(2, 6))
+        if rng.random() < inline_density:
+            kind = rng.randrange(5)
+            if kind == 0:
+                phrase = f"**{phrase}**"
+            elif kind == 1:
+                phrase = f"*{phrase}*"
+            elif kind == 2:
+                phrase = f"`{phrase}`"
+            elif kind == 3:
+                phrase = f"[{phrase}](/{rng.choice(WORDS)}/{rng.randrange(1000)}.html)"
+            else:
+                phrase = f"![{phrase}](/images/{rng.randrange(1000)}.png)"
+        parts.append(phrase)
+    return " ".join(parts) + "."
+
+def generate_link_dense_paragraph(rng: random.Random) -> str:
+    """
+    Generates a paragraph made mostly of links and images, like a navigation or index page.
+    """
+    parts = []
+    for i in range(rng.randint(10, 30)):
+        if i % 3 == 2:
+            parts.append(f"![{_words(rng, 2)}](/images/{rng.randrange(1000)}.png)")
+        else:
+            parts.append(f"[{_words(rng, 2)}](https://example.com/{rng.choice(WORDS)}/{rng.randrange(1000)})")
+    return " | ".join(parts)
+
+def generate_delimiter_heavy_text(rng: random.Random, length: int = 2000) -> str:
+    """
+    Generates pathological text full of unbalanced delimiters and brackets.
+    """
+    tokens = ["*", "**", "`", "[", "]", "(", ")", "![", "](", "a", " ", "word"]
+    return "".join(rng.choice(tokens) for _ in range(length))
+
+def generate_page(rng: random.Random, kind: str) -> str:
+    """
+    Generates a markdown page of the given corpus kind.
+
+    Args:
+        rng (random.Random): Source of randomness, seeded by the caller.
+        kind (str): One of CORPUS_KINDS.
+
+    Returns:
+        str: The markdown source of the page.
+    """
+    if kind not in CORPUS_KINDS:
+        raise ValueError(f"Invalid corpus kind: {kind}")
+    blocks = [f"# {_words(rng, 4).title()}"]
+    if kind == "short":
+        blocks.extend(generate_paragraph(rng) for _ in range(rng.randint(2, 5)))
+    elif kind == "huge":
+        for i in range(2000):
+            if i % 50 == 0:
+                blocks.append(f"## {_words(rng, 3).title()}")
+            elif i % 17 == 0:
+                blocks.append("\n".join(f"- {generate_paragraph(rng)}" for _ in range(4)))
+            elif i % 23 == 0:
+                blocks.append(f"```\n{_words(rng, 12)}\n{_words(rng, 8)}\n```")
+            else:
+                blocks.append(generate_paragraph(rng))
+    elif kind == "link_dense":
+        blocks.extend(generate_link_dense_paragraph(rng) for _ in range(rng.randint(5, 15)))
+    else:
+        blocks.extend(generate_delimiter_heavy_text(rng, 400) for _ in range(rng.randint(3, 8)))
+    return "\n\n".join(blocks) + "\n"
+
+def generate_corpus(kind: str, count: int, seed: int = 0) -> List[str]:
+    """
+    Generates `count` pages of the given kind; the same seed always gives the same pages.
+    """
+    rng = random.Random(f"{kind}:{seed}")
+    return [generate_page(rng, kind) for _ in range(count)]
+
+def write_corpus(directory: str, kind: str, count: int, seed: int = 0) -> List[str]:
+    """
+    Writes a generated corpus as a content directory suitable for build_site.
+
+    Pages are spread over subdirectories of 100 files each.
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    paths = []
+    for i, page in enumerate(generate_corpus(kind, count, seed)):
+        path = os.path.join(directory, f"section-{i // 100:04d}", f"page-{i:06d}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        paths.append(path)
+    return paths
@@ -0,0 +1,59 @@
+import gc
+import tracemalloc
+from typing import Callable, Optional
+
+from textnode import TextNode, TextType
+from htmlnode import LeafNode
+from converters import text_node_to_html_node
+
+
+class LegacyTextNode:
+    """TextNode as it was before __slots__: a per-instance __dict__ and a string text_type."""
+    def __init__(self, text: str, text_type_enum: TextType, url: Optional[str] = None):
+        self.text = text
+        self.text_type = text_type_enum.value
+        self.url = url
+
+
+class LegacyLeafNode:
+    """LeafNode as it was before __slots__: a __dict__ plus a fresh children list and props dict."""
+    def __init__(self, tag: str, value: str, props: Optional[dict] = None):
+        self.tag = tag
+        self.value = value
+        self.children = []
+        self.props = props if props is not None else {}
+
+
+def bytes_per_node(factory: Callable[[], object], count: int) -> float:
+    """
+    Measures the average number of bytes allocated for each object returned by factory.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        nodes = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the nodes is not part of a node's footprint.
+    list_size = nodes.__sizeof__()
+    return (after - before - list_size) / count
+
+
+def report(count: int) -> None:
+    """
+    Prints bytes per node for the old dict-based node layout and the current classes.
+    """
+    text = "shared text"
+    link = TextNode(text, TextType.LINK, "https://example.com/shared")
+    cases = [
+        ("TextNode", lambda: LegacyTextNode(text, TextType.BOLD), lambda: TextNode(text, TextType.BOLD)),
+        ("LeafNode", lambda: LegacyLeafNode("b", text), lambda: LeafNode("b", text)),
+        ("LinkNode", lambda: LegacyLeafNode("a", text, {"href": link.url}), lambda: text_node_to_html_node(link)),
+    ]
+    print(f"{'node':<10} {'before':>10} {'after':>10} {'saved':>8}")
+    for name, legacy, current in cases:
+        before = bytes_per_node(legacy, count)
+        after = bytes_per_node(current, count)
+        print(f"{name:<10} {before:>10.1f} {after:>10.1f} {1 - after / before:>7.0%}")
@@ -0,0 +1,95 @@
+from typing import Callable, Dict, List, Optional
+import fnmatch
+import json
+import platform
+import statistics
+import time
+
+from benchmarks.scenarios import SCENARIOS
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+
+def time_callable(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Calls func `repeat` times after one warm-up call and summarizes the timings in seconds.
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+def select_scenarios(patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Returns the names of the scenarios matching any of the shell-style patterns, or all of them.
+    """
+    names = sorted(SCENARIOS)
+    if not patterns:
+        return names
+    return [name for name in names if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+
+def run_benchmarks(names: List[str], repeat: int = 5, progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> dict:
+    """
+    Runs the named scenarios and returns the machine-readable results document.
+    """
+    results = {}
+    for name in names:
+        timing = time_callable(SCENARIOS[name](), repeat)
+        results[name] = timing
+        if progress is not None:
+            progress(name, timing)
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version in {path}")
+    return data
+
+def save_results(path: str, data: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def compare_results(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    Compares the best timings of two results documents.
+
+    Args:
+        current (dict): Results of the run being checked.
+        baseline (dict): Saved results to compare against.
+        threshold (float): Allowed slowdown, e.g. 0.10 for 10%.
+
+    Returns:
+        List[dict]: One entry per scenario present in both documents, with the baseline
+        and current best times, their ratio and whether it counts as a regression.
+    """
+    comparisons = []
+    for name in sorted(current["results"]):
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["best"]
+        after = current["results"][name]["best"]
+        ratio = after / before if before else float("inf")
+        comparisons.append({
+            "name": name,
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return comparisons
@@ -0,0 +1,122 @@
+from typing import Callable, Dict, List
+import os
+
+from benchmarks.corpus import generate_corpus
+from blocks import markdown_to_blocks, markdown_to_html_node
+from helpers import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from htmlnode import LeafNode, ParentNode
+from inline import tokenize_inline_spans
+from converters import text_node_to_html_node, text_nodes_to_html_nodes
+from template import Template
+from textnode import TextNode, TextType
+
+# Each scenario is a setup function returning the callable that gets timed, so
+# corpus generation and other preparation stay out of the measurements.
+SCENARIOS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+def scenario(name: str) -> Callable:
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        SCENARIOS[name] = setup
+        return setup
+    return register
+
+def paragraphs(kind: str, count: int) -> List[str]:
+    """
+    Returns the paragraph and heading text of a generated corpus, skipping code blocks.
+    """
+    texts = []
+    for page in generate_corpus(kind, count):
+        for block in markdown_to_blocks(page.splitlines()):
+            if not block[0].startswith("```"):
+                texts.append(" ".join(line.lstrip("#-> ") for line in block))
+    return texts
+
+def _text_to_textnodes(kind: str, count: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        texts = paragraphs(kind, count)
+        return lambda: [text_to_textnodes(text) for text in texts]
+    return setup
+
+scenario("text_to_textnodes.short")(_text_to_textnodes("short", 500))
+scenario("text_to_textnodes.huge")(_text_to_textnodes("huge", 1))
+scenario("text_to_textnodes.link_dense")(_text_to_textnodes("link_dense", 100))
+scenario("text_to_textnodes.delimiter_heavy")(_text_to_textnodes("delimiter_heavy", 50))
+
+@scenario("tokenize_inline_spans.huge")
+def tokenize_spans_setup() -> Callable[[], object]:
+    # Paragraphs as spans of one UTF-8 buffer, the way they sit in a mapped file.
+    buffer = bytearray()
+    spans = []
+    for text in paragraphs("huge", 1):
+        start = len(buffer)
+        buffer += text.encode("utf-8")
+        spans.append((start, len(buffer)))
+        buffer += b"\n\n"
+    buffer = bytes(buffer)
+    return lambda: [tokenize_inline_spans(buffer, start, end) for start, end in spans]
+
+def _text_nodes(kind: str, count: int) -> List[TextNode]:
+    return [TextNode(text, TextType.TEXT) for text in paragraphs(kind, count)]
+
+@scenario("split_nodes_delimiter")
+def split_delimiter_setup() -> Callable[[], object]:
+    nodes = _text_nodes("huge", 1)
+    return lambda: split_nodes_delimiter(split_nodes_delimiter(nodes, "**", TextType.BOLD), "*", TextType.ITALIC)
+
+@scenario("split_nodes_image")
+def split_image_setup() -> Callable[[], object]:
+    nodes = _text_nodes("link_dense", 100) + _text_nodes("huge", 1)
+    return lambda: split_nodes_image(nodes)
+
+@scenario("split_nodes_link")
+def split_link_setup() -> Callable[[], object]:
+    nodes = _text_nodes("link_dense", 100) + _text_nodes("huge", 1)
+    return lambda: split_nodes_link(nodes)
+
+@scenario("text_node_to_html_node")
+def text_node_to_html_node_setup() -> Callable[[], object]:
+    nodes = [node for text in paragraphs("huge", 1) for node in text_to_textnodes(text)]
+    return lambda: [text_node_to_html_node(node) for node in nodes]
+
+def _million_text_nodes() -> List[TextNode]:
+    nodes = [node for text in paragraphs("huge", 1) for node in text_to_textnodes(text)]
+    return (nodes * (1_000_000 // len(nodes) + 1))[:1_000_000]
+
+# The same million nodes converted one call at a time and in one batch.
+@scenario("text_node_to_html_node.1m")
+def text_node_to_html_node_1m_setup() -> Callable[[], object]:
+    nodes = _million_text_nodes()
+    return lambda: [text_node_to_html_node(node) for node in nodes]
+
+@scenario("text_nodes_to_html_nodes.1m")
+def text_nodes_to_html_nodes_1m_setup() -> Callable[[], object]:
+    nodes = _million_text_nodes()
+    return lambda: text_nodes_to_html_nodes(nodes)
+
+@scenario("parent_to_html.wide")
+def parent_wide_setup() -> Callable[[], object]:
+    node = ParentNode("div", [LeafNode("span", f"item {i}") for i in range(50_000)])
+    return node.to_html
+
+@scenario("parent_to_html.document")
+def parent_document_setup() -> Callable[[], object]:
+    node = markdown_to_html_node(generate_corpus("huge", 1)[0])
+    return node.to_html
+
+@scenario("markdown_to_html_node.huge")
+def markdown_to_html_node_setup() -> Callable[[], object]:
+    page = generate_corpus("huge", 1)[0]
+    return lambda: markdown_to_html_node(page)
+
+@scenario("template.render")
+def template_render_setup() -> Callable[[], object]:
+    with open(os.path.join(os.path.dirname(__file__), "..", "..", "template.html"), encoding="utf-8") as f:
+        template = Template.compile(f.read())
+    pages = [("Title", markdown_to_html_node(page).to_html()) for page in generate_corpus("short", 1000)]
+    return lambda: [template.render({"Title": title, "Content": content}) for title, content in pages]
+
+@scenario("leaf_to_html.escaped")
+def leaf_escaped_setup() -> Callable[[], object]:
+    texts = paragraphs("delimiter_heavy", 50) + ["a < b && c > d"] * 1000
+    nodes = [LeafNode("code", text) for text in texts] + [LeafNode("a", "link", {"href": f"/page?id={i % 100}&view=full"}) for i in range(10_000)]
+    return lambda: [node.to_html() for node in nodes]
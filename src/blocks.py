@@ -0,0 +1,204 @@
+from enum import Enum
+from typing import Iterable, Iterator, List, Union
+import re
+
+from helpers import text_to_textnodes
+from htmlnode import HTMLNode, LeafNode, ParentNode
+from converters import text_nodes_to_html_nodes
+from profiling import active_profile, count, span
+
+class BlockType(Enum):
+    """
+    BlockType is an enumeration of the block-level elements a markdown document is split into.
+
+    Attributes:
+        PARAGRAPH (str): Consecutive lines of text.
+        HEADING (str): A line starting with one to six "#" characters and a space.
+        CODE (str): Lines fenced by "```", kept verbatim.
+        QUOTE (str): Lines that all start with ">".
+        UNORDERED_LIST (str): Lines that all start with "* ", "- " or "+ ".
+        ORDERED_LIST (str): Lines that all start with a number followed by ". ".
+    """
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+CODE_FENCE = "```"
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")
+UNORDERED_ITEM_PATTERN = re.compile(r"[*+-] ")
+ORDERED_ITEM_PATTERN = re.compile(r"\d+\. ")
+
+def markdown_to_blocks(lines: Iterable[str]) -> Iterator[List[str]]:
+    """
+    Lazily splits markdown into blocks, reading one line at a time.
+
+    Blocks are separated by blank lines. A heading line always forms a block of its own,
+    and a code fence runs until the closing fence even across blank lines. Lines are
+    yielded without their trailing whitespace.
+
+    Args:
+        lines (Iterable[str]): The markdown source, e.g. an open file object.
+
+    Yields:
+        List[str]: The lines of each block.
+
+    Example:
+    >>> list(markdown_to_blocks(["# Title\\n", "Some\\n", "text\\n", "\\n", "- item\\n"]))
+    [['# Title'], ['Some', 'text'], ['- item']]
+    """
+    block = []
+    in_code = False
+    for line in lines:
+        line = line.rstrip()
+        if in_code:
+            block.append(line)
+            if line.lstrip().startswith(CODE_FENCE):
+                yield block
+                block = []
+                in_code = False
+            continue
+        stripped = line.lstrip()
+        if not stripped:
+            if block:
+                yield block
+                block = []
+        elif stripped.startswith(CODE_FENCE) or HEADING_PATTERN.match(stripped):
+            if block:
+                yield block
+            block = [stripped]
+            in_code = stripped.startswith(CODE_FENCE)
+            if not in_code:
+                yield block
+                block = []
+        else:
+            block.append(line)
+    if block:
+        yield block
+
+def block_to_block_type(block: List[str]) -> BlockType:
+    """
+    Determines the type of a block produced by markdown_to_blocks.
+    """
+    first = block[0].lstrip()
+    if first.startswith(CODE_FENCE):
+        return BlockType.CODE
+    if HEADING_PATTERN.match(first):
+        return BlockType.HEADING
+    stripped = [line.lstrip() for line in block]
+    if all(line.startswith(">") for line in stripped):
+        return BlockType.QUOTE
+    if all(UNORDERED_ITEM_PATTERN.match(line) for line in stripped):
+        return BlockType.UNORDERED_LIST
+    if all(ORDERED_ITEM_PATTERN.match(line) for line in stripped):
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+def text_to_children(text: str) -> List[HTMLNode]:
+    """
+    Converts inline markdown into the HTML nodes for a block's content.
+    """
+    # The tokenizer still returns its nodes as one list per block; producing them one
+    # at a time would cost a generator resume per node, more than the list it saves.
+    if active_profile() is None:
+        return text_nodes_to_html_nodes(text_to_textnodes(text))
+    with span("inline"):
+        text_nodes = text_to_textnodes(text)
+    count("text_nodes", len(text_nodes))
+    with span("convert"):
+        return text_nodes_to_html_nodes(text_nodes)
+
+def block_to_html_node(block: List[str]) -> HTMLNode:
+    """
+    Converts a block produced by markdown_to_blocks into an HTML node.
+
+    Args:
+        block (List[str]): The lines of the block.
+
+    Returns:
+        HTMLNode: A ParentNode for the block, with its inline content converted
+        through text_to_textnodes and text_nodes_to_html_nodes.
+
+    Example:
+    >>> block_to_html_node(["## Hello **world**"]).to_html()
+    '<h2>Hello <b>world</b></h2>'
+    """
+    block_type = block_to_block_type(block)
+    match block_type:
+        case BlockType.HEADING:
+            match = HEADING_PATTERN.match(block[0].lstrip())
+            text = block[0].lstrip()[match.end():].strip()
+            return ParentNode(f"h{len(match.group(1))}", text_to_children(text))
+        case BlockType.CODE:
+            return _code_block_to_html_node(block)
+        case BlockType.QUOTE:
+            text = " ".join(line.lstrip()[1:].strip() for line in block)
+            return ParentNode("blockquote", text_to_children(text))
+        case BlockType.UNORDERED_LIST:
+            return ParentNode("ul", _list_items(block, UNORDERED_ITEM_PATTERN))
+        case BlockType.ORDERED_LIST:
+            return ParentNode("ol", _list_items(block, ORDERED_ITEM_PATTERN))
+        case _:
+            text = " ".join(line.strip() for line in block)
+            return ParentNode("p", text_to_children(text))
+
+def _code_block_to_html_node(block: List[str]) -> HTMLNode:
+    language = block[0][len(CODE_FENCE):].strip()
+    end = len(block) - 1 if len(block) > 1 and block[-1].lstrip().startswith(CODE_FENCE) else len(block)
+    code = "".join(line + "\n" for line in block[1:end])
+    props = {"class": f"language-{language}"} if language else None
+    return ParentNode("pre", [LeafNode("code", code, props)])
+
+def _list_items(block: List[str], item_pattern: re.Pattern) -> List[HTMLNode]:
+    items = []
+    for line in block:
+        line = line.lstrip()
+        text = line[item_pattern.match(line).end():].strip()
+        items.append(ParentNode("li", text_to_children(text)))
+    return items
+
+def iter_block_nodes(source: Union[str, Iterable[str]]) -> Iterator[HTMLNode]:
+    """
+    Lazily converts markdown into one HTML node per block.
+
+    Args:
+        source (Union[str, Iterable[str]]): The markdown text, or any iterable of lines
+        such as an open file object, which is read incrementally.
+
+    Yields:
+        HTMLNode: The node for each block, in document order.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    for block in markdown_to_blocks(lines):
+        yield block_to_html_node(block)
+
+def markdown_to_html_node(source: Union[str, Iterable[str]]) -> ParentNode:
+    """
+    Converts a full markdown document into a single "div" ParentNode.
+
+    Args:
+        source (Union[str, Iterable[str]]): The markdown text, or any iterable of lines
+        such as an open file object, which is read incrementally.
+
+    Returns:
+        ParentNode: A "div" containing one child node per block.
+
+    Example:
+    >>> markdown_to_html_node("# Title\\n\\nSome *text*").to_html()
+    '<div><h1>Title</h1><p>Some <i>text</i></p></div>'
+    """
+    return document_node(list(iter_block_nodes(source)))
+
+def document_node(children: List[HTMLNode]) -> ParentNode:
+    """
+    Wraps the block nodes of a document in the "div" ParentNode markdown_to_html_node
+    returns. A document without blocks gets an empty text child, since a ParentNode
+    needs at least one, so it renders as an empty div.
+
+    Example:
+    >>> document_node([]).to_html()
+    '<div></div>'
+    """
+    return ParentNode("div", children if children else [LeafNode("", "")])
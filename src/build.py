@@ -0,0 +1,519 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import collections
+import itertools
+import os
+
+from blocks import block_to_html_node, document_node, markdown_to_blocks
+from compress import GZIP_LEVEL, GZIP_MIN_SIZE, compress_outputs
+from helpers import InlineCacheInfo, disable_inline_cache, enable_inline_cache, inline_cache_info
+from htmlnode import escape_text
+from links import check_links, page_references
+from manifest import MANIFEST_NAME, Manifest, PageEntry, hash_file
+from shard import in_shard
+from sitemap import FEED_SIZE, SITEMAP_LIMIT, page_summary, remove_sitemaps, write_sitemaps
+from static import remove_output, sync_static
+from template import Template, load_template
+from treecache import TreeCache, active_tree_cache, disable_tree_cache, enable_tree_cache
+from search import SEARCH_DIR, SearchReport, load_search_state, page_terms, remove_index, save_search_state, search_state_path, write_index
+from profiling import Profile, capture_page, count, disable_profiling, enable_profiling, span, take_profile
+from writer import QUEUE_SIZE, WRITERS, PageWriter
+
+MARKDOWN_EXTENSION = ".md"
+HTML_EXTENSION = ".html"
+# Build caches live in subdirectories of the cache directory, outside the output.
+CACHE_DIR = ".cache"
+# Chunks of pages per worker submitted ahead of the one being written, so that when
+# writing falls behind, rendering stalls instead of results piling up in memory.
+CHUNKS_IN_FLIGHT = 2
+
+class PageTask(NamedTuple):
+    source: str # Path of the markdown file.
+    output: str # Path of the page relative to the output directory.
+    hash: Optional[str] = None # Content hash of the markdown file, the key of its cached tree.
+    terms: bool = False # Whether to collect the words of the page for the search index.
+
+class RenderedPage(NamedTuple):
+    output: str # Path of the page relative to the output directory.
+    title: str
+    html: str
+    links: Tuple[str, ...] = ()
+    images: Tuple[str, ...] = ()
+    summary: str = ""
+    terms: Optional[Dict[str, List[int]]] = None
+
+class PageResult(NamedTuple):
+    output: str # Path of the page relative to the output directory.
+    title: str
+    links: Tuple[str, ...] = () # Targets of the links on the page.
+    images: Tuple[str, ...] = () # Sources of the images on the page.
+    summary: str = "" # Opening text of the page, from sitemap.page_summary.
+    terms: Optional[Dict[str, List[int]]] = None # Word positions from search.page_terms, when collected.
+
+@dataclass(frozen=True)
+class BuildOptions:
+    """
+    Settings of a build, made once by the caller and passed to build_site and
+    update_site.
+
+    Attributes:
+    -----------
+    jobs : Optional[int]
+        Number of worker processes, defaulting to the number of CPUs.
+    force : bool
+        Re-render every page, and copy, compress and write every static file, sitemap
+        and feed again, even where the manifest shows nothing changed. The manifest is
+        still read, so outputs of deleted sources are removed as usual.
+    inline_cache : int
+        Size of the per-process inline parsing cache, 0 to disable it.
+    profile : Optional[Profile]
+        Collects stage timings and counters from every worker.
+    static_dir : Optional[str]
+        Directory of static files to mirror into the output. When None, static files
+        synced by earlier builds are left alone.
+    static_checksum : bool
+        Compare content hashes of static files whose size or mtime changed.
+    static_link : bool
+        Hard link static files into the output instead of copying them.
+    writers : int
+        Number of threads writing pages, 0 to write them one by one as they are rendered.
+    sync : str
+        When written pages are flushed to disk, one of writer.SYNC_POLICIES.
+    gzip : bool
+        Write precompressed .gz siblings of HTML and CSS outputs.
+    gzip_level : int
+        gzip compression level from 1 to 9.
+    gzip_min_size : int
+        Size in bytes below which outputs are not compressed.
+    shard : Optional[Tuple[int, int]]
+        Index and count of the shard to build, see shard.parse_shard.
+    tree_cache : Optional[TreeCache]
+        On-disk cache of parsed pages, see treecache.TreeCache.
+    links : bool
+        Report broken internal links and images, and backlinks.
+    search : bool
+        Write a full-text search index of the pages.
+    cache_dir : str
+        Directory the terms of every page are kept in between builds with search.
+    base_url : Optional[str]
+        URL of the site root, to write sitemaps and a feed.
+    feed_size : int
+        Number of most recently updated pages in the feed, 0 for none.
+    """
+    jobs: Optional[int] = None
+    force: bool = False
+    inline_cache: int = 0
+    profile: Optional[Profile] = None
+    static_dir: Optional[str] = None
+    static_checksum: bool = False
+    static_link: bool = False
+    writers: int = WRITERS
+    sync: str = "none"
+    gzip: bool = False
+    gzip_level: int = GZIP_LEVEL
+    gzip_min_size: int = GZIP_MIN_SIZE
+    shard: Optional[Tuple[int, int]] = None
+    tree_cache: Optional[TreeCache] = None
+    links: bool = False
+    search: bool = False
+    cache_dir: str = CACHE_DIR
+    base_url: Optional[str] = None
+    feed_size: int = FEED_SIZE
+
+class BuildReport:
+    """
+    Summary of what a build did.
+
+    Attributes:
+    -----------
+    rendered : List[PageResult]
+        Pages rendered by this build, ordered by source path.
+    unchanged : int
+        Number of pages skipped because none of their inputs changed.
+    removed : List[str]
+        Output paths deleted because their source no longer exists.
+    inline_cache : Optional[InlineCacheInfo]
+        Inline cache counters summed over every process that rendered pages, for builds
+        with the cache on; maxsize is the combined size of their caches.
+    profile : Optional[Profile]
+        Stage timings and counters gathered from every worker, for profiled builds.
+    static : Optional[SyncReport]
+        What the static sync copied, skipped and removed, for builds with a static directory.
+    compressed : Optional[CompressReport]
+        Which outputs got a new .gz sibling and how many bytes that saved.
+    links : Optional[LinkReport]
+        Broken internal links and backlinks across the whole site, for builds checking links.
+    sitemaps : Optional[SitemapReport]
+        Which sitemaps and feed files were rewritten, for builds given a base URL.
+    search : Optional[SearchReport]
+        How many chunks of the search index were rewritten, for builds with search that
+        changed any page.
+    tree_cache_evicted : int
+        Number of parsed pages deleted from the tree cache to keep it under its size cap.
+    manifest : Manifest
+        Record of the inputs and outputs of this build.
+    """
+    def __init__(self):
+        self.rendered = []
+        self.unchanged = 0
+        self.removed = []
+        self.inline_cache = None
+        self.profile = None
+        self.static = None
+        self.compressed = None
+        self.links = None
+        self.sitemaps = None
+        self.search = None
+        self.tree_cache_evicted = 0
+        self.manifest = Manifest()
+
+# Set in each worker process by _init_worker so the template is sent once per
+# worker rather than once per page.
+_template: Optional[Template] = None
+
+def find_pages(content_dir: str) -> List[str]:
+    """
+    Lists the markdown files under content_dir as sorted paths relative to it.
+    """
+    pages = []
+    for root, dirs, files in os.walk(content_dir):
+        dirs.sort()
+        for name in files:
+            if name.endswith(MARKDOWN_EXTENSION):
+                pages.append(os.path.relpath(os.path.join(root, name), content_dir))
+    pages.sort()
+    return pages
+
+def output_path_for(page: str) -> str:
+    """
+    Maps a markdown path relative to the content directory to its HTML output path.
+
+    Example:
+    >>> output_path_for("blog/post.md")
+    'blog/post.html'
+    """
+    return page[:-len(MARKDOWN_EXTENSION)] + HTML_EXTENSION
+
+def render_markdown(source: str, source_hash: Optional[str] = None, terms: bool = False) -> tuple:
+    """
+    Converts a markdown file into its HTML content, reading it line by line.
+
+    With a tree cache enabled and the source's content hash given, the parsed blocks
+    are loaded from the cache when present and stored in it otherwise.
+
+    Returns:
+        tuple: The page title, taken from the first "# " heading and falling back to
+        the file name, the rendered content, the link targets and image sources found
+        by links.page_references, the summary from sitemap.page_summary, and with
+        `terms` the word positions found by search.page_terms, otherwise None.
+    """
+    tree_cache = active_tree_cache() if source_hash is not None else None
+    cached = tree_cache.get(source_hash) if tree_cache is not None else None
+    if cached is not None:
+        title, children = cached
+    else:
+        title = None
+        children = []
+        with span("parse"), open(source, encoding="utf-8") as f:
+            for block in markdown_to_blocks(f):
+                if title is None and block[0].startswith("# "):
+                    title = block[0][2:].strip()
+                children.append(block_to_html_node(block))
+        if tree_cache is not None:
+            tree_cache.put(source_hash, title, children)
+    count("blocks", len(children))
+    if title is None:
+        title = os.path.splitext(os.path.basename(source))[0]
+    with span("render"):
+        content = document_node(children).to_html()
+    links, images = page_references(children)
+    summary = page_summary(children)
+    if terms:
+        with span("terms"):
+            return title, content, links, images, summary, page_terms(children)
+    return title, content, links, images, summary, None
+
+def render_page(task: PageTask, template: Optional[Template] = None) -> RenderedPage:
+    """
+    Renders one markdown file into a full HTML page, filling the template's
+    Title and Content slots.
+    """
+    with capture_page(task.output):
+        title, content, links, images, summary, terms = render_markdown(task.source, task.hash, task.terms)
+        html = (template if template is not None else _template).render({"Title": escape_text(title), "Content": content})
+    return RenderedPage(task.output, title, html, links, images, summary, terms)
+
+def _init_worker(template: Template, inline_cache: int, profile: Optional[Profile], tree_cache: Optional[TreeCache]) -> None:
+    global _template
+    _template = template
+    if inline_cache:
+        enable_inline_cache(inline_cache)
+    if tree_cache is not None:
+        enable_tree_cache(tree_cache)
+    if profile is not None:
+        enable_profiling(profile)
+
+def _render_in_worker(tasks: List[PageTask]) -> Tuple[List[Tuple[RenderedPage, Optional[Profile]]], int, Optional[InlineCacheInfo]]:
+    # Each page carries back what the worker recorded for it, and each chunk the
+    # worker's inline cache counters so far, so the parent can merge them.
+    pages = [(render_page(task), take_profile()) for task in tasks]
+    return pages, os.getpid(), inline_cache_info()
+
+def bounded_map(executor: Executor, fn: Callable[[object], object], items: Iterable[object], window: int) -> Iterator[object]:
+    """
+    Like executor.map, but keeps at most `window` items submitted and not yet consumed,
+    rather than submitting every item up front. Results are yielded in the order of
+    items.
+
+    Example:
+    >>> with ThreadPoolExecutor() as executor:
+    ...     list(bounded_map(executor, abs, [-1, 2, -3], 2))
+    [1, 2, 3]
+    """
+    items = iter(items)
+    pending = collections.deque(executor.submit(fn, item) for item in itertools.islice(items, window))
+    while pending:
+        result = pending.popleft().result()
+        for item in itertools.islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
+
+def build_site(content_dir: str, output_dir: str, template_path: str, options: BuildOptions = BuildOptions(), changed: Optional[Iterable[str]] = None) -> BuildReport:
+    """
+    Converts every markdown file under content_dir into a page under output_dir.
+
+    A manifest in output_dir records the hash of each source and of the template and its
+    partials. Pages are only re-rendered when their source or the template changed, or
+    their output is missing; a source whose size and mtime match the manifest is not
+    even re-hashed.
+    Outputs of sources deleted since the last build are removed. When the caller already
+    knows which sources changed, e.g. from a file watcher, passing them as `changed` skips
+    walking and checking the rest of content_dir unless the template changed too.
+
+    Files under static_dir are mirrored into output_dir by static.sync_static, which
+    only copies files that changed and prunes ones deleted from static_dir. Where a
+    static file and a page have the same output path, the page wins.
+
+    Pages are rendered in a process pool of `jobs` workers, defaulting to the number of
+    CPUs; with a single job everything runs in the current process. Results come back
+    in the sorted order of the source paths regardless of which worker finished first.
+    Rendered pages are handed to a writer.PageWriter, which saves them from `writers`
+    threads while the next pages render.
+
+    With `gzip`, HTML and CSS outputs of at least gzip_min_size bytes, pages and static
+    files alike, get a .gz sibling from compress.compress_outputs, which skips files whose
+    content did not change since they were last compressed. Without it, .gz files left
+    by an earlier build are removed so they never go stale.
+
+    A `shard` build only covers the pages and static files that shard.shard_of assigns to
+    it, and records the shard in its manifest. Shards can be built one at a time or on
+    separate machines, each into its own output_dir, and combined by shard.merge_shards.
+
+    With a `tree_cache`, pages that have to be re-rendered but whose markdown was parsed
+    before, e.g. after a template change, are loaded from the cache instead of being
+    parsed again. The cache is trimmed to its size cap after rendering.
+
+    The link and image targets of every page are kept in the manifest, so with `links`
+    the whole site's internal links are checked by links.check_links without rendering
+    the unchanged pages again. A shard would report links to other shards as broken, so
+    sharded builds check links after shard.merge_shards instead.
+
+    With `search`, the words of every page are written to an inverted index by
+    search.write_index, split into chunks by word prefix so a browser only loads what a
+    query needs. The words of each page are kept under cache_dir, outside the output, so
+    only rendered pages are tokenized and the index is not touched when no page changed.
+    Without it, an index left by an earlier build is removed. Sharded builds cannot
+    write one, as each shard only sees its own pages.
+
+    Given a `base_url`, sitemap.write_sitemaps keeps sitemap.xml and an Atom feed,
+    atom.xml, up to date from the titles, summaries and update times in the manifest,
+    rewriting only the files whose entries changed. Sites of more than
+    sitemap.SITEMAP_LIMIT pages get numbered sitemaps and a sitemap index. Without it,
+    files written by an earlier build are removed. Like the search index, sitemaps need
+    the whole site and cannot be written by a shard.
+
+    Args:
+        content_dir (str): Directory searched recursively for .md files.
+        output_dir (str): Directory the .html pages are written to, mirroring content_dir.
+        template_path (str): HTML template containing {{ Title }} and {{ Content }}, see template.Template.
+        options (BuildOptions): How to build, see BuildOptions.
+        changed (Optional[Iterable[str]]): Source paths relative to content_dir that may have
+            been edited, created or deleted; every other page is assumed unchanged.
+
+    Returns:
+        BuildReport: The rendered, skipped and removed pages.
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    old_manifest = Manifest.load(manifest_path)
+    report = update_site(content_dir, output_dir, template_path, old_manifest, options, changed)
+    os.makedirs(output_dir, exist_ok=True)
+    report.manifest.save(manifest_path)
+    return report
+
+def update_site(content_dir: str, output_dir: str, template_path: str, old_manifest: Manifest, options: BuildOptions = BuildOptions(), changed: Optional[Iterable[str]] = None) -> BuildReport:
+    """
+    Does the work of build_site against a manifest held in memory, without reading or
+    writing the manifest file, so that a long-running process can rebuild repeatedly.
+
+    Returns:
+        BuildReport: The rendered, skipped and removed pages, with the new manifest.
+    """
+    if options.search and options.shard is not None:
+        raise ValueError("A search index cannot be built from a single shard")
+    if options.base_url is not None and options.shard is not None:
+        raise ValueError("Sitemaps cannot be built from a single shard")
+    if options.links and options.shard is not None:
+        raise ValueError("Links cannot be checked from a single shard")
+    template = load_template(template_path)
+    manifest = Manifest(template.digest, shard=options.shard)
+    template_changed = manifest.template_hash != old_manifest.template_hash
+    report = BuildReport()
+    report.profile = options.profile
+    report.manifest = manifest
+    # Pages indexed by the previous build; any other page is rendered again to index it.
+    state_path = search_state_path(options.cache_dir, output_dir)
+    search_state = load_search_state(state_path) if options.search else {}
+
+    if changed is None or template_changed or options.force:
+        pages = find_pages(content_dir)
+    else:
+        changed = set(changed)
+        if options.search:
+            changed.update(page for page in old_manifest.pages if page not in search_state)
+        pages = sorted(page for page in changed if page.endswith(MARKDOWN_EXTENSION) and os.path.isfile(os.path.join(content_dir, page)))
+        for page, entry in old_manifest.pages.items():
+            if page not in changed:
+                manifest.pages[page] = entry
+                report.unchanged += 1
+
+    if options.shard is not None:
+        pages = [page for page in pages if in_shard(page, options.shard)]
+
+    tasks = []
+    for page in pages:
+        source = os.path.join(content_dir, page)
+        stat = os.stat(source)
+        entry = old_manifest.pages.get(page)
+        source_hash = None
+        if entry is not None and not entry.matches_stat(stat):
+            # Touched but possibly identical, e.g. after a checkout: compare contents.
+            source_hash = hash_file(source)
+            if source_hash == entry.hash:
+                entry = PageEntry(source_hash, stat.st_size, stat.st_mtime_ns, entry.output, entry.title, entry.links, entry.images, entry.updated, entry.summary)
+            else:
+                entry = None
+        if entry is not None and not template_changed and not options.force and (not options.search or page in search_state) and os.path.exists(os.path.join(output_dir, entry.output)):
+            manifest.pages[page] = entry
+            report.unchanged += 1
+            continue
+        if source_hash is None:
+            source_hash = hash_file(source)
+        # A page re-rendered for another reason, e.g. a template change, keeps its update time.
+        updated = entry.updated if entry is not None else stat.st_mtime_ns
+        manifest.pages[page] = PageEntry(source_hash, stat.st_size, stat.st_mtime_ns, output_path_for(page), "", updated=updated)
+        tasks.append((page, PageTask(source, output_path_for(page), source_hash, options.search)))
+
+    for page, entry in old_manifest.pages.items():
+        if page not in manifest.pages:
+            remove_output(output_dir, entry.output)
+            report.removed.append(entry.output)
+
+    if options.static_dir is None:
+        manifest.static = old_manifest.static
+    else:
+        outputs = {entry.output for entry in manifest.pages.values()}
+        manifest.static, report.static = sync_static(options.static_dir, output_dir, old_manifest.static, outputs, options.static_checksum, options.static_link,
+                                                      (lambda path: in_shard(path, options.shard)) if options.shard is not None else None, options.force)
+
+    for index, result in enumerate(_render_pages([task for _, task in tasks], PageWriter(output_dir, options.writers, QUEUE_SIZE, options.sync), template, options.jobs, options.inline_cache, options.tree_cache, options.profile, report)):
+        entry = manifest.pages[tasks[index][0]]
+        entry.title = result.title
+        entry.links = result.links
+        entry.images = result.images
+        entry.summary = result.summary
+        if options.search:
+            search_state[tasks[index][0]] = result.terms
+        report.rendered.append(result)
+    if options.tree_cache is not None and tasks:
+        report.tree_cache_evicted = options.tree_cache.evict()
+
+    if options.links:
+        with span("links"):
+            report.links = check_links(manifest)
+
+    if options.base_url is not None:
+        with span("sitemaps"):
+            manifest.generated, report.sitemaps = write_sitemaps(output_dir, manifest, options.base_url, old_manifest.generated, SITEMAP_LIMIT, options.feed_size, options.force)
+    else:
+        remove_sitemaps(output_dir, old_manifest.generated)
+
+    if options.search:
+        if tasks or report.removed or not os.path.exists(os.path.join(output_dir, SEARCH_DIR)):
+            with span("search"):
+                report.search = _write_search_index(output_dir, state_path, manifest, search_state)
+    else:
+        remove_index(output_dir, state_path)
+
+    outputs = [entry.output for entry in manifest.pages.values()] + list(manifest.static) if options.gzip else []
+    manifest.compressed, report.compressed = compress_outputs(output_dir, outputs, old_manifest.compressed, options.gzip_level, options.gzip_min_size, options.jobs, options.force)
+    return report
+
+def _write_search_index(output_dir: str, state_path: str, manifest: Manifest, search_state: Dict[str, Dict[str, List[int]]]) -> SearchReport:
+    # Pages are numbered in source path order; terms of deleted pages are dropped.
+    state = {page: search_state[page] for page in sorted(manifest.pages)}
+    save_search_state(state_path, state)
+    return write_index(output_dir, ((manifest.pages[page].output.replace(os.sep, "/"), manifest.pages[page].title, terms) for page, terms in state.items()))
+
+def _render_pages(tasks: List[PageTask], writer: PageWriter, template: Template, jobs: Optional[int], inline_cache: int, tree_cache: Optional[TreeCache], profile: Optional[Profile], report: BuildReport) -> Iterator[PageResult]:
+    jobs = jobs or os.cpu_count() or 1
+    if profile is not None:
+        enable_profiling(profile)
+    try:
+        with writer:
+            if jobs == 1 or len(tasks) <= 1:
+                yield from _render_in_process(tasks, writer, template, inline_cache, tree_cache, report)
+                return
+            # Hand out pages in a few chunks per worker to keep the per-task IPC overhead low
+            # while still balancing uneven page sizes.
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            chunks = (tasks[start:start + chunksize] for start in range(0, len(tasks), chunksize))
+            worker_profile = profile.fresh() if profile is not None else None
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(template, inline_cache, worker_profile, tree_cache)) as executor:
+                # The latest inline cache counters of each worker, keyed by process id.
+                worker_caches = {}
+                for results, pid, cache_info in bounded_map(executor, _render_in_worker, chunks, jobs * CHUNKS_IN_FLIGHT):
+                    if cache_info is not None:
+                        worker_caches[pid] = cache_info
+                    for page, page_profile in results:
+                        if page_profile is not None:
+                            profile.merge(page_profile)
+                        writer.write(page.output, page.html)
+                        yield PageResult(page.output, page.title, page.links, page.images, page.summary, page.terms)
+                if worker_caches:
+                    report.inline_cache = _sum_cache_info(worker_caches.values())
+    finally:
+        if profile is not None:
+            writer.record(profile)
+            disable_profiling()
+
+def _sum_cache_info(infos: Iterable[InlineCacheInfo]) -> InlineCacheInfo:
+    # Hits, misses, maxsize and currsize of every worker's cache added up.
+    return InlineCacheInfo(*(sum(field) for field in zip(*infos)))
+
+def _render_in_process(tasks: List[PageTask], writer: PageWriter, template: Template, inline_cache: int, tree_cache: Optional[TreeCache], report: BuildReport) -> Iterator[PageResult]:
+    if inline_cache:
+        enable_inline_cache(inline_cache)
+    if tree_cache is not None:
+        enable_tree_cache(tree_cache)
+    try:
+        for task in tasks:
+            page = render_page(task, template)
+            writer.write(page.output, page.html)
+            yield PageResult(page.output, page.title, page.links, page.images, page.summary, page.terms)
+        report.inline_cache = inline_cache_info()
+    finally:
+        if inline_cache:
+            disable_inline_cache()
+        if tree_cache is not None:
+            disable_tree_cache()
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+import gzip
+import hashlib
+import os
+
+from manifest import StaticEntry, hash_file
+from static import remove_output
+
+COMPRESSED_EXTENSIONS = (".html", ".css")
+GZIP_EXTENSION = ".gz"
+GZIP_LEVEL = 6
+# Below this many bytes the gzip header and a second file cost more than they save.
+GZIP_MIN_SIZE = 1024
+
+class CompressReport:
+    """
+    Summary of what a precompression pass did.
+
+    Attributes:
+    -----------
+    compressed : List[str]
+        Output paths given a new .gz sibling, sorted.
+    unchanged : int
+        Number of files skipped because their content did not change since they were compressed.
+    removed : List[str]
+        Output paths whose .gz sibling was deleted because the file is gone or now too small.
+    original_bytes : int
+        Total size of the files compressed.
+    compressed_bytes : int
+        Total size of the .gz files written.
+    """
+    def __init__(self):
+        self.compressed = []
+        self.unchanged = 0
+        self.removed = []
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.compressed_bytes
+
+def is_compressible(path: str) -> bool:
+    return path.endswith(COMPRESSED_EXTENSIONS)
+
+def compress_file(path: str, level: int = GZIP_LEVEL) -> Tuple[StaticEntry, int]:
+    """
+    Writes path + ".gz" with the gzip-compressed contents of path.
+
+    The gzip header carries no timestamp, so unchanged content compresses to identical bytes.
+
+    Returns:
+        Tuple[StaticEntry, int]: The file's size, mtime and hash, and the size of the .gz file.
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    compressed = gzip.compress(data, level, mtime=0)
+    tmp_path = path + GZIP_EXTENSION + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(tmp_path, path + GZIP_EXTENSION)
+    return StaticEntry(stat.st_size, stat.st_mtime_ns, hashlib.blake2b(data).hexdigest()), len(compressed)
+
+def compress_outputs(output_dir: str, outputs: Iterable[str], old_entries: Dict[str, StaticEntry], level: int = GZIP_LEVEL, min_size: int = GZIP_MIN_SIZE, jobs: Optional[int] = None, force: bool = False) -> Tuple[Dict[str, StaticEntry], CompressReport]:
+    """
+    Gives every HTML and CSS file among outputs that is at least min_size bytes a
+    gzip-compressed sibling, for web servers that serve precompressed files.
+
+    A file is skipped when its size and mtime match its entry and the .gz still exists.
+    A file whose stat changed is hashed, and only compressed again when its content did.
+    With `force`, every file is compressed again.
+    The .gz siblings of files recorded in old_entries that are no longer compressed are
+    deleted. Files are compressed by `jobs` threads, defaulting to the number of CPUs;
+    zlib and hashlib release the GIL while they work.
+
+    Args:
+        output_dir (str): Directory the outputs are in.
+        outputs (Iterable[str]): Paths relative to output_dir that may be compressed.
+        old_entries (Dict[str, StaticEntry]): Compressed entries of the previous build's manifest.
+        level (int): gzip compression level from 1 to 9.
+        min_size (int): Size in bytes below which files are left uncompressed.
+        jobs (Optional[int]): Number of compressing threads.
+        force (bool): Compress every file, even those whose .gz looks current.
+
+    Returns:
+        Tuple[Dict[str, StaticEntry], CompressReport]: The new compressed entries and what was done.
+    """
+    entries = {}
+    report = CompressReport()
+    pending = []
+    for path in sorted(set(filter(is_compressible, outputs))):
+        full_path = os.path.join(output_dir, path)
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            continue
+        if stat.st_size < min_size:
+            continue
+        entry = old_entries.get(path)
+        if entry is not None and (force or not os.path.exists(full_path + GZIP_EXTENSION)):
+            entry = None
+        if entry is not None and entry.matches_stat(stat):
+            entries[path] = entry
+            report.unchanged += 1
+        else:
+            pending.append((path, entry, stat))
+    # Only files that need hashing or compressing go to the pool; a thread hand-off
+    # costs more than the stat calls above.
+    if pending:
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+            for path, entry, compressed_size in executor.map(lambda args: _update(output_dir, *args, level), pending):
+                entries[path] = entry
+                if compressed_size is None:
+                    report.unchanged += 1
+                else:
+                    report.compressed.append(path)
+                    report.original_bytes += entry.size
+                    report.compressed_bytes += compressed_size
+    for path in sorted(old_entries):
+        if path not in entries:
+            remove_output(output_dir, path + GZIP_EXTENSION)
+            report.removed.append(path)
+    return entries, report
+
+def _update(output_dir: str, path: str, entry: Optional[StaticEntry], stat: os.stat_result, level: int) -> Tuple[str, StaticEntry, Optional[int]]:
+    # Returns the new entry for path along with the size of the .gz written, or None
+    # when the file was only touched and the existing .gz is still current.
+    full_path = os.path.join(output_dir, path)
+    if entry is not None and hash_file(full_path) == entry.hash:
+        return path, StaticEntry(stat.st_size, stat.st_mtime_ns, entry.hash), None
+    new_entry, compressed_size = compress_file(full_path, level)
+    return path, new_entry, compressed_size
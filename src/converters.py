@@ -0,0 +1,87 @@
+from typing import Callable, Dict, Iterable, List
+import functools
+
+from htmlnode import FrozenProps, LeafNode, new_leaf
+from textnode import TextNode, TextType
+
+# Links and images to the same URL share one FrozenProps, and with it the
+# serialized attribute string, for up to this many distinct URLs.
+PROPS_CACHE_SIZE = 4096
+
+def text_node_to_html_node(text_node: TextNode) -> LeafNode:
+    """
+    Converts a text node to an HTML node.
+
+    This function takes a text node object and converts it into an HTML node
+    based on the type of the text node. The conversion is looked up in
+    HTML_CONVERTERS by the `text_type` attribute of the text node and returns
+    an appropriate `LeafNode` object. To convert many nodes, use
+    text_nodes_to_html_nodes.
+
+    Parameters:
+    text_node (TextNode): The text node object to be converted. It must have the
+                          following attributes:
+                          - text_type (TextType): The type of the text node. It can be
+                            one of TEXT, BOLD, ITALIC, CODE, LINK or IMAGE.
+                          - text (str): The text content of the node.
+                          - url (str, optional): The URL for link or image nodes.
+
+    Returns:
+    LeafNode: An HTML node represented as a `LeafNode` object. The tag and attributes
+              of the `LeafNode` depend on the `text_type` of the input `text_node`.
+
+    Raises:
+    ValueError: If the `text_type` of the text node is not one of the expected values.
+
+    Example:
+    >>> text_node = TextNode("Hello, World!", TextType.BOLD)
+    >>> html_node = text_node_to_html_node(text_node)
+    >>> print(html_node)
+    LeafNode(tag="b", text="Hello, World!")
+    """
+    convert = HTML_CONVERTERS.get(text_node.text_type)
+    if convert is None:
+        raise ValueError(f"Invalid text type: {text_node.text_type}")
+    return convert(text_node)
+
+def text_nodes_to_html_nodes(text_nodes: Iterable[TextNode]) -> List[LeafNode]:
+    """
+    Converts a sequence of text nodes to HTML nodes, as text_node_to_html_node does
+    for each one, e.g. straight from the output of text_to_textnodes.
+
+    Raises:
+    ValueError: If a text node's `text_type` is not one of the expected values.
+
+    Example:
+    >>> [node.to_html() for node in text_nodes_to_html_nodes(text_to_textnodes("a **b**"))]
+    ['a ', '<b>b</b>']
+    """
+    converters = HTML_CONVERTERS
+    html_nodes = []
+    append = html_nodes.append
+    for text_node in text_nodes:
+        try:
+            convert = converters[text_node.text_type]
+        except KeyError:
+            raise ValueError(f"Invalid text type: {text_node.text_type}") from None
+        append(convert(text_node))
+    return html_nodes
+
+@functools.lru_cache(maxsize=PROPS_CACHE_SIZE)
+def link_props(url: str) -> FrozenProps:
+    return FrozenProps((("href", url),))
+
+@functools.lru_cache(maxsize=PROPS_CACHE_SIZE)
+def image_props(url: str, alt: str) -> FrozenProps:
+    return FrozenProps((("src", url), ("alt", alt)))
+
+# Conversion for each text type. Leaves without attributes share EMPTY_PROPS and links
+# and images the cached props above.
+HTML_CONVERTERS: Dict[TextType, Callable[[TextNode], LeafNode]] = {
+    TextType.TEXT: lambda node: new_leaf("", node.text),
+    TextType.BOLD: lambda node: new_leaf("b", node.text),
+    TextType.ITALIC: lambda node: new_leaf("i", node.text),
+    TextType.CODE: lambda node: new_leaf("code", node.text),
+    TextType.LINK: lambda node: new_leaf("a", node.text, link_props(node.url)),
+    TextType.IMAGE: lambda node: new_leaf("img", "", image_props(node.url, node.text)),
+}
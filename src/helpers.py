@@ -1,15 +1,46 @@
 from textnode import TextNode, TextType
-from typing import List
-import re
-
-textType_mappings = {
-    "text": TextType.TEXT,
-    "bold": TextType.BOLD,
-    "italic": TextType.ITALIC,
-    "code": TextType.CODE,
-    "link": TextType.LINK,
-    "image": TextType.IMAGE
-}
+from inline import IMAGE_PATTERN, LINK_PATTERN, markdown_image_spans, markdown_link_spans, tokenize_inline
+from typing import Callable, List, NamedTuple, Optional, Tuple
+import functools
+
+class InlineCacheInfo(NamedTuple):
+    hits: int # Paragraphs served from the cache.
+    misses: int # Paragraphs tokenized and added to the cache.
+    maxsize: int # Most paragraphs the cache holds.
+    currsize: int # Paragraphs in the cache now.
+
+# Memoized tokenizer installed by enable_inline_cache, or None when caching is off.
+_inline_cache: Optional[Callable[[str], Tuple[TextNode, ...]]] = None
+
+def enable_inline_cache(maxsize: int = 4096) -> None:
+    """
+    Turns on memoization of text_to_textnodes, keyed by the paragraph text.
+
+    Repeated paragraphs such as footers and admonitions are tokenized once and then
+    served from a least-recently-used cache holding at most `maxsize` entries. Calling
+    this again replaces the cache and resets its counters. The cached TextNode objects
+    are shared between callers, so they must be treated as read-only.
+
+    Args:
+        maxsize (int): Maximum number of distinct paragraphs kept in the cache.
+    """
+    global _inline_cache
+    if maxsize <= 0:
+        raise ValueError("maxsize must be a positive integer")
+    _inline_cache = functools.lru_cache(maxsize=maxsize)(lambda text: tuple(tokenize_inline(text)))
+
+def disable_inline_cache() -> None:
+    """
+    Turns off memoization of text_to_textnodes and drops the cached nodes.
+    """
+    global _inline_cache
+    _inline_cache = None
+
+def inline_cache_info() -> Optional[InlineCacheInfo]:
+    """
+    Returns the hits, misses, maxsize and current size of the inline cache, or None when it is disabled.
+    """
+    return InlineCacheInfo(*_inline_cache.cache_info()) if _inline_cache is not None else None
 
 def split_nodes_delimiter(old_nodes: List[TextNode], delimiter: str, text_type: TextType) -> List[TextNode]:
     """
@@ -42,7 +73,7 @@ def split_nodes_delimiter(old_nodes: List[TextNode], delimiter: str, text_type:
         #     continue
         parts = node.text.split(delimiter)
         for i, part in enumerate(parts):
-            current_text_type = textType_mappings[node.text_type] if i % 2 == 0 else text_type
+            current_text_type = node.text_type if i % 2 == 0 else text_type
             new_nodes.append(TextNode(part, current_text_type, node.url if i % 2 == 0 else None))
     return new_nodes
 
@@ -61,8 +92,9 @@ def extract_markdown_images(text: str) -> List[tuple]:
     >>> extract_markdown_images(text)
     [('alt text', 'http://example.com/image.jpg')]
     """
-    matches = re.findall(r"!\[(.*?)\]\((.*?)\)", text)
-    return matches
+    if "](" not in text:
+        return []
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text: str) -> List[tuple]:
     """
@@ -79,8 +111,9 @@ def extract_markdown_links(text: str) -> List[tuple]:
     >>> extract_markdown_links(text)
     [("to boot dev", "https://www.boot.dev"), ("to youtube", "https://www.youtube.com/@bootdotdev")]
     """
-    matches = re.findall(r"\[(.*?)\]\((.*?)\)", text)
-    return matches
+    if "](" not in text:
+        return []
+    return LINK_PATTERN.findall(text)
 
 
 def split_nodes_image(old_nodes: List[TextNode]) -> List[TextNode]:
@@ -103,20 +136,11 @@ def split_nodes_image(old_nodes: List[TextNode]) -> List[TextNode]:
     """
     nodes = []
     for node in old_nodes:
-        images = extract_markdown_images(node.text)
-        prev_end = 0
-        if len(images) == 0:
+        images = markdown_image_spans(node.text)
+        if not images:
             nodes.append(node)
-        else:
-            matches = re.finditer(r"!\[.*?\]\(.*?\)", node.text)
-            for i, match in enumerate(matches):
-                start, end = match.span()
-                if start > 0:
-                    nodes.append(TextNode(node.text[prev_end:start], TextType.TEXT))
-                nodes.append(TextNode(images[i][0], TextType.IMAGE, images[i][1]))
-                prev_end = end
-            if prev_end < len(node.text):
-                nodes.append(TextNode(node.text[prev_end:], TextType.TEXT))
+            continue
+        _split_references(nodes, node.text, images, TextType.IMAGE)
     return nodes
 
 def split_nodes_link(old_nodes: List[TextNode]) -> List[TextNode]:
@@ -139,22 +163,23 @@ def split_nodes_link(old_nodes: List[TextNode]) -> List[TextNode]:
     """
     nodes = []
     for node in old_nodes:
-        links = extract_markdown_links(node.text)
-        prev_end = 0
-        if len(links) == 0:
+        links = markdown_link_spans(node.text)
+        if not links:
             nodes.append(node)
-        else:
-            matches = re.finditer(r"\[.*?\]\(.*?\)", node.text)
-            for i, match in enumerate(matches):
-                start, end = match.span()
-                if start > 0:
-                    nodes.append(TextNode(node.text[prev_end:start], TextType.TEXT))
-                nodes.append(TextNode(links[i][0], TextType.LINK, links[i][1]))
-                prev_end = end
-            if prev_end < len(node.text):
-                nodes.append(TextNode(node.text[prev_end:], TextType.TEXT))
+            continue
+        _split_references(nodes, node.text, links, TextType.LINK)
     return nodes
 
+def _split_references(nodes: List[TextNode], text: str, spans: List[tuple], text_type: TextType) -> None:
+    prev_end = 0
+    for label, url, start, end in spans:
+        if start > 0:
+            nodes.append(TextNode(text[prev_end:start], TextType.TEXT))
+        nodes.append(TextNode(label, text_type, url))
+        prev_end = end
+    if prev_end < len(text):
+        nodes.append(TextNode(text[prev_end:], TextType.TEXT))
+
 
 def text_to_textnodes(text: str) -> List[TextNode]:
     """
@@ -162,6 +187,12 @@ def text_to_textnodes(text: str) -> List[TextNode]:
     based on various markdown delimiters and creating nodes with appropriate
     text types.
 
+    The work is done by inline.tokenize_inline, which produces the same nodes as
+    chaining the split_nodes_* functions above but scans the text only once. When
+    enable_inline_cache has been called, results for repeated text come from the cache:
+    the list is new, but its TextNode objects are shared with every other caller that
+    passed the same text, so they must not be modified.
+
     Args:
         text (str): The input text containing markdown content.
 
@@ -184,10 +215,6 @@ def text_to_textnodes(text: str) -> List[TextNode]:
             TextNode("link", TextType.LINK, "url"),
         ]
     """
-    node = TextNode(text, TextType.TEXT)
-    nodes = split_nodes_delimiter([node], "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return nodes
\ No newline at end of file
+    if _inline_cache is not None:
+        return list(_inline_cache(text))
+    return tokenize_inline(text)
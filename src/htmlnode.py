@@ -1,48 +1,261 @@
+import collections.abc
 import functools
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, TextIO, Tuple, Union
+
+# Chunks are gathered up to roughly this many characters before each write,
+# so write_to keeps few stream calls without holding the whole document.
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Attribute values such as link and image URLs repeat a lot across a site, so
+# their escaped forms are memoized.
+ATTRIBUTE_CACHE_SIZE = 4096
+
+def escape_text(text: str) -> str:
+    """
+    Escapes "&", "<" and ">" so text can be placed in element content.
+
+    Most text contains none of them and is returned as is after three substring checks.
+
+    Example:
+    >>> escape_text("a < b & c")
+    'a &lt; b &amp; c'
+    """
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+@functools.lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)
+def escape_attribute(value: str) -> str:
+    """
+    Escapes "&", "<", ">" and '"' so value can be placed in a double-quoted attribute.
+    """
+    value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return value
+
+class FrozenProps:
+    """
+    Immutable HTML attributes that serialize themselves once.
+
+    The attribute string returned by to_html is built on first use and kept, so a node
+    rendered into several documents, or many nodes sharing one FrozenProps, pay for it
+    once. Behaves as a read-only mapping and compares equal to a dict with the same items.
+
+    Attributes:
+    -----------
+    pairs : Tuple[Tuple[str, str], ...]
+        The (name, value) pairs in attribute order.
+    """
+    __slots__ = ("pairs", "_html")
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()):
+        self.pairs = pairs if pairs.__class__ is tuple else tuple(pairs)
+        self._html = None
+
+    def to_html(self) -> str:
+        """
+        Returns the attributes as ' name="value"' pairs with escaped values.
+        """
+        html = self._html
+        if html is None:
+            html = self._html = "".join([f' {name}="{escape_attribute(value)}"' for name, value in self.pairs])
+        return html
+
+    def __getitem__(self, key: str) -> str:
+        for name, value in self.pairs:
+            if name == key:
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        for name, value in self.pairs:
+            if name == key:
+                return value
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return any(name == key for name, _ in self.pairs)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self.pairs)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def keys(self):
+        return dict(self.pairs).keys()
+
+    def values(self):
+        return dict(self.pairs).values()
+
+    def items(self):
+        return dict(self.pairs).items()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenProps):
+            return dict(self.pairs) == dict(other.pairs)
+        if isinstance(other, collections.abc.Mapping):
+            return dict(self.pairs) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(dict(self.pairs))
+
+# Registered rather than inherited, so instance checks on FrozenProps itself
+# stay cheap while it still counts as a Mapping.
+collections.abc.Mapping.register(FrozenProps)
+
+# Shared read-only defaults, so nodes without children or props do not each
+# allocate an empty list and props.
+EMPTY_CHILDREN: Sequence['HTMLNode'] = ()
+EMPTY_PROPS = FrozenProps()
 
 class HTMLNode:
-    def __init__(self, tag: Optional[str] = None, value: Optional[str] = None, children: Optional[List['HTMLNode']] = None, props: Optional[Dict[str, str]] = None):
+    __slots__ = ("tag", "value", "children", "props")
+
+    def __init__(self, tag: Optional[str] = None, value: Optional[str] = None, children: Optional[List['HTMLNode']] = None, props: Union[Dict[str, str], FrozenProps, None] = None):
         self.tag = tag
         self.value = value
-        self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.children = children if children is not None else EMPTY_CHILDREN
+        if props is None:
+            self.props = EMPTY_PROPS
+        elif props.__class__ is FrozenProps:
+            self.props = props
+        else:
+            self.props = FrozenProps(tuple(props.items()))
     
     def to_html(self) -> str:
-        raise NotImplementedError("Subclasses must implement to_html method.")
+        return "".join(self.iter_html())
+
+    def iter_html(self) -> Iterator[str]:
+        raise NotImplementedError("Subclasses must implement iter_html method.")
+
+    def write_to(self, stream: TextIO, buffer_size: int = WRITE_BUFFER_SIZE) -> int:
+        """
+        Renders the node into a file-like object, returning the number of characters written.
+        """
+        written = 0
+        pending = []
+        pending_size = 0
+        for chunk in self.iter_html():
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= buffer_size:
+                stream.write("".join(pending))
+                written += pending_size
+                pending.clear()
+                pending_size = 0
+        if pending:
+            stream.write("".join(pending))
+            written += pending_size
+        return written
     
     def props_to_html(self) -> str:
-        if not self.props:
-            return ""
-        tag_values = [f'{tag}="{value}"' for tag, value in self.props.items()]
-        return " " + " ".join(tag_values)
+        return self.props.to_html()
 
     def __eq__(self, other: 'HTMLNode') -> bool:
-        return self.tag == other.tag and self.value == other.value \
-                and self.children == other.children and self.props == other.props
+        # Pairs of nodes still to compare, so deep trees do not recurse.
+        stack = [(self, other)]
+        while stack:
+            node, other = stack.pop()
+            if node.tag != other.tag or node.value != other.value or node.props != other.props:
+                return False
+            children, other_children = node.children, other.children
+            if children is other_children:
+                continue
+            # Children compare by their elements, so a childless node built with the
+            # default () equals one built with [].
+            if len(children) != len(other_children):
+                return False
+            stack.extend(zip(children, other_children))
+        return True
     
     def __repr__(self) -> str:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
 
 class LeafNode(HTMLNode):
-    def __init__(self, tag: str, value: str, props: Optional[Dict[str, str]] = None):
+    __slots__ = ()
+
+    def __init__(self, tag: str, value: str, props: Union[Dict[str, str], FrozenProps, None] = None):
         super().__init__(tag, value, None, props)
 
     def to_html(self) -> str:
-        if self.value is None:
+        value = self.value
+        if value is None:
             raise ValueError("All leaf nodes must have a value.")
+        # Same check as escape_text, inlined because this runs for every leaf.
+        if "&" in value or "<" in value or ">" in value:
+            value = escape_text(value)
         if not self.tag:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return value
+        return f"<{self.tag}{self.props.to_html()}>{value}</{self.tag}>"
+
+    def iter_html(self) -> Iterator[str]:
+        yield self.to_html()
     
 class ParentNode(HTMLNode):
-    def __init__(self, tag: str, children: List[HTMLNode], props: Optional[Dict[str, str]] = None):
+    __slots__ = ()
+
+    def __init__(self, tag: str, children: List[HTMLNode], props: Union[Dict[str, str], FrozenProps, None] = None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self) -> str:
+    def iter_html(self) -> Iterator[str]:
+        # Nested parents are entered through a stack of their children's iterators
+        # rather than nested generators, so any depth renders without recursion.
+        yield self._open_tag()
+        stack = [(self.tag, iter(self.children))]
+        while stack:
+            tag, children = stack[-1]
+            for child in children:
+                if isinstance(child, LeafNode):
+                    yield child.to_html()
+                elif child.__class__ is ParentNode:
+                    yield child._open_tag()
+                    stack.append((child.tag, iter(child.children)))
+                    break
+                else:
+                    yield from child.iter_html()
+            else:
+                stack.pop()
+                yield f"</{tag}>"
+
+    def _open_tag(self) -> str:
         if not self.tag:
             raise ValueError("All parent nodes must have a tag.")
         if not isinstance(self.children, list) or not self.children:
             raise ValueError("All parent nodes must have a children list.")
-        children_html = functools.reduce(lambda x, y: x + y.to_html(), self.children, "")
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        return f"<{self.tag}{self.props.to_html()}>"
+
+_new_node = object.__new__
+
+def walk(nodes: Iterable[HTMLNode]) -> Iterator[HTMLNode]:
+    """
+    Yields nodes and all their descendants in document order, keeping the nodes still
+    to visit on a list instead of recursing, so trees of any depth can be walked.
+
+    Example:
+    >>> [node.tag for node in walk([ParentNode("p", [LeafNode("b", "x")])])]
+    ['p', 'b']
+    """
+    stack = list(nodes)
+    stack.reverse()
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.children:
+            stack.extend(reversed(node.children))
+
+def new_leaf(tag: str, value: str, props: FrozenProps = EMPTY_PROPS) -> LeafNode:
+    """
+    Creates the same node as LeafNode(tag, value, props) without the argument handling of
+    __init__, for converters producing many leaves whose props are already FrozenProps.
+    """
+    node = _new_node(LeafNode)
+    node.tag = tag
+    node.value = value
+    node.children = EMPTY_CHILDREN
+    node.props = props
+    return node
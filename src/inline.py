@@ -0,0 +1,238 @@
+from textnode import SpanTextNode, TextNode, TextType, slice_text
+from typing import List, Optional, Tuple
+import re
+
+# Backticks, bold markers and italic markers in one alternation. "**" is listed
+# before "*" so the leftmost-longest token wins, exactly like str.split("**")
+# running before str.split("*").
+DELIMITER_PATTERN = re.compile(r"(`)|(\*\*)|(\*)")
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+
+_CODE, _BOLD, _ITALIC = 1, 2, 3
+
+# The same patterns for scanning UTF-8 buffers such as an mmap of a markdown file.
+# Like the str patterns, and re.findall before them, references do not span line breaks.
+_BYTE_PATTERNS = (
+    re.compile(DELIMITER_PATTERN.pattern.encode()),
+    re.compile(IMAGE_PATTERN.pattern.encode()),
+    re.compile(LINK_PATTERN.pattern.encode()),
+    b"](",
+)
+
+# Every image or link contains "](", so a substring check rules out most text
+# before any regex has to run.
+_REFERENCE_MARKER = "]("
+
+
+def markdown_image_spans(text: str, pos: int = 0, endpos: Optional[int] = None) -> List[Tuple[str, str, int, int]]:
+    """
+    Finds all markdown image references in text[pos:endpos] with a single regex scan.
+
+    Args:
+        text (str): The input text containing markdown image references.
+        pos (int): Index to start searching from.
+        endpos (Optional[int]): Index to stop searching at, defaults to the end of the text.
+
+    Returns:
+        list of tuple: (alt text, URL, start, end) for each image, where start and end
+        are offsets into text covering the whole "![alt](url)" reference.
+
+    Example:
+    >>> markdown_image_spans("An ![alt](img.png) here")
+    [('alt', 'img.png', 3, 18)]
+    """
+    return _reference_spans(IMAGE_PATTERN, text, pos, len(text) if endpos is None else endpos)
+
+
+def markdown_link_spans(text: str, pos: int = 0, endpos: Optional[int] = None) -> List[Tuple[str, str, int, int]]:
+    """
+    Finds all markdown link references in text[pos:endpos] with a single regex scan.
+
+    Args:
+        text (str): The input text containing markdown link references.
+        pos (int): Index to start searching from.
+        endpos (Optional[int]): Index to stop searching at, defaults to the end of the text.
+
+    Returns:
+        list of tuple: (link text, URL, start, end) for each link, where start and end
+        are offsets into text covering the whole "[text](url)" reference.
+
+    Example:
+    >>> markdown_link_spans("A [link](url) here")
+    [('link', 'url', 2, 13)]
+    """
+    return _reference_spans(LINK_PATTERN, text, pos, len(text) if endpos is None else endpos)
+
+
+def _reference_spans(pattern: re.Pattern, text: str, pos: int, endpos: int) -> List[Tuple[str, str, int, int]]:
+    if text.find(_REFERENCE_MARKER, pos, endpos) == -1:
+        return []
+    return [(match.group(1), match.group(2), match.start(), match.end()) for match in pattern.finditer(text, pos, endpos)]
+
+
+def tokenize_inline(text: str) -> List[TextNode]:
+    """
+    Converts a paragraph of markdown into TextNode objects in a single scan.
+
+    The result is identical to running split_nodes_delimiter for "`", "**" and "*",
+    followed by split_nodes_image and split_nodes_link, but the text is walked once
+    for delimiters and the image/link patterns only run over the segments that
+    contain a "](".
+
+    Args:
+        text (str): The input text containing markdown content.
+
+    Returns:
+        List[TextNode]: A list of TextNode objects with appropriate text types.
+
+    Example:
+        >>> tokenize_inline("This is **bold** and a [link](url)")
+        [
+            TextNode("This is ", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode(" and a ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "url"),
+        ]
+    """
+    nodes = []
+    code = bold = italic = False
+    start = 0
+    for match in DELIMITER_PATTERN.finditer(text):
+        end = match.start()
+        _emit_segment(nodes, text, start, end, _segment_type(code, bold, italic))
+        # Each delimiter only resets the ones nested inside it, mirroring how the
+        # staged pipeline re-splits every part produced by the previous stage.
+        kind = match.lastindex
+        if kind == _CODE:
+            code = not code
+            bold = italic = False
+        elif kind == _BOLD:
+            bold = not bold
+            italic = False
+        else:
+            italic = not italic
+        start = match.end()
+    _emit_segment(nodes, text, start, len(text), _segment_type(code, bold, italic))
+    return nodes
+
+
+def _segment_type(code: bool, bold: bool, italic: bool) -> TextType:
+    if italic:
+        return TextType.ITALIC
+    if bold:
+        return TextType.BOLD
+    if code:
+        return TextType.CODE
+    return TextType.TEXT
+
+
+def _emit_segment(nodes: List[TextNode], text: str, start: int, end: int, text_type: TextType) -> None:
+    if text.find(_REFERENCE_MARKER, start, end) == -1:
+        nodes.append(TextNode(text[start:end], text_type))
+        return
+    images = markdown_image_spans(text, start, end)
+    if not images:
+        _emit_links(nodes, text, start, end, text_type)
+        return
+    # Splitting out images turns the surrounding parts into plain text, and only
+    # those parts are searched for links afterwards.
+    prev_end = start
+    for alt, url, match_start, match_end in images:
+        if match_start > start:
+            _emit_links(nodes, text, prev_end, match_start, TextType.TEXT)
+        nodes.append(TextNode(alt, TextType.IMAGE, url))
+        prev_end = match_end
+    if prev_end < end:
+        _emit_links(nodes, text, prev_end, end, TextType.TEXT)
+
+
+def _emit_links(nodes: List[TextNode], text: str, start: int, end: int, text_type: TextType) -> None:
+    links = markdown_link_spans(text, start, end)
+    if not links:
+        nodes.append(TextNode(text[start:end], text_type))
+        return
+    prev_end = start
+    for link_text, url, match_start, match_end in links:
+        if match_start > start:
+            nodes.append(TextNode(text[prev_end:match_start], TextType.TEXT))
+        nodes.append(TextNode(link_text, TextType.LINK, url))
+        prev_end = match_end
+    if prev_end < end:
+        nodes.append(TextNode(text[prev_end:end], TextType.TEXT))
+
+
+def tokenize_inline_spans(buffer, start: int = 0, end: Optional[int] = None) -> List[TextNode]:
+    """
+    Tokenizes buffer[start:end] like tokenize_inline, but returns SpanTextNode objects
+    pointing into buffer instead of copying each piece of text out of it.
+
+    buffer may be a str or a bytes-like object holding UTF-8, such as an mmap of a
+    markdown file; the patterns run over it directly, so nothing is decoded until a
+    node's text is read. Link and image URLs are decoded right away.
+
+    Args:
+        buffer (Union[str, bytes, mmap.mmap]): The source containing the paragraph.
+        start (int): Offset of the paragraph in buffer.
+        end (Optional[int]): Offset just past the paragraph, defaults to the end of buffer.
+
+    Returns:
+        List[TextNode]: The same nodes tokenize_inline returns for the paragraph's text.
+
+    Example:
+    >>> nodes = tokenize_inline_spans(b"Some **bold** text")
+    >>> nodes[1].start, nodes[1].end, nodes[1].text
+    (7, 11, 'bold')
+    """
+    if end is None:
+        end = len(buffer)
+    if isinstance(buffer, str):
+        patterns = (DELIMITER_PATTERN, IMAGE_PATTERN, LINK_PATTERN, _REFERENCE_MARKER)
+    else:
+        patterns = _BYTE_PATTERNS
+    nodes = []
+    code = bold = italic = False
+    segment_start = start
+    for match in patterns[0].finditer(buffer, start, end):
+        _emit_span_segment(nodes, buffer, segment_start, match.start(), _segment_type(code, bold, italic), patterns)
+        kind = match.lastindex
+        if kind == _CODE:
+            code = not code
+            bold = italic = False
+        elif kind == _BOLD:
+            bold = not bold
+            italic = False
+        else:
+            italic = not italic
+        segment_start = match.end()
+    _emit_span_segment(nodes, buffer, segment_start, end, _segment_type(code, bold, italic), patterns)
+    return nodes
+
+
+def _emit_span_segment(nodes: List[TextNode], buffer, start: int, end: int, text_type: TextType, patterns: tuple) -> None:
+    if buffer.find(patterns[3], start, end) == -1:
+        nodes.append(SpanTextNode(buffer, start, end, text_type))
+        return
+    prev_end = start
+    for match in patterns[1].finditer(buffer, start, end):
+        if match.start() > start:
+            _emit_span_links(nodes, buffer, prev_end, match.start(), TextType.TEXT, patterns)
+        nodes.append(SpanTextNode(buffer, match.start(1), match.end(1), TextType.IMAGE, slice_text(buffer, match.start(2), match.end(2))))
+        prev_end = match.end()
+    if prev_end == start:
+        _emit_span_links(nodes, buffer, start, end, text_type, patterns)
+    elif prev_end < end:
+        _emit_span_links(nodes, buffer, prev_end, end, TextType.TEXT, patterns)
+
+
+def _emit_span_links(nodes: List[TextNode], buffer, start: int, end: int, text_type: TextType, patterns: tuple) -> None:
+    prev_end = start
+    for match in patterns[2].finditer(buffer, start, end):
+        if match.start() > start:
+            nodes.append(SpanTextNode(buffer, prev_end, match.start(), TextType.TEXT))
+        nodes.append(SpanTextNode(buffer, match.start(1), match.end(1), TextType.LINK, slice_text(buffer, match.start(2), match.end(2))))
+        prev_end = match.end()
+    if prev_end == start:
+        nodes.append(SpanTextNode(buffer, start, end, text_type))
+    elif prev_end < end:
+        nodes.append(SpanTextNode(buffer, prev_end, end, TextType.TEXT))
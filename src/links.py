@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, Optional, Tuple
+import os
+import posixpath
+import urllib.parse
+
+from htmlnode import HTMLNode, LeafNode, walk
+from manifest import Manifest
+
+def page_references(nodes: Iterable[HTMLNode]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Collects the link and image targets of a page from its block nodes.
+
+    Returns:
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: The href of every link and the src of
+        every image, each in document order without repeats.
+    """
+    links = {}
+    images = {}
+    for node in walk(nodes):
+        if node.__class__ is LeafNode:
+            tag = node.tag
+            if tag == "a":
+                links[node.props["href"]] = None
+            elif tag == "img":
+                images[node.props["src"]] = None
+    return tuple(links), tuple(images)
+
+def resolve_target(page_output: str, target: str) -> Optional[str]:
+    """
+    Maps a link or image target on a page to the path it points to relative to the
+    output directory, with "/" separators.
+
+    Targets starting with "/" are relative to the site root, other ones to the page's
+    directory. Queries and fragments are dropped and a trailing "/" means the
+    directory's index.html.
+
+    Returns:
+        Optional[str]: The path, which starts with ".." when it leaves the site, or None
+        for targets on other sites, other schemes such as mailto:, and bare fragments.
+
+    Example:
+    >>> resolve_target("blog/post.html", "../about/#team")
+    'about/index.html'
+    """
+    if ":" in target or "?" in target or "#" in target or "%" in target or target.startswith("//"):
+        parts = urllib.parse.urlsplit(target)
+        if parts.scheme or parts.netloc or not parts.path:
+            return None
+        path = urllib.parse.unquote(parts.path)
+    elif not target:
+        return None
+    else:
+        # Most targets are plain paths, which urlsplit would return unchanged.
+        path = target
+    if path.startswith("/"):
+        resolved = path.lstrip("/") or "."
+    else:
+        resolved = posixpath.join(posixpath.dirname(page_output.replace(os.sep, "/")), path)
+    if path.endswith("/"):
+        resolved = posixpath.join(resolved, "index.html")
+    return posixpath.normpath(resolved)
+
+class LinkReport:
+    """
+    Result of checking the internal links and images of every page.
+
+    Attributes:
+    -----------
+    checked : int
+        Number of internal targets checked.
+    broken : List[Tuple[str, str]]
+        Source page and target of every link or image that does not resolve to a page or
+        static file of the site, sorted.
+    backlinks : Dict[str, List[str]]
+        For each page or static file that something points to, the sorted source pages
+        pointing to it.
+    """
+    def __init__(self):
+        self.checked = 0
+        self.broken = []
+        self.backlinks = {}
+
+def check_links(manifest: Manifest) -> LinkReport:
+    """
+    Checks the links and images recorded in the manifest against the pages and static
+    files it lists, without reading any output.
+
+    A target matches a file when it names it exactly, or names it without its ".html"
+    extension or as a directory containing an index.html.
+    """
+    files = {entry.output.replace(os.sep, "/") for entry in manifest.pages.values()}
+    files.update(path.replace(os.sep, "/") for path in manifest.static)
+    report = LinkReport()
+    backlinks: Dict[str, Dict[str, None]] = {}
+    # Pages in one directory mostly share their targets, e.g. navigation links.
+    matches: Dict[Tuple[str, str], Optional[str]] = {}
+    for page in sorted(manifest.pages):
+        entry = manifest.pages[page]
+        directory = posixpath.dirname(entry.output.replace(os.sep, "/"))
+        for target in entry.links + entry.images:
+            key = (directory, target)
+            if key in matches:
+                match = matches[key]
+            else:
+                match = matches[key] = _match(files, entry.output, target)
+            if match is None:
+                continue
+            report.checked += 1
+            if match:
+                backlinks.setdefault(match, {})[page] = None
+            else:
+                report.broken.append((page, target))
+    report.backlinks = {path: sorted(pages) for path, pages in sorted(backlinks.items())}
+    return report
+
+def _match(files: set, page_output: str, target: str) -> Optional[str]:
+    # The file the target points to, "" when there is none, or None for external targets.
+    resolved = resolve_target(page_output, target)
+    if resolved is None:
+        return None
+    for candidate in (resolved, resolved + ".html", resolved + "/index.html"):
+        if candidate in files:
+            return candidate
+    return ""
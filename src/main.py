@@ -1,56 +1,130 @@
-from textnode import TextType, TextNode
-from htmlnode import LeafNode
-
-def main():
-    textnode = TextNode("hello world", TextType.TEXT, "https://example.com")
-    print(text_node_to_html_node(textnode))
-
-def text_node_to_html_node(text_node: TextNode) -> LeafNode:
-    """
-    Converts a text node to an HTML node.
-
-    This function takes a text node object and converts it into an HTML node
-    based on the type of the text node. The conversion is done using a match-case
-    statement that checks the `text_type` attribute of the text node and returns
-    an appropriate `LeafNode` object.
-
-    Parameters:
-    text_node (TextNode): The text node object to be converted. It must have the
-                          following attributes:
-                          - text_type (str): The type of the text node. It can be
-                            one of the following values: "text", "bold", "italic",
-                            "code", "link", "image".
-                          - text (str): The text content of the node.
-                          - url (str, optional): The URL for link or image nodes.
-
-    Returns:
-    LeafNode: An HTML node represented as a `LeafNode` object. The tag and attributes
-              of the `LeafNode` depend on the `text_type` of the input `text_node`.
-
-    Raises:
-    ValueError: If the `text_type` of the text node is not one of the expected values.
-
-    Example:
-    >>> text_node = TextNode(text="Hello, World!", text_type="bold")
-    >>> html_node = text_node_to_html_node(text_node)
-    >>> print(html_node)
-    LeafNode(tag="b", text="Hello, World!")
-    """
-    match text_node.text_type:
-        case "text":
-            return LeafNode("", text_node.text)
-        case "bold":
-            return LeafNode("b", text_node.text)
-        case "italic":
-            return LeafNode("i", text_node.text)
-        case "code":
-            return LeafNode("code", text_node.text)
-        case "link":
-            return LeafNode("a", text_node.text, {"href": text_node.url})
-        case "image":
-            return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-        case _:
-            raise ValueError(f"Invalid text type: {text_node.text_type}")
+from typing import List, Optional
+import argparse
+import os
+
+from build import CACHE_DIR, BuildOptions, build_site
+from compress import GZIP_LEVEL, GZIP_MIN_SIZE
+from links import LinkReport, check_links
+from profiling import Profile
+from shard import merge_shards, parse_shard
+from sitemap import FEED_SIZE
+from treecache import TREE_CACHE_SIZE, TreeCache
+from writer import SYNC_POLICIES, WRITERS
+
+TREE_CACHE_DIR = "trees"
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Static site generator.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="convert every markdown page into HTML")
+    add_site_arguments(build_parser)
+    build_parser.add_argument("--force", action="store_true", help="re-render every page and rewrite every other output, even those the build manifest shows unchanged")
+    build_parser.add_argument("--static-checksum", action="store_true", help="compare content hashes of static files whose size or mtime changed")
+    build_parser.add_argument("--link-static", action="store_true", help="hard link static files into the output instead of copying them")
+    build_parser.add_argument("--writers", type=int, default=WRITERS, help=f"number of threads writing pages while others render, 0 to write in line (default: {WRITERS})")
+    build_parser.add_argument("--sync", choices=SYNC_POLICIES, default="none", help="fsync every page, sync once after the build, or leave flushing to the OS (default)")
+    build_parser.add_argument("--gzip", action="store_true", help="write a precompressed .gz next to every HTML and CSS output")
+    build_parser.add_argument("--gzip-level", type=int, choices=range(1, 10), default=GZIP_LEVEL, metavar="LEVEL", help=f"gzip compression level from 1 to 9 (default: {GZIP_LEVEL})")
+    build_parser.add_argument("--gzip-min-size", type=int, default=GZIP_MIN_SIZE, metavar="BYTES", help=f"leave outputs smaller than this uncompressed (default: {GZIP_MIN_SIZE})")
+    build_parser.add_argument("--shard", type=parse_shard, metavar="I/N", help="only build shard I of N (counting from 0), to be combined with merge")
+    build_parser.add_argument("--check-links", action="store_true", help="report links and images pointing to pages or files the site does not have, failing the build if there are any")
+    build_parser.add_argument("--base-url", metavar="URL", help="URL the site is served from, to write sitemap.xml and an Atom feed, atom.xml")
+    build_parser.add_argument("--feed-size", type=int, default=FEED_SIZE, metavar="PAGES", help=f"number of most recently updated pages in the feed, 0 for none (default: {FEED_SIZE})")
+    build_parser.add_argument("--search", action="store_true", help="write a full-text search index of the pages to _search/ in the output")
+    build_parser.add_argument("--tree-cache", action="store_true", help="keep parsed pages on disk so unchanged markdown is not parsed again")
+    build_parser.add_argument("--cache-dir", default=CACHE_DIR, help="directory holding the build caches")
+    build_parser.add_argument("--tree-cache-size", type=int, default=TREE_CACHE_SIZE // (1024 * 1024), metavar="MB", help="trim the tree cache to this many megabytes after each build (default: %(default)s)")
+    build_parser.add_argument("--inline-cache", type=int, default=0, metavar="SIZE", help="memoize up to SIZE repeated paragraphs per worker (default: off)")
+    build_parser.add_argument("--profile", action="store_true", help="print per-stage timings and counters after the build")
+    build_parser.add_argument("--profile-pages", choices=("cprofile", "tracemalloc"), help="also capture a cProfile dump or peak memory for every page (implies --profile)")
+    build_parser.add_argument("--profile-dir", default="profiles", help="directory the per-page cProfile dumps are written to")
+
+    clear_parser = commands.add_parser("clear-cache", help="delete the parsed pages kept by --tree-cache")
+    clear_parser.add_argument("--cache-dir", default=CACHE_DIR, help="directory holding the build caches")
+
+    merge_parser = commands.add_parser("merge", help="combine the outputs of every shard of a sharded build")
+    merge_parser.add_argument("shards", nargs="+", metavar="SHARD_OUTPUT", help="output directory of each shard")
+    merge_parser.add_argument("--output", default="public", help="directory the merged site is written to")
+    merge_parser.add_argument("--check-links", action="store_true", help="report links and images across all shards that do not resolve, failing if there are any")
+    merge_parser.add_argument("--link", action="store_true", help="hard link files into the output instead of copying them")
+
+    serve_parser = commands.add_parser("serve", help="build, serve the output and rebuild changed pages on every edit")
+    add_site_arguments(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    serve_parser.add_argument("--poll", action="store_true", help="watch for changes by polling instead of inotify")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        if args.search and args.shard is not None:
+            parser.error("--search cannot be combined with --shard")
+        if args.base_url is not None and args.shard is not None:
+            parser.error("--base-url cannot be combined with --shard")
+        if args.check_links and args.shard is not None:
+            parser.error("--check-links cannot be combined with --shard")
+        profile = Profile(args.profile_pages, args.profile_dir) if args.profile or args.profile_pages else None
+        tree_cache = TreeCache(os.path.join(args.cache_dir, TREE_CACHE_DIR), args.tree_cache_size * 1024 * 1024) if args.tree_cache else None
+        options = BuildOptions(jobs=args.jobs, force=args.force, inline_cache=args.inline_cache, profile=profile,
+                               static_dir=args.static, static_checksum=args.static_checksum, static_link=args.link_static,
+                               writers=args.writers, sync=args.sync, gzip=args.gzip, gzip_level=args.gzip_level, gzip_min_size=args.gzip_min_size,
+                               shard=args.shard, tree_cache=tree_cache, links=args.check_links, search=args.search, cache_dir=args.cache_dir, base_url=args.base_url, feed_size=args.feed_size)
+        report = build_site(args.content, args.output, args.template, options)
+        print(f"Built {len(report.rendered)} pages into {args.output} ({report.unchanged} unchanged, {len(report.removed)} removed)")
+        if report.static is not None:
+            static = report.static
+            print(f"Copied {len(static.copied)} static files ({static.unchanged} unchanged, {len(static.removed)} removed)")
+        if args.gzip:
+            compressed = report.compressed
+            print(f"Compressed {len(compressed.compressed)} files, saving {compressed.bytes_saved / 1024:.1f}KiB ({compressed.unchanged} unchanged, {len(compressed.removed)} removed)")
+        if report.sitemaps is not None:
+            sitemaps = report.sitemaps
+            print(f"Listed {sitemaps.urls} pages in the sitemaps ({len(sitemaps.written)} files written, {sitemaps.unchanged} unchanged, {len(sitemaps.removed)} removed)")
+        if report.search is not None:
+            search = report.search
+            print(f"Indexed {search.terms} terms across {search.pages} pages ({search.written} chunks written, {search.unchanged} unchanged, {search.removed} removed)")
+        if report.tree_cache_evicted:
+            print(f"Evicted {report.tree_cache_evicted} pages from the tree cache")
+        if report.inline_cache is not None:
+            info = report.inline_cache
+            print(f"Inline cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+        if report.profile is not None:
+            print()
+            print(report.profile.summary())
+        if report.links is not None:
+            print_link_report(report.links)
+            if report.links.broken:
+                parser.exit(1)
+    elif args.command == "clear-cache":
+        TreeCache(os.path.join(args.cache_dir, TREE_CACHE_DIR)).clear()
+        print(f"Cleared the tree cache in {args.cache_dir}")
+    elif args.command == "merge":
+        try:
+            manifest, report = merge_shards(args.shards, args.output, args.link)
+        except ValueError as e:
+            parser.exit(1, f"merge failed: {e}\n")
+        print(f"Merged {len(args.shards)} shards with {len(manifest.pages)} pages into {args.output} ({len(report.copied)} files copied, {report.unchanged} unchanged, {len(report.removed)} removed)")
+        if args.check_links:
+            links = check_links(manifest)
+            print_link_report(links)
+            if links.broken:
+                parser.exit(1)
+    elif args.command == "serve":
+        # Imported here so other commands do not load http.server and the watchers.
+        from serve import serve_site
+        serve_site(args.content, args.output, args.template, args.host, args.port, args.jobs, args.poll, args.static)
+
+def print_link_report(report: LinkReport) -> None:
+    for page, target in report.broken:
+        print(f"{page}: broken link to {target}")
+    print(f"Checked {report.checked} internal links and images, {len(report.broken)} broken")
+
+def add_site_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--content", default="content", help="directory containing the markdown pages")
+    parser.add_argument("--output", default="public", help="directory the site is written to")
+    parser.add_argument("--template", default="template.html", help="HTML template for every page")
+    parser.add_argument("--static", default="static", help="directory of static files mirrored into the output")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="number of worker processes (default: CPU count)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, Optional, Tuple
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 3
+
+def hash_file(path: str) -> str:
+    """
+    Returns a hex digest of the file's contents, read in chunks.
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+class PageEntry:
+    """
+    What the manifest remembers about one source page.
+
+    Attributes:
+    -----------
+    hash : str
+        Content hash of the markdown source.
+    size : int
+        Size of the source in bytes when it was hashed.
+    mtime_ns : int
+        Modification time of the source when it was hashed.
+    output : str
+        Path of the rendered page relative to the output directory.
+    title : str
+        Title of the rendered page.
+    links : Tuple[str, ...]
+        Targets of the links on the page.
+    images : Tuple[str, ...]
+        Sources of the images on the page.
+    updated : int
+        Modification time of the source when its content last changed, unlike mtime_ns
+        not moved by touching it.
+    summary : str
+        Opening text of the page, see sitemap.page_summary.
+    """
+    __slots__ = ("hash", "size", "mtime_ns", "output", "title", "links", "images", "updated", "summary")
+
+    def __init__(self, hash: str, size: int, mtime_ns: int, output: str, title: str, links: Iterable[str] = (), images: Iterable[str] = (), updated: int = 0, summary: str = ""):
+        self.hash = hash
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.output = output
+        self.title = title
+        self.links = tuple(links)
+        self.images = tuple(images)
+        self.updated = updated
+        self.summary = summary
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    def to_dict(self) -> dict:
+        return {"hash": self.hash, "size": self.size, "mtime_ns": self.mtime_ns, "output": self.output, "title": self.title,
+                "links": list(self.links), "images": list(self.images), "updated": self.updated, "summary": self.summary}
+
+    def __eq__(self, other: 'PageEntry') -> bool:
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"PageEntry({self.hash}, {self.size}, {self.mtime_ns}, {self.output}, {self.title}, {self.links}, {self.images}, {self.updated}, {self.summary!r})"
+
+class StaticEntry:
+    """
+    What the manifest remembers about one static file copied into the output, or one
+    output file compressed into a .gz sibling.
+
+    Attributes:
+    -----------
+    size : int
+        Size of the file in bytes when it was copied or compressed.
+    mtime_ns : int
+        Modification time of the file when it was copied or compressed.
+    hash : Optional[str]
+        Content hash of the file, recorded by checksum syncs and by compression.
+    """
+    __slots__ = ("size", "mtime_ns", "hash")
+
+    def __init__(self, size: int, mtime_ns: int, hash: Optional[str] = None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.hash = hash
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    def to_dict(self) -> dict:
+        return {"size": self.size, "mtime_ns": self.mtime_ns, "hash": self.hash}
+
+    def __eq__(self, other: 'StaticEntry') -> bool:
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"StaticEntry({self.size}, {self.mtime_ns}, {self.hash})"
+
+class Manifest:
+    """
+    Record of the inputs and outputs of the previous build, stored in the output directory.
+
+    Attributes:
+    -----------
+    template_hash : Optional[str]
+        Content hash of the template used for the previous build.
+    pages : Dict[str, PageEntry]
+        Entries keyed by source path relative to the content directory.
+    static : Dict[str, StaticEntry]
+        Entries keyed by path relative to the static directory, which is also the
+        path of the copy relative to the output directory.
+    compressed : Dict[str, StaticEntry]
+        Entries keyed by path relative to the output directory of each file that has a
+        .gz sibling, describing the file as it was when compressed.
+    shard : Optional[Tuple[int, int]]
+        Index and count of the shard the build covered, or None for a whole site.
+    generated : Dict[str, str]
+        Digest of the entries of every sitemap and feed file, keyed by path relative to
+        the output directory.
+    """
+    def __init__(self, template_hash: Optional[str] = None, pages: Optional[Dict[str, PageEntry]] = None, static: Optional[Dict[str, StaticEntry]] = None, compressed: Optional[Dict[str, StaticEntry]] = None, shard: Optional[Tuple[int, int]] = None, generated: Optional[Dict[str, str]] = None):
+        self.template_hash = template_hash
+        self.pages = pages if pages is not None else {}
+        self.static = static if static is not None else {}
+        self.compressed = compressed if compressed is not None else {}
+        self.shard = shard
+        self.generated = generated if generated is not None else {}
+
+    @classmethod
+    def load(cls, path: str) -> 'Manifest':
+        """
+        Reads a manifest, returning an empty one when the file is missing, unreadable
+        or written by another manifest version.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls()
+        try:
+            pages = {source: PageEntry(**entry) for source, entry in data["pages"].items()}
+            static = {path: StaticEntry(**entry) for path, entry in data.get("static", {}).items()}
+            compressed = {path: StaticEntry(**entry) for path, entry in data.get("compressed", {}).items()}
+            shard = tuple(data["shard"]) if data.get("shard") is not None else None
+            return cls(data["template"]["hash"], pages, static, compressed, shard, data.get("generated", {}))
+        except (KeyError, TypeError, AttributeError):
+            # Missing keys, unexpected entry fields or values of the wrong type.
+            return cls()
+
+    def save(self, path: str) -> None:
+        """
+        Writes the manifest atomically, so an interrupted build leaves the previous one intact.
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": {"hash": self.template_hash},
+            "shard": list(self.shard) if self.shard is not None else None,
+            "pages": {source: self.pages[source].to_dict() for source in sorted(self.pages)},
+            "static": {path: self.static[path].to_dict() for path in sorted(self.static)},
+            "compressed": {path: self.compressed[path].to_dict() for path in sorted(self.compressed)},
+            "generated": dict(sorted(self.generated.items())),
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # json.dumps uses the C encoder, json.dump streams through the pure-Python one.
+            f.write(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp_path, path)
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import cProfile
+import os
+import time
+import tracemalloc
+
+PAGE_CAPTURES = ("cprofile", "tracemalloc")
+PROFILE_EXTENSION = ".prof"
+
+class PageTiming(NamedTuple):
+    page: str
+    seconds: float
+    peak_memory: Optional[int] # Peak bytes allocated while rendering, with tracemalloc capture.
+
+class Profile:
+    """
+    Stage timings and counters collected while profiling is enabled.
+
+    Attributes:
+    -----------
+    capture : Optional[str]
+        Per-page capture, one of PAGE_CAPTURES, or None for stage timings only.
+    profile_dir : Optional[str]
+        Directory cProfile captures are written to, one .prof file per page.
+    spans : Dict[str, List[float]]
+        Number of calls and total seconds for each named span.
+    counters : Dict[str, int]
+        Totals for each named counter.
+    pages : List[PageTiming]
+        Time spent on each page.
+    """
+    def __init__(self, capture: Optional[str] = None, profile_dir: Optional[str] = None):
+        if capture is not None and capture not in PAGE_CAPTURES:
+            raise ValueError(f"Invalid page capture: {capture}")
+        if capture == "cprofile" and profile_dir is None:
+            raise ValueError("cprofile capture needs a profile_dir")
+        self.capture = capture
+        self.profile_dir = profile_dir
+        self.spans: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.pages: List[PageTiming] = []
+
+    def fresh(self) -> 'Profile':
+        """
+        Returns an empty profile with the same capture settings.
+        """
+        return Profile(self.capture, self.profile_dir)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other: 'Profile') -> None:
+        """
+        Adds the spans, counters and pages of another profile, e.g. one sent back by a worker.
+        """
+        for name, (calls, seconds) in other.spans.items():
+            self.add_time(name, seconds, calls)
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        self.pages.extend(other.pages)
+
+    def summary(self, slowest: int = 5) -> str:
+        """
+        Formats the spans, counters and slowest pages as a plain-text report.
+
+        Span times are inclusive: "parse" contains the "inline" and "convert" spans
+        run for each block.
+        """
+        # The label column fits the longest span or counter name, e.g. tree_cache_misses.
+        width = max(14, *map(len, self.spans), *map(len, self.counters))
+        lines = [f"{'span':<{width}} {'calls':>10} {'total':>12} {'mean':>12}"]
+        for name, (calls, seconds) in sorted(self.spans.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<{width}} {calls:>10} {seconds * 1000:>10.2f}ms {seconds / calls * 1e6:>10.2f}us")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name:<{width}} {amount:>10}" for name, amount in sorted(self.counters.items()))
+        if self.pages and slowest:
+            lines.append("")
+            lines.append("slowest pages:")
+            for page in sorted(self.pages, key=lambda page: -page.seconds)[:slowest]:
+                memory = f" {page.peak_memory / 1024:>10.1f}KiB peak" if page.peak_memory is not None else ""
+                lines.append(f"  {page.page:<40} {page.seconds * 1000:>10.2f}ms{memory}")
+        return "\n".join(lines)
+
+class _Span:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+# Returned by span while profiling is off, so disabled spans allocate nothing.
+_NO_SPAN = _NoSpan()
+
+# Profile receiving spans and counters, or None when profiling is off.
+_profile: Optional[Profile] = None
+
+def enable_profiling(profile: Profile) -> None:
+    """
+    Starts recording spans and counters into profile for the current process.
+    """
+    global _profile
+    _profile = profile
+
+def disable_profiling() -> None:
+    global _profile
+    _profile = None
+
+def active_profile() -> Optional[Profile]:
+    return _profile
+
+def take_profile() -> Optional[Profile]:
+    """
+    Returns what has been recorded so far and keeps recording into an empty profile,
+    or returns None when profiling is off.
+    """
+    global _profile
+    if _profile is None:
+        return None
+    profile, _profile = _profile, _profile.fresh()
+    return profile
+
+def span(name: str):
+    """
+    Returns a context manager adding the time spent in its body to the named span.
+
+    Example:
+    >>> with span("render"):
+    ...     html = node.to_html()
+    """
+    if _profile is None:
+        return _NO_SPAN
+    return _Span(_profile, name)
+
+def count(name: str, amount: int = 1) -> None:
+    if _profile is not None:
+        _profile.count(name, amount)
+
+@contextmanager
+def capture_page(page: str) -> Iterator[None]:
+    """
+    Records the time spent rendering a page, plus a cProfile dump or the peak
+    tracemalloc usage when the active profile asks for one. Does nothing when
+    profiling is off.
+    """
+    profile = _profile
+    if profile is None:
+        yield
+        return
+    profiler = None
+    if profile.capture == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile.capture == "tracemalloc":
+        tracemalloc.start()
+    peak_memory = None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            path = os.path.join(profile.profile_dir, page + PROFILE_EXTENSION)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            profiler.dump_stats(path)
+        elif profile.capture == "tracemalloc":
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        profile.add_time("page", seconds)
+        profile.pages.append(PageTiming(page, seconds, peak_memory))
@@ -0,0 +1,198 @@
+from typing import Dict, Iterable, List, Tuple
+import hashlib
+import json
+import marshal
+import os
+import re
+import shutil
+
+from htmlnode import HTMLNode, LeafNode, walk
+
+# The index is written to this directory of the output: index.json lists the pages and
+# chunks/<name>.json hold the postings of every term whose name maps to that chunk.
+SEARCH_DIR = "_search"
+CHUNK_DIR = "chunks"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+# Terms of every page, kept in this subdirectory of the build cache directory so
+# unchanged pages need not be rendered. Being internal, they are not written to the
+# output, which is deployed.
+SEARCH_CACHE_DIR = "search"
+PREFIX_LENGTH = 2
+
+WORD_PATTERN = re.compile(r"\w+")
+# Leaves holding plain, bold, italic and code text; link text and image alt text are
+# not indexed.
+TEXT_TAGS = frozenset(("", None, "b", "i", "code"))
+
+def page_terms(nodes: Iterable[HTMLNode]) -> Dict[str, List[int]]:
+    """
+    Splits the text of a page's block nodes into lower-case words.
+
+    Returns:
+        Dict[str, List[int]]: The word positions of every term, delta-encoded: the first
+        entry is the position of its first occurrence and each following entry the
+        distance from the previous one.
+
+    Example:
+    >>> page_terms(iter_block_nodes("A **b** a"))
+    {'a': [0, 2], 'b': [1]}
+    """
+    texts = [node.value for node in walk(nodes) if node.__class__ is LeafNode and node.tag in TEXT_TAGS]
+    terms = {}
+    last = {}
+    # One pass over the whole text is cheaper than one per leaf; the separator keeps
+    # words in adjacent leaves apart, as they are when searched for separately.
+    for position, word in enumerate(WORD_PATTERN.findall(" ".join(texts).lower())):
+        positions = terms.get(word)
+        if positions is None:
+            terms[word] = [position]
+        else:
+            positions.append(position - last[word])
+        last[word] = position
+    return terms
+
+def chunk_name(term: str) -> str:
+    """
+    Returns the name of the chunk holding a term's postings: its first PREFIX_LENGTH
+    characters when those are ASCII letters, digits or "_", otherwise "u" followed by
+    their code points in hex.
+
+    Example:
+    >>> chunk_name("search"), chunk_name("é")
+    ('se', 'u-e9')
+    """
+    prefix = term[:PREFIX_LENGTH]
+    if prefix.isascii() and (prefix.isalnum() or "_" in prefix):
+        return prefix
+    return "u" + "".join(f"-{ord(char):x}" for char in prefix)
+
+class SearchReport:
+    """
+    Summary of writing the search index.
+
+    Attributes:
+    -----------
+    pages : int
+        Number of pages in the index.
+    terms : int
+        Number of distinct terms.
+    written : int
+        Number of chunks written because their contents changed.
+    unchanged : int
+        Number of chunks left as they were.
+    removed : int
+        Number of chunks deleted because none of their terms are left.
+    """
+    def __init__(self):
+        self.pages = 0
+        self.terms = 0
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+def write_index(output_dir: str, pages: Iterable[Tuple[str, str, Dict[str, List[int]]]]) -> SearchReport:
+    """
+    Writes the inverted index of pages to SEARCH_DIR under output_dir.
+
+    index.json holds {"version", "prefix", "pages"}, where pages lists [url, title] by
+    page id. Each chunk maps its terms to a flat list of postings: for every page
+    containing the term, in page id order, the distance from the previous page id
+    (the page id itself for the first), the number of occurrences, and the
+    delta-encoded positions from page_terms. A browser looking up a word only loads
+    the chunk named by chunk_name. Files whose contents did not change are not
+    rewritten.
+
+    Args:
+        output_dir (str): Directory the site is written to.
+        pages (Iterable[Tuple[str, str, Dict[str, List[int]]]]): URL relative to the site
+            root, title and terms of every page, in page id order.
+    """
+    report = SearchReport()
+    page_list = []
+    postings: Dict[str, List[int]] = {}
+    last_page: Dict[str, int] = {}
+    for page_id, (url, title, terms) in enumerate(pages):
+        page_list.append([url, title])
+        for term, positions in terms.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = [page_id]
+            else:
+                entry.append(page_id - last_page[term])
+            last_page[term] = page_id
+            entry.append(len(positions))
+            entry.extend(positions)
+    report.pages = len(page_list)
+    report.terms = len(postings)
+
+    chunks: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(postings):
+        chunks.setdefault(chunk_name(term), {})[term] = postings[term]
+    directory = os.path.join(output_dir, SEARCH_DIR)
+    chunk_dir = os.path.join(directory, CHUNK_DIR)
+    os.makedirs(chunk_dir, exist_ok=True)
+    _write_if_changed(os.path.join(directory, INDEX_NAME), {"version": INDEX_VERSION, "prefix": PREFIX_LENGTH, "pages": page_list})
+    for name, terms in chunks.items():
+        if _write_if_changed(os.path.join(chunk_dir, name + ".json"), terms):
+            report.written += 1
+        else:
+            report.unchanged += 1
+    for file_name in os.listdir(chunk_dir):
+        if file_name[:-len(".json")] not in chunks:
+            os.remove(os.path.join(chunk_dir, file_name))
+            report.removed += 1
+    return report
+
+def _write_if_changed(path: str, data: object) -> bool:
+    encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == encoded:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(encoded)
+    return True
+
+def search_state_path(cache_dir: str, output_dir: str) -> str:
+    """
+    Returns the file under cache_dir holding the terms of the site built into
+    output_dir. It is named after a hash of output_dir's absolute path, so sites
+    sharing a cache directory keep separate terms.
+    """
+    key = hashlib.blake2b(os.path.abspath(output_dir).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, SEARCH_CACHE_DIR, key + ".marshal")
+
+def load_search_state(path: str) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Reads the terms of every page recorded by the previous build from the file at
+    search_state_path, keyed by source path, returning an empty dict when there are none.
+    """
+    try:
+        with open(path, "rb") as f:
+            version, state = marshal.loads(f.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        return {}
+    return state if version == INDEX_VERSION else {}
+
+def save_search_state(path: str, state: Dict[str, Dict[str, List[int]]]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(marshal.dumps((INDEX_VERSION, state)))
+    os.replace(tmp_path, path)
+
+def remove_index(output_dir: str, state_path: str) -> bool:
+    """
+    Deletes the search index in output_dir and the terms recorded at state_path,
+    returning whether there were any.
+    """
+    found = os.path.exists(state_path)
+    if found:
+        os.remove(state_path)
+    if os.path.isdir(os.path.join(output_dir, SEARCH_DIR)):
+        shutil.rmtree(os.path.join(output_dir, SEARCH_DIR))
+        found = True
+    return found
@@ -0,0 +1,203 @@
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, List, Optional
+import dataclasses
+import logging
+import os
+import threading
+import time
+import urllib.parse
+
+from build import HTML_EXTENSION, MARKDOWN_EXTENSION, BuildOptions, BuildReport, build_site, update_site
+from manifest import MANIFEST_NAME, Manifest
+from template import load_template
+from watch import create_watcher
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'.encode()
+# Comment lines sent on idle live-reload connections so closed tabs are noticed.
+KEEPALIVE_INTERVAL = 15.0
+
+logger = logging.getLogger(__name__)
+
+class ReloadSignal:
+    """
+    Version counter that live-reload connections wait on; every rebuild bumps it.
+    """
+    def __init__(self):
+        self.version = 0
+        self._condition = threading.Condition()
+
+    def notify(self) -> None:
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version: int, timeout: Optional[float] = None) -> int:
+        """
+        Blocks until the version differs from `version` or timeout passes, returning the current version.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+def inject_live_reload(html: bytes) -> bytes:
+    """
+    Adds the live-reload script before the closing body tag, or at the end of the page.
+    """
+    index = html.rfind(b"</body>")
+    if index == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:index] + LIVE_RELOAD_SCRIPT + html[index:]
+
+def make_handler(output_dir: str, signal: ReloadSignal) -> type:
+    """
+    Returns a request handler class serving output_dir, with the live-reload script
+    added to every HTML page and an event stream at LIVE_RELOAD_PATH.
+    """
+    class SiteRequestHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=output_dir, **kwargs)
+
+        def do_GET(self):
+            url_path = urllib.parse.urlsplit(self.path).path
+            if url_path == LIVE_RELOAD_PATH:
+                self.send_events()
+                return
+            path = self.translate_path(self.path)
+            if os.path.isdir(path) and url_path.endswith("/"):
+                path = os.path.join(path, "index.html")
+            if path.endswith(HTML_EXTENSION) and os.path.isfile(path):
+                self.send_page(path)
+                return
+            super().do_GET()
+
+        def send_page(self, path: str) -> None:
+            with open(path, "rb") as f:
+                body = inject_live_reload(f.read())
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_events(self) -> None:
+            # Read before answering so a rebuild right after the client connects is not missed.
+            version = signal.version
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            try:
+                while True:
+                    current = signal.wait(version, KEEPALIVE_INTERVAL)
+                    self.wfile.write(b"data: reload\n\n" if current != version else b": keepalive\n\n")
+                    self.wfile.flush()
+                    version = current
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            # Requests go to the module logger instead of stderr, which is silent unless
+            # logging is configured.
+            logger.info("%s - %s", self.address_string(), format % args)
+
+    return SiteRequestHandler
+
+def is_under(directory: str, path: str) -> bool:
+    return path.startswith(os.path.abspath(directory) + os.sep)
+
+def changed_pages(content_dir: str, paths: Iterable[str]) -> Optional[List[str]]:
+    """
+    Maps changed absolute paths to markdown sources relative to content_dir.
+
+    Returns:
+        Optional[List[str]]: The changed sources, or None when a path that is gone and is
+        not a markdown file changed, e.g. a moved directory, so the whole site must be checked.
+    """
+    root = os.path.abspath(content_dir) + os.sep
+    pages = []
+    for path in paths:
+        if not is_under(content_dir, path):
+            continue
+        if path.endswith(MARKDOWN_EXTENSION):
+            pages.append(path[len(root):])
+        elif not os.path.exists(path):
+            return None
+    return pages
+
+def rebuild(content_dir: str, output_dir: str, template_path: str, manifest: Manifest, paths: Iterable[str], options: BuildOptions = BuildOptions()) -> BuildReport:
+    """
+    Re-renders the pages affected by the changed paths; a template change re-renders everything.
+    Static files are only synced when one of the paths is under options.static_dir.
+    """
+    paths = list(paths)
+    if options.static_dir is not None and not any(is_under(options.static_dir, path) for path in paths):
+        options = dataclasses.replace(options, static_dir=None)
+    return update_site(content_dir, output_dir, template_path, manifest, options, changed_pages(content_dir, paths))
+
+def serve_site(content_dir: str, output_dir: str, template_path: str, host: str = "127.0.0.1", port: int = 8000, jobs: Optional[int] = None, polling: bool = False, static_dir: Optional[str] = None) -> None:
+    """
+    Builds the site, serves output_dir over HTTP and rebuilds on every change until interrupted.
+
+    The content directory, the template with its partials and the static directory are
+    watched with inotify, or by polling where inotify is unavailable. Only the changed
+    pages are re-rendered, after which open pages reload themselves through a server-sent
+    event. The build manifest is kept in memory between rebuilds and written back when
+    the server stops.
+
+    Args:
+        content_dir (str): Directory searched recursively for .md files.
+        output_dir (str): Directory the site is written to and served from.
+        template_path (str): HTML template containing {{ Title }} and {{ Content }}.
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 to pick a free one.
+        jobs (Optional[int]): Number of worker processes for builds touching many pages.
+        polling (bool): Watch by polling even where inotify is available.
+        static_dir (Optional[str]): Directory of static files mirrored into output_dir.
+    """
+    options = BuildOptions(jobs=jobs, static_dir=static_dir)
+    report = build_site(content_dir, output_dir, template_path, options)
+    print(f"Built {len(report.rendered)} pages into {output_dir} ({report.unchanged} unchanged, {len(report.removed)} removed)")
+    signal = ReloadSignal()
+    server = ThreadingHTTPServer((host, port), make_handler(output_dir, signal))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    manifest = report.manifest
+    watched = _watched_paths(content_dir, template_path, static_dir)
+    watcher = create_watcher(watched, polling)
+    print(f"Serving {output_dir} at http://{host}:{server.server_port}/ ({type(watcher).__name__})")
+    try:
+        while True:
+            paths = watcher.changes()
+            if not paths:
+                continue
+            start = time.perf_counter()
+            try:
+                report = rebuild(content_dir, output_dir, template_path, manifest, paths, options)
+            except (OSError, ValueError) as e:
+                print(f"Rebuild failed: {e}")
+                continue
+            manifest = report.manifest
+            if _watched_paths(content_dir, template_path, static_dir) != watched:
+                # The template gained or lost a partial.
+                watcher.close()
+                watched = _watched_paths(content_dir, template_path, static_dir)
+                watcher = create_watcher(watched, polling)
+            copied = len(report.static.copied) + len(report.static.removed) if report.static is not None else 0
+            if report.rendered or report.removed or copied:
+                signal.notify()
+                print(f"Rebuilt {len(report.rendered)} pages, removed {len(report.removed)}, synced {copied} static files in {(time.perf_counter() - start) * 1000:.1f}ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        server.shutdown()
+        server.server_close()
+        manifest.save(os.path.join(output_dir, MANIFEST_NAME))
+
+def _watched_paths(content_dir: str, template_path: str, static_dir: Optional[str]) -> List[str]:
+    paths = [content_dir] + sorted(load_template(template_path).files)
+    if static_dir is not None and os.path.isdir(static_dir):
+        paths.append(static_dir)
+    return paths
@@ -0,0 +1,127 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+
+from manifest import MANIFEST_NAME, Manifest
+from static import SyncReport, copy_file, find_static_files, remove_output
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parses a shard given as "index/count", with indexes counted from 0.
+
+    Example:
+    >>> parse_shard("2/8")
+    (2, 8)
+
+    Raises:
+    ValueError: If text is not of that form or index is not below count.
+    """
+    index, separator, count = text.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit():
+        raise ValueError(f"Invalid shard {text!r}, expected index/count such as 0/4")
+    index, count = int(index), int(count)
+    if count == 0 or index >= count:
+        raise ValueError(f"Invalid shard {text!r}, index must be below count")
+    return index, count
+
+def shard_of(path: str, count: int) -> int:
+    """
+    Returns the shard a path relative to the content or static directory belongs to.
+
+    The shard comes from a hash of the path with "/" separators, so every machine
+    assigns a path to the same shard regardless of platform or PYTHONHASHSEED.
+    """
+    digest = hashlib.blake2b(path.replace(os.sep, "/").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+def in_shard(path: str, shard: Optional[Tuple[int, int]]) -> bool:
+    return shard is None or shard_of(path, shard[1]) == shard[0]
+
+def manifest_files(manifest: Manifest) -> List[str]:
+    """
+    Lists every file a build with this manifest wrote, relative to its output directory.
+    """
+    files = [entry.output for entry in manifest.pages.values()]
+    files.extend(manifest.static)
+    files.extend(path + ".gz" for path in manifest.compressed)
+    return files
+
+def merge_shards(shard_dirs: Iterable[str], output_dir: str, link: bool = False) -> Tuple[Manifest, SyncReport]:
+    """
+    Combines the output directories of every shard of a sharded build into one site.
+
+    Each shard's manifest must name its shard, all of them must come from the same
+    shard count and template, and together they must cover every shard exactly once.
+    No two shards may produce the same page or file. Files are only copied when the copy
+    in output_dir has a different size or mtime, and files from an earlier merge that no
+    shard produces any more are removed. The combined manifest is written to output_dir.
+
+    Args:
+        shard_dirs (Iterable[str]): Output directories of the shards, in any order.
+        output_dir (str): Directory the merged site is written to.
+        link (bool): Hard link files into output_dir instead of copying where possible.
+
+    Returns:
+        Tuple[Manifest, SyncReport]: The merged manifest, and the files copied, skipped and removed.
+
+    Raises:
+    ValueError: If the shards are incomplete, inconsistent or overlap.
+    """
+    shard_dirs = list(shard_dirs)
+    manifests = []
+    for shard_dir in shard_dirs:
+        manifest = Manifest.load(os.path.join(shard_dir, MANIFEST_NAME))
+        if manifest.shard is None:
+            raise ValueError(f"{shard_dir} is not the output of a sharded build")
+        manifests.append(manifest)
+    counts = {manifest.shard[1] for manifest in manifests}
+    if len(counts) != 1:
+        raise ValueError(f"Shards were built with different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    indexes = sorted(manifest.shard[0] for manifest in manifests)
+    if indexes != list(range(count)):
+        raise ValueError(f"Expected each of shards 0 to {count - 1} once, got {indexes}")
+    templates = {manifest.template_hash for manifest in manifests}
+    if len(templates) != 1:
+        raise ValueError("Shards were built with different templates")
+
+    merged = Manifest(templates.pop())
+    sources: Dict[str, str] = {}
+    collisions = set()
+    for shard_dir, manifest in zip(shard_dirs, manifests):
+        for page, entry in manifest.pages.items():
+            if page in merged.pages:
+                collisions.add(page)
+            merged.pages[page] = entry
+        merged.static.update(manifest.static)
+        merged.compressed.update(manifest.compressed)
+        for path, _ in find_static_files(shard_dir):
+            if path == MANIFEST_NAME:
+                continue
+            if path in sources:
+                collisions.add(path)
+            sources[path] = os.path.join(shard_dir, path)
+    if collisions:
+        raise ValueError("Shards overlap on " + ", ".join(sorted(collisions)))
+
+    report = SyncReport()
+    for path, source in sorted(sources.items()):
+        if _same_stat(source, os.path.join(output_dir, path)):
+            report.unchanged += 1
+            continue
+        copy_file(source, os.path.join(output_dir, path), link)
+        report.copied.append(path)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    for path in sorted(set(manifest_files(Manifest.load(manifest_path))) - sources.keys()):
+        remove_output(output_dir, path)
+        report.removed.append(path)
+    os.makedirs(output_dir, exist_ok=True)
+    merged.save(manifest_path)
+    return merged, report
+
+def _same_stat(source: str, destination: str) -> bool:
+    try:
+        a, b = os.stat(source), os.stat(destination)
+    except FileNotFoundError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
@@ -0,0 +1,212 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import hashlib
+import heapq
+import os
+import time
+import urllib.parse
+
+from htmlnode import HTMLNode, LeafNode, escape_attribute, escape_text, walk
+from manifest import Manifest, PageEntry
+from shard import shard_of
+from static import remove_output
+
+SITEMAP_NAME = "sitemap.xml"
+# The sitemap protocol allows at most 50,000 URLs per file; larger sites get numbered
+# sitemaps listed by a sitemap index in SITEMAP_NAME.
+SITEMAP_LIMIT = 50000
+FEED_NAME = "atom.xml"
+FEED_SIZE = 20
+SUMMARY_LENGTH = 200
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+def page_summary(nodes: Iterable[HTMLNode], length: int = SUMMARY_LENGTH) -> str:
+    """
+    Returns the text of a page's first paragraph, cut at a word boundary after at most
+    `length` characters, or "" when the page has no paragraph.
+
+    Example:
+    >>> page_summary(iter_block_nodes("# Title\\n\\nSome *short* text."))
+    'Some short text.'
+    """
+    for node in nodes:
+        if node.tag == "p":
+            text = " ".join("".join([leaf.value for leaf in walk((node,)) if leaf.__class__ is LeafNode]).split())
+            if len(text) > length:
+                text = text[:length + 1].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+            return text
+    return ""
+
+def page_url(base_url: str, output: str) -> str:
+    """
+    Returns the absolute URL of a page, given its output path relative to the output
+    directory. Pages named index.html are addressed by their directory.
+
+    Example:
+    >>> page_url("https://example.com/", "blog/index.html")
+    'https://example.com/blog/'
+    """
+    path = output.replace(os.sep, "/")
+    if path == "index.html" or path.endswith("/index.html"):
+        path = path[:-len("index.html")]
+    return base_url.rstrip("/") + "/" + urllib.parse.quote(path)
+
+def format_time(ns: int) -> str:
+    """
+    Formats a timestamp in nanoseconds as a UTC date and time, as sitemaps and Atom
+    feeds expect.
+
+    Example:
+    >>> format_time(0)
+    '1970-01-01T00:00:00Z'
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ns // 1_000_000_000))
+
+class SitemapReport:
+    """
+    Summary of maintaining the sitemaps and the feed.
+
+    Attributes:
+    -----------
+    urls : int
+        Number of pages listed in the sitemaps.
+    written : List[str]
+        Files rewritten because their entries changed, sorted.
+    unchanged : int
+        Number of files left as they were.
+    removed : List[str]
+        Files deleted because they are no longer needed, e.g. numbered sitemaps after the
+        site shrank below SITEMAP_LIMIT pages, sorted.
+    """
+    def __init__(self):
+        self.urls = 0
+        self.written = []
+        self.unchanged = 0
+        self.removed = []
+
+def write_sitemaps(output_dir: str, manifest: Manifest, base_url: str, old_generated: Dict[str, str], limit: int = SITEMAP_LIMIT, feed_size: int = FEED_SIZE, force: bool = False) -> Tuple[Dict[str, str], SitemapReport]:
+    """
+    Writes sitemaps listing every page and an Atom feed of the `feed_size` most recently
+    updated pages, from the titles, summaries and update times in the manifest, so no
+    page is read again.
+
+    A site of more than `limit` pages is split into numbered sitemaps by a hash of each
+    source path, using the fewest power-of-two buckets that keep every sitemap within
+    `limit`, so adding or removing a page only changes the sitemap it hashes to until
+    the site outgrows the bucket count. Pages are listed in source path order within a
+    sitemap. The manifest fields each file is made from are hashed before anything is
+    formatted, and a file whose digest matches old_generated is left alone, so a build
+    that changed a few pages only rewrites the sitemaps holding them and, when one of
+    them is among the newest, the feed. With `force` every file is rewritten. Files are
+    written entry by entry rather than built in memory.
+
+    Args:
+        output_dir (str): Directory the site is written to.
+        manifest (Manifest): Pages of the site.
+        base_url (str): URL of the site root, which page paths are appended to.
+        old_generated (Dict[str, str]): Digests of the files written by the previous build.
+        limit (int): Most URLs in one sitemap.
+        feed_size (int): Number of pages in the feed.
+        force (bool): Rewrite every file, even those whose digest matches.
+
+    Returns:
+        Tuple[Dict[str, str], SitemapReport]: The digest of every file, and what was done.
+    """
+    report = SitemapReport()
+    generated = {}
+    pages = sorted(manifest.pages)
+    report.urls = len(pages)
+
+    def update(name: str, fields: Iterable[str], lines: Callable[[], Iterator[str]]) -> None:
+        digest = hashlib.blake2b(base_url.encode("utf-8"))
+        for field in fields:
+            digest.update(field.encode("utf-8"))
+        generated[name] = digest.hexdigest()
+        path = os.path.join(output_dir, name)
+        if not force and old_generated.get(name) == generated[name] and os.path.exists(path):
+            report.unchanged += 1
+            return
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines())
+        os.replace(tmp_path, path)
+        report.written.append(name)
+
+    if len(pages) <= limit:
+        update(SITEMAP_NAME, _sitemap_fields(manifest, pages), lambda: _sitemap_lines(manifest, base_url, pages))
+    else:
+        sitemaps = []
+        for index, group in _sitemap_groups(pages, limit):
+            name = f"sitemap-{index + 1}.xml"
+            update(name, _sitemap_fields(manifest, group), lambda group=group: _sitemap_lines(manifest, base_url, group))
+            sitemaps.append((name, max(manifest.pages[page].updated for page in group)))
+        update(SITEMAP_NAME, (f"{name}\t{updated}\n" for name, updated in sitemaps), lambda: _sitemap_index_lines(base_url, sitemaps))
+    if feed_size:
+        # Keeps only feed_size entries in memory however many pages there are.
+        newest = heapq.nlargest(feed_size, manifest.pages.items(), key=lambda item: (item[1].updated, item[0]))
+        home = manifest.pages.get("index.md")
+        fields = [home.title if home is not None else ""]
+        fields.extend(f"\n{entry.output}\t{entry.updated}\t{entry.title}\t{entry.summary}" for _, entry in newest)
+        update(FEED_NAME, fields, lambda: _feed_lines(manifest, base_url, newest))
+
+    for name in sorted(old_generated):
+        if name not in generated:
+            remove_output(output_dir, name)
+            report.removed.append(name)
+    report.written.sort()
+    return generated, report
+
+def remove_sitemaps(output_dir: str, old_generated: Dict[str, str]) -> List[str]:
+    """
+    Deletes the sitemaps and feed written by a previous build, returning their paths.
+    """
+    for name in old_generated:
+        remove_output(output_dir, name)
+    return sorted(old_generated)
+
+def _sitemap_groups(pages: List[str], limit: int) -> List[Tuple[int, List[str]]]:
+    # Sorted pages stay sorted within each bucket; empty buckets get no sitemap.
+    count = 2
+    while True:
+        buckets: Dict[int, List[str]] = {}
+        for page in pages:
+            buckets.setdefault(shard_of(page, count), []).append(page)
+        if max(len(group) for group in buckets.values()) <= limit:
+            return sorted(buckets.items())
+        count *= 2
+
+def _sitemap_fields(manifest: Manifest, pages: List[str]) -> Iterator[str]:
+    for page in pages:
+        entry = manifest.pages[page]
+        yield f"{entry.output}\t{entry.updated}\n"
+
+def _sitemap_lines(manifest: Manifest, base_url: str, pages: List[str]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    for page in pages:
+        entry = manifest.pages[page]
+        yield f"<url><loc>{escape_text(page_url(base_url, entry.output))}</loc><lastmod>{format_time(entry.updated)}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+def _sitemap_index_lines(base_url: str, sitemaps: List[Tuple[str, int]]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+    for name, updated in sitemaps:
+        yield f"<sitemap><loc>{escape_text(page_url(base_url, name))}</loc><lastmod>{format_time(updated)}</lastmod></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+def _feed_lines(manifest: Manifest, base_url: str, newest: List[Tuple[str, PageEntry]]) -> Iterator[str]:
+    # The feed is named after the home page, when the site has one.
+    home = manifest.pages.get("index.md")
+    title = home.title if home is not None else base_url
+    root = page_url(base_url, "index.html")
+    updated = format_time(newest[0][1].updated if newest else 0)
+    yield (f'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="{ATOM_NAMESPACE}">\n'
+           f'<title>{escape_text(title)}</title>\n<author><name>{escape_text(title)}</name></author>\n<id>{escape_text(root)}</id>\n'
+           f'<link href="{escape_attribute(root)}"/>\n<link rel="self" href="{escape_attribute(page_url(base_url, FEED_NAME))}"/>\n'
+           f'<updated>{updated}</updated>\n')
+    for _, entry in newest:
+        url = page_url(base_url, entry.output)
+        yield (f'<entry><title>{escape_text(entry.title)}</title><id>{escape_text(url)}</id><link href="{escape_attribute(url)}"/>'
+               f'<updated>{format_time(entry.updated)}</updated><summary>{escape_text(entry.summary)}</summary></entry>\n')
+    yield "</feed>\n"
@@ -0,0 +1,179 @@
+from typing import AbstractSet, Callable, Dict, Iterator, Optional, Tuple
+import errno
+import os
+import shutil
+
+from manifest import StaticEntry, hash_file
+
+# Errors meaning the fast copy paths are not supported between these two files,
+# e.g. across filesystems or on filesystems without copy_file_range.
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}
+
+class SyncReport:
+    """
+    Summary of what a static sync did.
+
+    Attributes:
+    -----------
+    copied : List[str]
+        Paths copied or linked into the output directory, sorted.
+    unchanged : int
+        Number of files skipped because they match the manifest.
+    removed : List[str]
+        Output paths deleted because their source no longer exists.
+    """
+    def __init__(self):
+        self.copied = []
+        self.unchanged = 0
+        self.removed = []
+
+def find_static_files(static_dir: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yields every file under static_dir as its path relative to static_dir and its stat.
+    """
+    stack = [""]
+    while stack:
+        relative = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(static_dir, relative))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                path = os.path.join(relative, entry.name)
+                if entry.is_dir():
+                    stack.append(path)
+                elif entry.is_file():
+                    yield path, entry.stat()
+
+def remove_output(output_dir: str, output: str) -> None:
+    """
+    Deletes a file from the output directory along with any directories it leaves empty.
+    """
+    path = os.path.join(output_dir, output)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    parent = os.path.dirname(path)
+    while os.path.abspath(parent) != os.path.abspath(output_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+def copy_file(source: str, destination: str, link: bool = False) -> None:
+    """
+    Replaces destination with a copy of source, keeping the source's mtime.
+
+    With `link`, a hard link is made where the filesystem allows. Otherwise the data is
+    copied in the kernel with os.copy_file_range, which can share blocks on filesystems
+    such as btrfs and XFS, falling back to os.sendfile and then to a plain read/write copy.
+    The copy is written next to destination and renamed over it, so readers never see a
+    partial file.
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    tmp_path = destination + ".tmp"
+    if link:
+        try:
+            os.link(source, tmp_path)
+            os.replace(tmp_path, destination)
+            return
+        except FileExistsError:
+            os.remove(tmp_path)
+            return copy_file(source, destination, link)
+        except OSError:
+            pass
+    with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+        _copy_data(src, dst, os.fstat(src.fileno()).st_size)
+    stat = os.stat(source)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, destination)
+
+def _copy_data(src, dst, size: int) -> None:
+    if hasattr(os, "copy_file_range"):
+        try:
+            copied = 0
+            while copied < size:
+                sent = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED or copied:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            copied = 0
+            while copied < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED or copied:
+                raise
+    shutil.copyfileobj(src, dst)
+
+def sync_static(static_dir: str, output_dir: str, old_entries: Dict[str, StaticEntry], exclude: AbstractSet[str] = frozenset(), checksum: bool = False, link: bool = False, include: Optional[Callable[[str], bool]] = None, force: bool = False) -> Tuple[Dict[str, StaticEntry], SyncReport]:
+    """
+    Mirrors every file under static_dir into output_dir, copying only what changed.
+
+    A file is skipped when its size and mtime match its manifest entry and the copy in
+    output_dir still exists with the same size. With `checksum`, a file whose stat changed
+    but whose content hash did not is not copied either. With `force`, every file is
+    copied. Files synced by a previous build whose source is gone are removed from
+    output_dir.
+
+    Args:
+        static_dir (str): Directory mirrored into output_dir; a missing directory counts as empty.
+        output_dir (str): Directory the files are copied to.
+        old_entries (Dict[str, StaticEntry]): Static entries of the previous build's manifest.
+        exclude (AbstractSet[str]): Output paths owned by pages, which are never overwritten.
+        checksum (bool): Compare content hashes of files whose size or mtime changed.
+        link (bool): Hard link files into output_dir instead of copying where possible.
+        include (Optional[Callable[[str], bool]]): Selects the paths to sync, e.g. those of one
+            shard; files it rejects are treated as if they were not in static_dir.
+        force (bool): Copy every file, even those that look unchanged.
+
+    Returns:
+        Tuple[Dict[str, StaticEntry], SyncReport]: The new static entries and what was done.
+    """
+    entries = {}
+    report = SyncReport()
+    for path, stat in sorted(find_static_files(static_dir)):
+        if path in exclude or (include is not None and not include(path)):
+            continue
+        source = os.path.join(static_dir, path)
+        entry = old_entries.get(path)
+        source_hash = None
+        if entry is not None and not force and _output_matches(output_dir, path, entry):
+            if entry.matches_stat(stat):
+                entries[path] = entry
+                report.unchanged += 1
+                continue
+            if checksum and entry.hash is not None:
+                source_hash = hash_file(source)
+                if source_hash == entry.hash:
+                    entries[path] = StaticEntry(stat.st_size, stat.st_mtime_ns, source_hash)
+                    report.unchanged += 1
+                    continue
+        copy_file(source, os.path.join(output_dir, path), link)
+        if checksum and source_hash is None:
+            source_hash = hash_file(source)
+        entries[path] = StaticEntry(stat.st_size, stat.st_mtime_ns, source_hash)
+        report.copied.append(path)
+    for path in sorted(old_entries):
+        if path not in entries and path not in exclude:
+            remove_output(output_dir, path)
+            report.removed.append(path)
+    return entries, report
+
+def _output_matches(output_dir: str, path: str, entry: StaticEntry) -> bool:
+    try:
+        return os.stat(os.path.join(output_dir, path)).st_size == entry.size
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,159 @@
+from typing import Dict, List, Mapping, Optional, TextIO, Tuple
+import hashlib
+import os
+import re
+
+# "{{ Name }}" marks a slot filled per page; '{% include "file.html" %}' pulls in a
+# partial, resolved relative to the file containing the include.
+TAG_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}|\{%\s*include\s+"([^"]+)"\s*%\}')
+
+class Template:
+    """
+    A page template compiled into literal text and the slots between it.
+
+    Rendering copies a prepared list of the literals, drops each slot's value into its
+    position and joins once, so the template text is never rescanned per page.
+
+    Attributes:
+    -----------
+    literals : Tuple[str, ...]
+        Text around the slots, one more than there are slots; partials are already inlined.
+    slots : Tuple[str, ...]
+        Names of the slots in the order they appear.
+    files : Dict[str, Tuple[int, int]]
+        Size and mtime of the template and every partial it includes, keyed by absolute path.
+    digest : str
+        Hash of the contents of all those files, which changes whenever any of them does.
+    """
+    __slots__ = ("literals", "slots", "files", "digest", "_parts", "_positions")
+
+    def __init__(self, literals: Tuple[str, ...], slots: Tuple[str, ...], files: Optional[Dict[str, Tuple[int, int]]] = None, digest: str = ""):
+        if len(literals) != len(slots) + 1:
+            raise ValueError("A template needs one more literal than slots")
+        self.literals = literals
+        self.slots = slots
+        self.files = files if files is not None else {}
+        self.digest = digest
+        parts = [literals[0]]
+        for literal in literals[1:]:
+            parts.append(None)
+            parts.append(literal)
+        self._parts = tuple(parts)
+        self._positions = tuple((2 * index + 1, slot) for index, slot in enumerate(slots))
+
+    @classmethod
+    def compile(cls, text: str) -> 'Template':
+        """
+        Compiles template text without includes.
+
+        Example:
+        >>> Template.compile("<title>{{ Title }}</title>").render({"Title": "Home"})
+        '<title>Home</title>'
+        """
+        literals, slots = [], []
+        _compile(text, None, literals, slots, {}, [], hashlib.blake2b())
+        return cls(tuple(literals), tuple(slots))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Template':
+        """
+        Reads and compiles a template file along with the partials it includes.
+
+        Raises:
+        ValueError: If a partial includes itself, directly or indirectly.
+        OSError: If the template or a partial cannot be read.
+        """
+        literals, slots, files = [], [], {}
+        digest = hashlib.blake2b()
+        _compile_file(os.path.abspath(path), literals, slots, files, [], digest)
+        return cls(tuple(literals), tuple(slots), files, digest.hexdigest())
+
+    def is_current(self) -> bool:
+        """
+        Returns whether none of the files the template was compiled from changed since.
+        """
+        for path, (size, mtime_ns) in self.files.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def _pieces(self, values: Mapping[str, str]) -> List[str]:
+        pieces = list(self._parts)
+        try:
+            for index, name in self._positions:
+                pieces[index] = values[name]
+        except KeyError as e:
+            raise ValueError(f"No value for template slot {e.args[0]}") from None
+        return pieces
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """
+        Fills every slot from values and returns the page.
+
+        Raises:
+        ValueError: If values has no entry for one of the slots.
+        """
+        return "".join(self._pieces(values))
+
+    def write_to(self, stream: TextIO, values: Mapping[str, str]) -> int:
+        """
+        Writes the filled template piece by piece, returning the number of characters written.
+        """
+        written = 0
+        for piece in self._pieces(values):
+            written += stream.write(piece)
+        return written
+
+def _compile(text: str, directory: Optional[str], literals: List[str], slots: List[str], files: Dict[str, Tuple[int, int]], stack: List[str], digest) -> None:
+    # An including file leaves the literal it was building on the end of literals,
+    # so text on both sides of an include ends up in one literal.
+    pending = literals.pop() if len(literals) > len(slots) else ""
+    start = 0
+    for match in TAG_PATTERN.finditer(text):
+        pending += text[start:match.start()]
+        start = match.end()
+        if match.group(1) is not None:
+            literals.append(pending)
+            slots.append(match.group(1))
+            pending = ""
+        elif directory is None:
+            raise ValueError("Includes need a template loaded from a file")
+        else:
+            literals.append(pending)
+            _compile_file(os.path.join(directory, match.group(2)), literals, slots, files, stack, digest)
+            pending = literals.pop()
+    literals.append(pending + text[start:])
+
+def _compile_file(path: str, literals: List[str], slots: List[str], files: Dict[str, Tuple[int, int]], stack: List[str], digest) -> None:
+    path = os.path.abspath(path)
+    if path in stack:
+        raise ValueError(f"Template {path} includes itself")
+    with open(path, encoding="utf-8") as f:
+        stat = os.fstat(f.fileno())
+        text = f.read()
+    files[path] = (stat.st_size, stat.st_mtime_ns)
+    data = text.encode("utf-8")
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+    stack.append(path)
+    _compile(text, os.path.dirname(path), literals, slots, files, stack, digest)
+    stack.pop()
+
+# Compiled templates by absolute path, recompiled by load_template once stale.
+_templates: Dict[str, Template] = {}
+
+def load_template(path: str) -> Template:
+    """
+    Returns the compiled template for path, compiling it again only when the file or
+    one of its partials changed since the last call.
+    """
+    path = os.path.abspath(path)
+    template = _templates.get(path)
+    if template is None or not template.is_current():
+        template = Template.from_file(path)
+        _templates[path] = template
+    return template
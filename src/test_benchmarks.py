@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from benchmarks.corpus import CORPUS_KINDS, generate_corpus, write_corpus
+from benchmarks.runner import compare_results, run_benchmarks, select_scenarios
+from blocks import markdown_to_html_node
+
+def results(**timings):
+    return {"version": 1, "results": {name: {"best": best} for name, best in timings.items()}}
+
+class TestCorpus(unittest.TestCase):
+
+    def test_seeded(self):
+        for kind in CORPUS_KINDS:
+            self.assertEqual(generate_corpus(kind, 3, seed=7), generate_corpus(kind, 3, seed=7))
+        self.assertNotEqual(generate_corpus("short", 3, seed=1), generate_corpus("short", 3, seed=2))
+
+    def test_pages_convert(self):
+        for kind in ("short", "link_dense", "delimiter_heavy"):
+            for page in generate_corpus(kind, 5):
+                markdown_to_html_node(page).to_html()
+
+    def test_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            generate_corpus("tiny", 1)
+
+    def test_write_corpus(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_corpus(tmp, "short", 3)
+            self.assertEqual(len(paths), 3)
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+
+class TestRunner(unittest.TestCase):
+
+    def test_select_scenarios(self):
+        self.assertEqual(select_scenarios(["split_nodes_*"]), ["split_nodes_delimiter", "split_nodes_image", "split_nodes_link"])
+        self.assertIn("parent_to_html.wide", select_scenarios())
+
+    def test_run_benchmarks(self):
+        data = run_benchmarks(["split_nodes_delimiter"], repeat=1)
+        self.assertEqual(set(data["results"]), {"split_nodes_delimiter"})
+        self.assertGreater(data["results"]["split_nodes_delimiter"]["best"], 0)
+
+    def test_compare_results(self):
+        comparisons = compare_results(results(a=1.2, b=1.05, c=1.0), results(a=1.0, b=1.0), threshold=0.1)
+        self.assertEqual([entry["name"] for entry in comparisons], ["a", "b"])
+        self.assertTrue(comparisons[0]["regression"])
+        self.assertFalse(comparisons[1]["regression"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import unittest
+from blocks import BlockType, block_to_block_type, markdown_to_blocks, markdown_to_html_node, iter_block_nodes
+
+class TestMarkdownToBlocks(unittest.TestCase):
+
+    def test_blank_lines_separate_blocks(self):
+        markdown = "First paragraph\nstill first\n\n\n\nSecond paragraph\n"
+        self.assertEqual(list(markdown_to_blocks(io.StringIO(markdown))), [["First paragraph", "still first"], ["Second paragraph"]])
+
+    def test_heading_is_its_own_block(self):
+        markdown = "# Title\nSome text\n## Sub"
+        self.assertEqual(list(markdown_to_blocks(markdown.splitlines())), [["# Title"], ["Some text"], ["## Sub"]])
+
+    def test_code_fence_keeps_blank_lines(self):
+        markdown = "```\nline one\n\nline three\n```\nafter"
+        self.assertEqual(list(markdown_to_blocks(markdown.splitlines())), [["```", "line one", "", "line three", "```"], ["after"]])
+
+    def test_lazy(self):
+        def lines():
+            yield "first\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        blocks = markdown_to_blocks(lines())
+        self.assertEqual(next(blocks), ["first"])
+
+class TestBlockToBlockType(unittest.TestCase):
+
+    def test_block_types(self):
+        self.assertEqual(block_to_block_type(["### Heading"]), BlockType.HEADING)
+        self.assertEqual(block_to_block_type(["```", "code", "```"]), BlockType.CODE)
+        self.assertEqual(block_to_block_type(["> quote", "> more"]), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type(["* one", "- two"]), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type(["1. one", "2. two"]), BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type(["1. one", "two"]), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type(["####### too deep"]), BlockType.PARAGRAPH)
+
+class TestMarkdownToHtmlNode(unittest.TestCase):
+
+    def test_paragraphs(self):
+        markdown = "This is **bolded** paragraph\ntext in a p\ntag here\n\nThis is another paragraph with *italic* text and `code` here\n"
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p>"
+            "<p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_empty_document(self):
+        for markdown in ("", "\n  \n\n"):
+            self.assertEqual(markdown_to_html_node(markdown).to_html(), "<div></div>")
+
+    def test_headings(self):
+        markdown = "# One\n\n###### Six [link](url)"
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), '<div><h1>One</h1><h6>Six <a href="url">link</a></h6></div>')
+
+    def test_code_block(self):
+        markdown = "```python\nThis is text that _should_ remain\nthe **same** even with inline stuff\n```"
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            '<div><pre><code class="language-python">This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>',
+        )
+
+    def test_quote(self):
+        markdown = "> This is a\n> *quote*"
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), "<div><blockquote>This is a <i>quote</i></blockquote></div>")
+
+    def test_lists(self):
+        markdown = "- one\n- **two**\n\n1. first\n2. second"
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><ul><li>one</li><li><b>two</b></li></ul><ol><li>first</li><li>second</li></ol></div>",
+        )
+
+    def test_file_object(self):
+        stream = io.StringIO("# Title\n\n![image](a.png)\n")
+        self.assertEqual(markdown_to_html_node(stream).to_html(), '<div><h1>Title</h1><p><img src="a.png" alt="image"></img></p></div>')
+
+    def test_iter_block_nodes(self):
+        nodes = iter_block_nodes("para one\n\npara two")
+        self.assertEqual(next(nodes).to_html(), "<p>para one</p>")
+        self.assertEqual(next(nodes).to_html(), "<p>para two</p>")
+
+if __name__ == "__main__":
+    unittest.main()
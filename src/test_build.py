@@ -0,0 +1,297 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from build import CHUNKS_IN_FLIGHT, BuildOptions, bounded_map, build_site, find_pages, output_path_for
+from profiling import Profile
+from search import CHUNK_DIR, INDEX_NAME, SEARCH_CACHE_DIR, SEARCH_DIR
+from sitemap import FEED_NAME, SITEMAP_NAME
+from treecache import TreeCache
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestBuildSite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write(TEMPLATE)
+        self.write_page("index.md", "# Home\n\nWelcome *home*.")
+        self.write_page("blog/first.md", "# First post\n\n- one\n- two")
+        self.write_page("blog/untitled.md", "No heading here.")
+        self.write_page("notes.txt", "not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, name, text):
+        path = os.path.join(self.content, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read_output(self, name):
+        with open(os.path.join(self.output, name)) as f:
+            return f.read()
+
+    def test_find_pages(self):
+        self.assertEqual(find_pages(self.content), ["blog/first.md", "blog/untitled.md", "index.md"])
+
+    def test_output_path_for(self):
+        self.assertEqual(output_path_for("blog/post.md"), "blog/post.html")
+
+    def test_build_single_job(self):
+        results = build_site(self.content, self.output, self.template, BuildOptions(jobs=1)).rendered
+        self.assertEqual([result.output for result in results], ["blog/first.html", "blog/untitled.html", "index.html"])
+        self.assertEqual(self.read_output("index.html"), "<html><title>Home</title><body><div><h1>Home</h1><p>Welcome <i>home</i>.</p></div></body></html>")
+        self.assertEqual(results[1].title, "untitled")
+        self.assertFalse(os.path.exists(os.path.join(self.output, "notes.html")))
+
+    def test_empty_page(self):
+        self.write_page("empty.md", "\n")
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(self.read_output("empty.html"), "<html><title>empty</title><body><div></div></body></html>")
+
+    def test_build_process_pool_matches_single_job(self):
+        single = build_site(self.content, self.output, self.template, BuildOptions(jobs=1)).rendered
+        expected = {name: self.read_output(name) for name in ["blog/first.html", "blog/untitled.html", "index.html"]}
+        pooled = build_site(self.content, self.output, self.template, BuildOptions(jobs=2, force=True)).rendered
+        self.assertEqual(pooled, single)
+        for name, html in expected.items():
+            self.assertEqual(self.read_output(name), html)
+
+    def test_second_build_skips_unchanged_pages(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(report.rendered, [])
+        self.assertEqual(report.unchanged, 3)
+
+    def test_changed_page_is_rebuilt(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.write_page("index.md", "# Home\n\nUpdated.")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual([result.output for result in report.rendered], ["index.html"])
+        self.assertIn("<p>Updated.</p>", self.read_output("index.html"))
+
+    def test_touched_but_identical_page_is_skipped(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        path = os.path.join(self.content, "index.md")
+        os.utime(path, ns=(1, 1))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(report.rendered, [])
+
+    def test_template_change_rebuilds_everything(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        with open(self.template, "w") as f:
+            f.write("<main>{{ Content }}</main>")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(len(report.rendered), 3)
+        self.assertTrue(self.read_output("index.html").startswith("<main>"))
+
+    def test_partial_change_rebuilds_everything(self):
+        with open(self.template, "w") as f:
+            f.write('{% include "partials/head.html" %}{{ Content }}')
+        head = os.path.join(self.tmp.name, "partials", "head.html")
+        os.makedirs(os.path.dirname(head))
+        with open(head, "w") as f:
+            f.write("<h1>{{ Title }}</h1>")
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertTrue(self.read_output("index.html").startswith("<h1>Home</h1>"))
+        with open(head, "w") as f:
+            f.write("<header>{{ Title }}</header>")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(len(report.rendered), 3)
+        self.assertTrue(self.read_output("index.html").startswith("<header>Home</header>"))
+
+    def test_missing_output_is_rebuilt(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        os.remove(os.path.join(self.output, "index.html"))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual([result.output for result in report.rendered], ["index.html"])
+
+    def test_deleted_source_is_removed(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        os.remove(os.path.join(self.content, "blog/first.md"))
+        os.remove(os.path.join(self.content, "blog/untitled.md"))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(report.removed, ["blog/first.html", "blog/untitled.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+
+    def test_inline_cache_counters(self):
+        self.write_page("blog/second.md", "# Home\n\nWelcome *home*.")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, inline_cache=16))
+        self.assertEqual(report.inline_cache.hits, 2)
+        self.assertIn("<p>Welcome <i>home</i>.</p>", self.read_output("blog/second.html"))
+
+    def test_inline_cache_counters_merge_workers(self):
+        for index in range(8):
+            self.write_page(f"blog/repeat-{index}.md", f"# Page {index}\n\nThe same footer.")
+        single = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, force=True, inline_cache=16)).inline_cache
+        pooled = build_site(self.content, self.output, self.template, BuildOptions(jobs=2, force=True, inline_cache=16)).inline_cache
+        # Each worker misses the shared paragraph once, so only the split differs.
+        self.assertEqual(pooled.hits + pooled.misses, single.hits + single.misses)
+        self.assertGreater(pooled.hits, 0)
+        self.assertIn(pooled.maxsize, (16, 32))
+
+    def test_profile_merges_workers(self):
+        single = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, profile=Profile())).profile
+        pooled = build_site(self.content, self.output, self.template, BuildOptions(jobs=2, force=True, profile=Profile())).profile
+        for profile in (single, pooled):
+            self.assertEqual(profile.spans["page"][0], 3)
+            self.assertEqual(profile.counters["blocks"], 5)
+            self.assertGreater(profile.counters["bytes_written"], 0)
+        self.assertEqual(pooled.counters, single.counters)
+
+    def test_writers_match_inline_writes(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1, writers=0))
+        inline = self.read_output("blog/first.html")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, force=True, writers=4, sync="build"))
+        self.assertEqual(len(report.rendered), 3)
+        self.assertEqual(self.read_output("blog/first.html"), inline)
+
+    def test_static_files(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.makedirs(static)
+        for name in ("styles.css", "index.html"):
+            with open(os.path.join(static, name), "w") as f:
+                f.write(name)
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, static_dir=static))
+        self.assertEqual(report.static.copied, ["styles.css"])
+        self.assertIn("<h1>Home</h1>", self.read_output("index.html"))
+        self.assertEqual(self.read_output("styles.css"), "styles.css")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertIsNone(report.static)
+        self.assertIn("styles.css", report.manifest.static)
+        os.remove(os.path.join(static, "styles.css"))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, static_dir=static))
+        self.assertEqual(report.static.removed, ["styles.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "styles.css")))
+
+    def test_gzip(self):
+        self.write_page("long.md", "# Long\n\n" + "Some text. " * 200)
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, gzip=True, gzip_min_size=500))
+        self.assertEqual(report.compressed.compressed, ["long.html"])
+        self.assertIn("long.html", report.manifest.compressed)
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, gzip=True, gzip_min_size=500))
+        self.assertEqual(report.compressed.unchanged, 1)
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertEqual(report.compressed.removed, ["long.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "long.html.gz")))
+
+    def test_tree_cache_skips_parsing_after_template_change(self):
+        cache = TreeCache(os.path.join(self.tmp.name, "cache"))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, tree_cache=cache, profile=Profile()))
+        self.assertEqual(report.profile.counters["tree_cache_misses"], 3)
+        before = {name: self.read_output(name) for name in ("index.html", "blog/untitled.html")}
+        with open(self.template, "w") as f:
+            f.write("<main>" + TEMPLATE + "</main>")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=2, tree_cache=cache, profile=Profile()))
+        self.assertEqual(report.profile.counters["tree_cache_hits"], 3)
+        self.assertNotIn("parse", report.profile.spans)
+        for name, html in before.items():
+            self.assertEqual(self.read_output(name), "<main>" + html + "</main>")
+
+    def test_links_are_checked_across_incremental_builds(self):
+        self.write_page("index.md", "# Home\n\nSee [the first post](blog/first.html) and [nothing](blog/none.html).")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, links=True))
+        self.assertEqual(report.links.broken, [("index.md", "blog/none.html")])
+        self.write_page("blog/untitled.md", "Back [home](../index.html).")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, links=True))
+        self.assertEqual([result.output for result in report.rendered], ["blog/untitled.html"])
+        self.assertEqual(report.links.broken, [("index.md", "blog/none.html")])
+        self.assertEqual(report.links.backlinks, {"blog/first.html": ["index.md"], "index.html": ["blog/untitled.md"]})
+        self.assertRaises(ValueError, build_site, self.content, self.output, self.template, BuildOptions(links=True, shard=(0, 2)))
+
+    def test_search_index_follows_incremental_builds(self):
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, search=True, cache_dir=self.cache_dir))
+        self.assertEqual(report.search.pages, 3)
+        # The terms kept between builds stay out of the deployed output.
+        self.assertEqual(sorted(os.listdir(self.output)), [".manifest.json", SEARCH_DIR, "blog", "index.html"])
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, SEARCH_CACHE_DIR))), 1)
+        with open(os.path.join(self.output, SEARCH_DIR, INDEX_NAME)) as f:
+            self.assertEqual(json.load(f)["pages"], [["blog/first.html", "First post"], ["blog/untitled.html", "untitled"], ["index.html", "Home"]])
+        self.write_page("blog/untitled.md", "Home sweet home.")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=2, search=True, cache_dir=self.cache_dir))
+        self.assertEqual([result.output for result in report.rendered], ["blog/untitled.html"])
+        with open(os.path.join(self.output, SEARCH_DIR, CHUNK_DIR, "ho.json")) as f:
+            self.assertEqual(json.load(f), {"home": [1, 2, 0, 2, 1, 2, 0, 2]})
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, search=True, cache_dir=self.cache_dir))
+        self.assertIsNone(report.search)
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1, cache_dir=self.cache_dir))
+        self.assertFalse(os.path.exists(os.path.join(self.output, SEARCH_DIR)))
+        self.assertEqual(os.listdir(os.path.join(self.cache_dir, SEARCH_CACHE_DIR)), [])
+        self.assertRaises(ValueError, build_site, self.content, self.output, self.template, BuildOptions(search=True, shard=(0, 2)))
+
+    def test_sitemaps_keep_update_times_across_template_changes(self):
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, base_url="https://example.com"))
+        self.assertEqual(report.sitemaps.written, [FEED_NAME, SITEMAP_NAME])
+        self.assertEqual(report.manifest.pages["index.md"].summary, "Welcome home.")
+        updated = {page: entry.updated for page, entry in report.manifest.pages.items()}
+        with open(self.template, "w") as f:
+            f.write("<main>" + TEMPLATE + "</main>")
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, base_url="https://example.com"))
+        self.assertEqual(len(report.rendered), 3)
+        self.assertEqual({page: entry.updated for page, entry in report.manifest.pages.items()}, updated)
+        self.assertEqual(report.sitemaps.written, [])
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        self.assertFalse(os.path.exists(os.path.join(self.output, SITEMAP_NAME)))
+
+    def test_force_rebuilds_everything(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, force=True))
+        self.assertEqual(len(report.rendered), 3)
+
+    def test_force_still_removes_deleted_outputs(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.makedirs(static)
+        for name in ("styles.css", "old.css"):
+            with open(os.path.join(static, name), "w") as f:
+                f.write(name * 100)
+        self.write_page("long.md", "# Long\n\n" + "Some text. " * 200)
+        options = BuildOptions(jobs=1, static_dir=static, gzip=True, gzip_min_size=500)
+        build_site(self.content, self.output, self.template, options)
+        self.assertTrue(os.path.exists(os.path.join(self.output, "long.html.gz")))
+        os.remove(os.path.join(self.content, "long.md"))
+        os.remove(os.path.join(static, "old.css"))
+        report = build_site(self.content, self.output, self.template, BuildOptions(jobs=1, static_dir=static, gzip=True, gzip_min_size=500, force=True))
+        self.assertEqual(len(report.rendered), 3)
+        self.assertEqual(report.removed, ["long.html"])
+        self.assertEqual(report.static.copied, ["styles.css"])
+        self.assertEqual(report.static.removed, ["old.css"])
+        self.assertEqual(report.compressed.removed, ["long.html", "old.css"])
+        for name in ("long.html", "long.html.gz", "old.css", "old.css.gz"):
+            self.assertFalse(os.path.exists(os.path.join(self.output, name)), name)
+
+
+class TestBoundedMap(unittest.TestCase):
+
+    def test_limits_results_in_flight(self):
+        jobs = 2
+        window = jobs * CHUNKS_IN_FLIGHT
+        started = []
+        lock = threading.Lock()
+
+        def render(item):
+            with lock:
+                started.append(item)
+            return item * 2
+
+        results = []
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for result in bounded_map(executor, render, range(20), window):
+                # A slow consumer, like a writer falling behind, holds up submission.
+                time.sleep(0.002)
+                results.append(result)
+                with lock:
+                    self.assertLessEqual(len(started) - len(results), window)
+        self.assertEqual(results, [item * 2 for item in range(20)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import gzip
+import os
+import tempfile
+import unittest
+from compress import compress_file, compress_outputs
+
+class TestCompressOutputs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = self.tmp.name
+        self.write("index.html", "<p>home</p>" * 200)
+        self.write("blog/post.html", "<p>post</p>" * 200)
+        self.write("styles.css", "body { margin: 0 }\n" * 100)
+        self.write("small.html", "<p>tiny</p>")
+        self.write("logo.png", "png" * 1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.output, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read_gzip(self, name):
+        with gzip.open(os.path.join(self.output, name + ".gz"), "rt") as f:
+            return f.read()
+
+    def outputs(self):
+        return ["index.html", "blog/post.html", "styles.css", "small.html", "logo.png"]
+
+    def test_compresses_large_html_and_css(self):
+        entries, report = compress_outputs(self.output, self.outputs(), {}, jobs=2)
+        self.assertEqual(report.compressed, ["blog/post.html", "index.html", "styles.css"])
+        self.assertEqual(sorted(entries), report.compressed)
+        self.assertEqual(self.read_gzip("blog/post.html"), "<p>post</p>" * 200)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "small.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.output, "logo.png.gz")))
+        self.assertGreater(report.bytes_saved, 0)
+        self.assertEqual(report.original_bytes - report.compressed_bytes, report.bytes_saved)
+
+    def test_unchanged_files_are_skipped(self):
+        entries, _ = compress_outputs(self.output, self.outputs(), {})
+        entries, report = compress_outputs(self.output, self.outputs(), entries)
+        self.assertEqual(report.compressed, [])
+        self.assertEqual(report.unchanged, 3)
+
+    def test_rewritten_but_identical_file_is_skipped(self):
+        entries, _ = compress_outputs(self.output, self.outputs(), {})
+        path = self.write("index.html", "<p>home</p>" * 200)
+        os.utime(path, ns=(1, 1))
+        entries, report = compress_outputs(self.output, self.outputs(), entries)
+        self.assertEqual(report.compressed, [])
+        self.assertEqual(entries["index.html"].mtime_ns, 1)
+
+    def test_changed_file_is_recompressed(self):
+        entries, _ = compress_outputs(self.output, self.outputs(), {})
+        self.write("index.html", "<p>changed</p>" * 200)
+        entries, report = compress_outputs(self.output, self.outputs(), entries)
+        self.assertEqual(report.compressed, ["index.html"])
+        self.assertEqual(self.read_gzip("index.html"), "<p>changed</p>" * 200)
+
+    def test_stale_siblings_are_removed(self):
+        entries, _ = compress_outputs(self.output, self.outputs(), {})
+        os.remove(os.path.join(self.output, "blog/post.html"))
+        self.write("styles.css", "body {}")
+        entries, report = compress_outputs(self.output, ["index.html", "styles.css"], entries)
+        self.assertEqual(report.removed, ["blog/post.html", "styles.css"])
+        self.assertEqual(sorted(entries), ["index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.output, "styles.css.gz")))
+
+    def test_output_is_deterministic(self):
+        path = os.path.join(self.output, "index.html")
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            first = f.read()
+        os.utime(path, ns=(1, 1))
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from helpers import text_to_textnodes
+from converters import HTML_CONVERTERS, text_node_to_html_node, text_nodes_to_html_nodes
+from textnode import TextNode, TextType
+from htmlnode import LeafNode
+
+class TestTextNodeToHtmlNode(unittest.TestCase):
+    def test_text_node(self):
+        text_node = TextNode("Hello, World!", TextType.TEXT)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("", "Hello, World!"))
+
+    def test_bold_node(self):
+        text_node = TextNode("Hello, World!", TextType.BOLD)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("b", "Hello, World!"))
+
+    def test_italic_node(self):
+        text_node = TextNode("Hello, World!", TextType.ITALIC)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("i", "Hello, World!"))
+
+    def test_code_node(self):
+        text_node = TextNode("print('Hello, World!')", TextType.CODE)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("code", "print('Hello, World!')"))
+
+    def test_link_node(self):
+        text_node = TextNode("Click here", TextType.LINK, url="https://example.com")
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("a", "Click here", {"href": "https://example.com"}))
+
+    def test_image_node(self):
+        text_node = TextNode("Image description", TextType.IMAGE, url="https://example.com/image.png")
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("img", "", {"src": "https://example.com/image.png", "alt": "Image description"}))
+
+    def test_empty_text_node(self):
+        text_node = TextNode("", TextType.TEXT)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("", ""))
+
+    def test_empty_bold_node(self):
+        text_node = TextNode("", TextType.BOLD)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("b", ""))
+
+    def test_empty_italic_node(self):
+        text_node = TextNode("", TextType.ITALIC)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("i", ""))
+
+    def test_empty_code_node(self):
+        text_node = TextNode("", TextType.CODE)
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("code", ""))
+
+    def test_empty_link_node(self):
+        text_node = TextNode("", TextType.LINK, url="https://example.com")
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("a", "", {"href": "https://example.com"}))
+
+    def test_empty_image_node(self):
+        text_node = TextNode("", TextType.IMAGE, url="https://example.com/image.png")
+        html_node = text_node_to_html_node(text_node)
+        self.assertEqual(html_node, LeafNode("img", "", {"src": "https://example.com/image.png", "alt": ""}))
+
+    def test_link_props_are_shared(self):
+        first = text_node_to_html_node(TextNode("one", TextType.LINK, url="https://example.com"))
+        second = text_node_to_html_node(TextNode("two", TextType.LINK, url="https://example.com"))
+        self.assertIs(first.props, second.props)
+
+
+class TestTextNodesToHtmlNodes(unittest.TestCase):
+    def test_matches_single_conversion(self):
+        text_nodes = text_to_textnodes("Plain **bold** *italic* `code` [link](/a) ![alt](/b.png) & more")
+        html_nodes = text_nodes_to_html_nodes(text_nodes)
+        self.assertEqual(html_nodes, [text_node_to_html_node(text_node) for text_node in text_nodes])
+        self.assertEqual("".join(node.to_html() for node in html_nodes),
+                         'Plain <b>bold</b> <i>italic</i> <code>code</code> <a href="/a">link</a> <img src="/b.png" alt="alt"></img> &amp; more')
+
+    def test_accepts_iterators_and_shares_props(self):
+        html_nodes = text_nodes_to_html_nodes(iter([TextNode("a", TextType.TEXT), TextNode("b", TextType.BOLD)]))
+        self.assertEqual(html_nodes, [LeafNode("", "a"), LeafNode("b", "b")])
+        self.assertIs(html_nodes[0].props, html_nodes[1].props)
+
+    def test_converters_are_looked_up_on_each_call(self):
+        original = HTML_CONVERTERS[TextType.CODE]
+        HTML_CONVERTERS[TextType.CODE] = lambda node: LeafNode("kbd", node.text)
+        try:
+            self.assertEqual(text_node_to_html_node(TextNode("x", TextType.CODE)).to_html(), "<kbd>x</kbd>")
+            self.assertEqual(text_nodes_to_html_nodes([TextNode("y", TextType.CODE)])[0].to_html(), "<kbd>y</kbd>")
+        finally:
+            HTML_CONVERTERS[TextType.CODE] = original
+
+    def test_invalid_text_type(self):
+        # The TextNode constructor rejects unknown types, so set one after construction
+        # to reach the converters' own check.
+        invalid = TextNode("b", TextType.BOLD)
+        object.__setattr__(invalid, "text_type", "bold")
+        with self.assertRaisesRegex(ValueError, "^Invalid text type: bold$"):
+            text_nodes_to_html_nodes([TextNode("a", TextType.TEXT), invalid])
+        with self.assertRaisesRegex(ValueError, "^Invalid text type: bold$"):
+            text_node_to_html_node(invalid)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import unittest
 from textnode import TextNode, TextType
 from helpers import extract_markdown_images, extract_markdown_links, split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from helpers import InlineCacheInfo, enable_inline_cache, disable_inline_cache, inline_cache_info
 
 class TestSplitNodesDelimiter(unittest.TestCase):
 
@@ -381,6 +382,50 @@ class TestTextToTextNodes(unittest.TestCase):
         expected = [TextNode("", TextType.TEXT)]
         self.assertEqual(text_nodes, expected)
 
-        
+
+class TestInlineCache(unittest.TestCase):
+
+    def tearDown(self):
+        disable_inline_cache()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(inline_cache_info())
+
+    def test_hits_and_misses(self):
+        enable_inline_cache(maxsize=8)
+        text = "A **repeated** footer with a [link](https://example.com)"
+        first = text_to_textnodes(text)
+        second = text_to_textnodes(text)
+        self.assertEqual(first, second)
+        info = inline_cache_info()
+        self.assertEqual(info, InlineCacheInfo(hits=1, misses=1, maxsize=8, currsize=1))
+
+    def test_returned_list_is_a_copy(self):
+        enable_inline_cache()
+        nodes = text_to_textnodes("some *text*")
+        nodes.append(TextNode("extra", TextType.TEXT))
+        self.assertEqual(len(text_to_textnodes("some *text*")), 3)
+
+    def test_lru_eviction(self):
+        enable_inline_cache(maxsize=2)
+        text_to_textnodes("one")
+        text_to_textnodes("two")
+        text_to_textnodes("one")
+        text_to_textnodes("three")
+        text_to_textnodes("one")
+        text_to_textnodes("two")
+        info = inline_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 4, 2))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            enable_inline_cache(0)
+
+    def test_disable(self):
+        enable_inline_cache()
+        disable_inline_cache()
+        self.assertIsNone(inline_cache_info())
+        self.assertEqual(text_to_textnodes("plain"), [TextNode("plain", TextType.TEXT)])
+
 if __name__ == '__main__':
     unittest.main()
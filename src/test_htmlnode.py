@@ -1,5 +1,6 @@
+import io
 import unittest
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import FrozenProps, HTMLNode, LeafNode, ParentNode, escape_attribute, escape_text, walk
 
 class TestHTMLNode(unittest.TestCase):
 
@@ -16,7 +17,7 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode()
         self.assertEqual(node.tag, None)
         self.assertEqual(node.value, None)
-        self.assertEqual(node.children, [])
+        self.assertEqual(node.children, ())
         self.assertEqual(node.props, {})
 
     def test_props_to_html_empty(self):
@@ -53,12 +54,32 @@ class TestHTMLNode(unittest.TestCase):
         node2 = HTMLNode("div", "content", [HTMLNode("p")])
         self.assertNotEqual(node1, node2)
 
+    def test_eq_list_and_tuple_children(self):
+        # Test that children compare by their elements whatever sequence holds them
+        self.assertEqual(HTMLNode("p"), HTMLNode("p", children=[]))
+        self.assertEqual(HTMLNode("p", children=(HTMLNode("b", "x"),)), HTMLNode("p", children=[HTMLNode("b", "x")]))
+        self.assertNotEqual(HTMLNode("p"), HTMLNode("p", children=[HTMLNode("b", "x")]))
+
     def test_eq_different_props(self):
         # Test inequality of HTMLNode instances with different properties
         node1 = HTMLNode("div", "content", props={"class": "container"})
         node2 = HTMLNode("div", "content", props={"class": "row"})
         self.assertNotEqual(node1, node2)
 
+    def test_shared_empty_defaults(self):
+        # Test that nodes without children or props share the same read-only defaults
+        node1 = LeafNode("b", "one")
+        node2 = HTMLNode("p")
+        self.assertIs(node1.props, node2.props)
+        self.assertIs(node1.children, node2.children)
+        with self.assertRaises(TypeError):
+            node1.props["class"] = "x"
+
+    def test_slots(self):
+        # Test that nodes carry no per-instance __dict__
+        self.assertFalse(hasattr(LeafNode("b", "text"), "__dict__"))
+        self.assertFalse(hasattr(ParentNode("p", [LeafNode("b", "text")]), "__dict__"))
+
     def test_repr(self):
         # Test string representation of HTMLNode
         node = HTMLNode("div", "content", [], {"class": "container"})
@@ -71,7 +92,7 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode("span", "content", {"class": "text"})
         self.assertEqual(node.tag, "span")
         self.assertEqual(node.value, "content")
-        self.assertEqual(node.children, [])
+        self.assertEqual(node.children, ())
         self.assertEqual(node.props, {"class": "text"})
 
     def test_to_html_with_tag_and_props(self):
@@ -109,6 +130,61 @@ class TestLeafNode(unittest.TestCase):
             "All leaf nodes must have a value."
         )
 
+class TestEscaping(unittest.TestCase):
+
+    def test_escape_text(self):
+        self.assertEqual(escape_text("a < b && c > d"), "a &lt; b &amp;&amp; c &gt; d")
+        self.assertEqual(escape_text('"quoted"'), '"quoted"')
+
+    def test_escape_text_fast_path(self):
+        text = "nothing to escape here"
+        self.assertIs(escape_text(text), text)
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('/search?q="x"&page=1'), "/search?q=&quot;x&quot;&amp;page=1")
+        self.assertEqual(escape_attribute("https://example.com"), "https://example.com")
+
+    def test_leaf_value_is_escaped(self):
+        self.assertEqual(LeafNode("code", "if a < b && c:").to_html(), "<code>if a &lt; b &amp;&amp; c:</code>")
+        self.assertEqual(LeafNode("", "1 < 2").to_html(), "1 &lt; 2")
+
+    def test_props_are_escaped(self):
+        node = LeafNode("img", "", {"src": "a.png", "alt": 'say "hi" <now>'})
+        self.assertEqual(node.to_html(), '<img src="a.png" alt="say &quot;hi&quot; &lt;now&gt;"></img>')
+
+class TestFrozenProps(unittest.TestCase):
+
+    def test_mapping(self):
+        props = FrozenProps((("src", "a.png"), ("alt", "A")))
+        self.assertEqual(props["alt"], "A")
+        self.assertEqual(props.get("title"), None)
+        self.assertIn("src", props)
+        self.assertEqual(list(props), ["src", "alt"])
+        self.assertEqual(props, {"src": "a.png", "alt": "A"})
+        self.assertEqual(dict(props), {"src": "a.png", "alt": "A"})
+        with self.assertRaises(KeyError):
+            props["title"]
+
+    def test_immutable(self):
+        props = FrozenProps((("href", "/"),))
+        with self.assertRaises(TypeError):
+            props["href"] = "/other"
+
+    def test_to_html_is_cached(self):
+        props = FrozenProps((("href", "/a&b"),))
+        html = props.to_html()
+        self.assertEqual(html, ' href="/a&amp;b"')
+        self.assertIs(props.to_html(), html)
+
+    def test_dict_props_are_frozen(self):
+        node = LeafNode("a", "link", {"href": "/"})
+        self.assertIsInstance(node.props, FrozenProps)
+        self.assertEqual(node.to_html(), '<a href="/">link</a>')
+
+    def test_shared_props(self):
+        props = FrozenProps((("href", "/"),))
+        self.assertIs(LeafNode("a", "one", props).props, LeafNode("a", "two", props).props)
+
 class TestParentNode(unittest.TestCase):
 
     def test_init(self):
@@ -239,5 +315,80 @@ class TestParentNode(unittest.TestCase):
             "All parent nodes must have a children list."
         )
 
+class TestStreamingRender(unittest.TestCase):
+
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")]),
+            LeafNode("a", "link", {"href": "https://example.com"}),
+        ], {"class": "page"})
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+        self.assertEqual(node.to_html(), '<div class="page"><p><b>Bold</b> text</p><a href="https://example.com">link</a></div>')
+
+    def test_write_to_stream(self):
+        node = ParentNode("ul", [LeafNode("li", f"Item {i}") for i in range(100)])
+        stream = io.StringIO()
+        written = node.write_to(stream, buffer_size=64)
+        self.assertEqual(stream.getvalue(), node.to_html())
+        self.assertEqual(written, len(stream.getvalue()))
+
+    def test_write_to_leaf(self):
+        stream = io.StringIO()
+        LeafNode("p", "paragraph").write_to(stream)
+        self.assertEqual(stream.getvalue(), "<p>paragraph</p>")
+
+    def test_many_children(self):
+        node = ParentNode("div", [LeafNode("span", "x") for _ in range(50000)])
+        self.assertEqual(node.to_html(), "<div>" + "<span>x</span>" * 50000 + "</div>")
+
+    def test_iter_html_raises_lazily(self):
+        node = ParentNode("div", [LeafNode("p", "ok"), ParentNode("p", [])])
+        chunks = node.iter_html()
+        self.assertEqual(next(chunks), "<div>")
+        self.assertEqual(next(chunks), "<p>ok</p>")
+        with self.assertRaises(ValueError):
+            next(chunks)
+
+def nested(depth, text="deep"):
+    node = LeafNode("", text)
+    for i in range(depth):
+        node = ParentNode("li" if i % 2 else "ul", [node, LeafNode("b", "x")] if i % 3 == 0 else [node])
+    return node
+
+class TestDeepTrees(unittest.TestCase):
+    DEPTH = 100_000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = nested(cls.DEPTH)
+
+    def test_render(self):
+        html = self.tree.to_html()
+        self.assertTrue(html.startswith("<li><ul><li>"))
+        self.assertTrue(html.endswith("</li><b>x</b></ul></li></ul><b>x</b></li>"))
+        self.assertEqual(html.count("<b>x</b>"), (self.DEPTH + 2) // 3)
+        stream = io.StringIO()
+        self.assertEqual(self.tree.write_to(stream), len(html))
+
+    def test_matches_nested_rendering(self):
+        node = nested(30)
+        expected = "deep"
+        for i in range(30):
+            tag = "li" if i % 2 else "ul"
+            expected = f"<{tag}>{expected}<b>x</b></{tag}>" if i % 3 == 0 else f"<{tag}>{expected}</{tag}>"
+        self.assertEqual(node.to_html(), expected)
+
+    def test_equality(self):
+        self.assertEqual(self.tree, nested(self.DEPTH))
+        self.assertNotEqual(self.tree, nested(self.DEPTH, "other"))
+        self.assertNotEqual(self.tree, nested(self.DEPTH - 1))
+
+    def test_walk(self):
+        nodes = list(walk([self.tree]))
+        self.assertEqual(len(nodes), self.DEPTH + 1 + (self.DEPTH + 2) // 3)
+        self.assertEqual(nodes[-1].to_html(), "<b>x</b>")
+        self.assertEqual([node.tag for node in walk([ParentNode("p", [LeafNode("b", "1"), ParentNode("i", [LeafNode("", "2")])]), LeafNode("", "3")])],
+                         ["p", "b", "i", "", ""])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import random
+import unittest
+from textnode import TextNode, TextType
+from helpers import split_nodes_delimiter, split_nodes_image, split_nodes_link
+import mmap
+import tempfile
+from inline import markdown_image_spans, markdown_link_spans, tokenize_inline, tokenize_inline_spans
+from textnode import SpanTextNode
+
+
+def staged_text_to_textnodes(text):
+    # The original five-stage pipeline, kept here as the reference implementation.
+    nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+class TestTokenizeInline(unittest.TestCase):
+
+    def assertMatchesStaged(self, text):
+        self.assertEqual(tokenize_inline(text), staged_text_to_textnodes(text), repr(text))
+
+    def test_mixed_formatting(self):
+        text = "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        expected = [
+            TextNode("This is ", TextType.TEXT),
+            TextNode("text", TextType.BOLD),
+            TextNode(" with an ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+            TextNode(" word and a ", TextType.TEXT),
+            TextNode("code block", TextType.CODE),
+            TextNode(" and an ", TextType.TEXT),
+            TextNode("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"),
+            TextNode(" and a ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "https://boot.dev"),
+        ]
+        self.assertEqual(tokenize_inline(text), expected)
+
+    def test_empty_string(self):
+        self.assertEqual(tokenize_inline(""), [TextNode("", TextType.TEXT)])
+
+    def test_edge_cases_match_staged(self):
+        texts = [
+            "**bold** at the start",
+            "ends with *italic*",
+            "***",
+            "`code with **stars** inside`",
+            "**bold with ![image](img.png) inside**",
+            "*italic [link](url)* after",
+            "![a](1)![b](2)[c](3)[d](4)",
+            "[outer ![inner](img) text](url)",
+            "![alt [with] brackets](url)",
+            "unclosed [link(url) and ![image](",
+            "link with\nnewline [a\nb](c) [d](e)",
+            "**`*`**",
+        ]
+        for text in texts:
+            self.assertMatchesStaged(text)
+
+    def test_random_text_matches_staged(self):
+        rng = random.Random(1234)
+        alphabet = ["a", "b", " ", "`", "*", "**", "!", "[", "]", "(", ")", "![x](y)", "[l](u)", "\n"]
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertMatchesStaged(text)
+
+
+class TestTokenizeInlineSpans(unittest.TestCase):
+
+    def test_str_matches_tokenize_inline(self):
+        rng = random.Random(4321)
+        alphabet = ["a", "b", " ", "`", "*", "**", "!", "[", "]", "(", ")", "![x](y)", "[l](u)", "\n"]
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(tokenize_inline_spans(text), tokenize_inline(text), repr(text))
+
+    def test_bytes_match_tokenize_inline(self):
+        rng = random.Random(5678)
+        alphabet = ["a", "é", " ", "`", "*", "**", "!", "[", "]", "(", ")", "![x](y)", "[l](ü)", "\n"]
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(tokenize_inline_spans(text.encode()), tokenize_inline(text), repr(text))
+
+    def test_references_across_line_breaks_match(self):
+        for text in ("[a\nb](c) x", "![a\nb](c\nd) x", "see [l](u\n) and [x\n](y)", "[a](b\n\nc"):
+            self.assertEqual(tokenize_inline_spans(text.encode()), tokenize_inline(text), repr(text))
+            self.assertEqual(tokenize_inline_spans(text), tokenize_inline(text), repr(text))
+        self.assertEqual(tokenize_inline("[a\nb](c) x"), [TextNode("[a\nb](c) x", TextType.TEXT)])
+        self.assertEqual(tokenize_inline_spans(b"[a\nb](c) x"), [TextNode("[a\nb](c) x", TextType.TEXT)])
+
+    def test_nodes_point_into_buffer(self):
+        buffer = "# Title\n\nSome **bold** and [a link](url)\n"
+        nodes = tokenize_inline_spans(buffer, 9, len(buffer) - 1)
+        self.assertTrue(all(isinstance(node, SpanTextNode) for node in nodes))
+        self.assertEqual([(node.start, node.end) for node in nodes], [(9, 14), (16, 20), (22, 27), (28, 34)])
+        self.assertEqual(nodes[3], TextNode("a link", TextType.LINK, "url"))
+
+    def test_text_is_materialized_once(self):
+        node = tokenize_inline_spans(b"plain text")[0]
+        self.assertIs(node.text, node.text)
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write("Über *alles* with ![an image](pic.png)\n".encode())
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                nodes = tokenize_inline_spans(source)
+                self.assertEqual(nodes, [
+                    TextNode("Über ", TextType.TEXT),
+                    TextNode("alles", TextType.ITALIC),
+                    TextNode(" with ", TextType.TEXT),
+                    TextNode("an image", TextType.IMAGE, "pic.png"),
+                    TextNode("\n", TextType.TEXT),
+                ])
+
+
+class TestReferenceSpans(unittest.TestCase):
+
+    def test_image_spans(self):
+        text = "An ![alt](img.png) and ![](other.png)"
+        self.assertEqual(markdown_image_spans(text), [("alt", "img.png", 3, 18), ("", "other.png", 23, 37)])
+
+    def test_link_spans(self):
+        text = "A [link](url) here"
+        spans = markdown_link_spans(text)
+        self.assertEqual(spans, [("link", "url", 2, 13)])
+        self.assertEqual(text[2:13], "[link](url)")
+
+    def test_spans_within_range(self):
+        text = "[a](1) [b](2) [c](3)"
+        self.assertEqual(markdown_link_spans(text, 7, 13), [("b", "2", 7, 13)])
+
+    def test_no_reference_marker(self):
+        self.assertEqual(markdown_image_spans("no images [here]"), [])
+        self.assertEqual(markdown_link_spans("no links (here)"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
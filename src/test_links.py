@@ -0,0 +1,57 @@
+import unittest
+from blocks import iter_block_nodes
+from links import check_links, page_references, resolve_target
+from manifest import Manifest, PageEntry, StaticEntry
+
+class TestPageReferences(unittest.TestCase):
+
+    def test_links_and_images_in_order(self):
+        nodes = list(iter_block_nodes("See [a](a.html) and ![logo](/logo.png).\n\n- [b](b.html)\n- [a](a.html)\n\n> [c](https://c.example)"))
+        self.assertEqual(page_references(nodes), (("a.html", "b.html", "https://c.example"), ("/logo.png",)))
+
+    def test_no_references(self):
+        self.assertEqual(page_references(list(iter_block_nodes("Just `code` and *text*."))), ((), ()))
+
+
+class TestResolveTarget(unittest.TestCase):
+
+    def test_relative(self):
+        self.assertEqual(resolve_target("blog/post.html", "other.html"), "blog/other.html")
+        self.assertEqual(resolve_target("blog/post.html", "../about/"), "about/index.html")
+        self.assertEqual(resolve_target("blog/post.html", "./"), "blog/index.html")
+        self.assertEqual(resolve_target("index.html", "../outside.html"), "../outside.html")
+
+    def test_absolute(self):
+        self.assertEqual(resolve_target("blog/post.html", "/"), "index.html")
+        self.assertEqual(resolve_target("blog/post.html", "/images/a%20b.png?v=2#x"), "images/a b.png")
+
+    def test_external_and_fragments(self):
+        for target in ("https://example.com/", "//cdn.example/x.js", "mailto:me@example.com", "#top", "?page=2", ""):
+            self.assertIsNone(resolve_target("index.html", target), target)
+
+
+class TestCheckLinks(unittest.TestCase):
+
+    def manifest(self):
+        return Manifest("t", {
+            "index.md": PageEntry("1", 1, 1, "index.html", "Home", ("blog/first", "blog/", "missing.html", "https://example.com"), ("/logo.png",)),
+            "blog/index.md": PageEntry("2", 1, 1, "blog/index.html", "Blog", ("first.html", "../index.html#top"), ("../gone.png",)),
+            "blog/first.md": PageEntry("3", 1, 1, "blog/first.html", "First", ("/",), ()),
+        }, {"logo.png": StaticEntry(1, 1)})
+
+    def test_broken(self):
+        report = check_links(self.manifest())
+        self.assertEqual(report.broken, [("blog/index.md", "../gone.png"), ("index.md", "missing.html")])
+        self.assertEqual(report.checked, 8)
+
+    def test_backlinks(self):
+        report = check_links(self.manifest())
+        self.assertEqual(report.backlinks, {
+            "blog/first.html": ["blog/index.md", "index.md"],
+            "blog/index.html": ["index.md"],
+            "index.html": ["blog/first.md", "blog/index.md"],
+            "logo.png": ["index.md"],
+        })
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,68 +1,33 @@
+import contextlib
+import io
+import os
+import tempfile
 import unittest
-from main import text_node_to_html_node
-from textnode import TextNode, TextType
-from htmlnode import LeafNode
+from main import main
 
-class TestTextNodeToHtmlNode(unittest.TestCase):
-    def test_text_node(self):
-        text_node = TextNode("Hello, World!", TextType.TEXT)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("", "Hello, World!"))
+class TestBuildCommand(unittest.TestCase):
 
-    def test_bold_node(self):
-        text_node = TextNode("Hello, World!", TextType.BOLD)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("b", "Hello, World!"))
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        os.makedirs(self.content)
 
-    def test_italic_node(self):
-        text_node = TextNode("Hello, World!", TextType.ITALIC)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("i", "Hello, World!"))
+    def tearDown(self):
+        self.tmp.cleanup()
 
-    def test_code_node(self):
-        text_node = TextNode("print('Hello, World!')", TextType.CODE)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("code", "print('Hello, World!')"))
+    def build(self, *args):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+            main(["build", "--content", self.content, "--output", self.output, *args])
+        return context.exception.code, stderr.getvalue()
 
-    def test_link_node(self):
-        text_node = TextNode("Click here", TextType.LINK, url="https://example.com")
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("a", "Click here", {"href": "https://example.com"}))
-
-    def test_image_node(self):
-        text_node = TextNode("Image description", TextType.IMAGE, url="https://example.com/image.png")
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("img", "", {"src": "https://example.com/image.png", "alt": "Image description"}))
-
-    def test_empty_text_node(self):
-        text_node = TextNode("", TextType.TEXT)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("", ""))
-
-    def test_empty_bold_node(self):
-        text_node = TextNode("", TextType.BOLD)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("b", ""))
-
-    def test_empty_italic_node(self):
-        text_node = TextNode("", TextType.ITALIC)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("i", ""))
-
-    def test_empty_code_node(self):
-        text_node = TextNode("", TextType.CODE)
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("code", ""))
-
-    def test_empty_link_node(self):
-        text_node = TextNode("", TextType.LINK, url="https://example.com")
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("a", "", {"href": "https://example.com"}))
-
-    def test_empty_image_node(self):
-        text_node = TextNode("", TextType.IMAGE, url="https://example.com/image.png")
-        html_node = text_node_to_html_node(text_node)
-        self.assertEqual(html_node, LeafNode("img", "", {"src": "https://example.com/image.png", "alt": ""}))
+    def test_whole_site_options_reject_shard(self):
+        for option in (["--check-links"], ["--search"], ["--base-url", "https://example.com"]):
+            code, error = self.build("--shard", "0/2", *option)
+            self.assertEqual(code, 2)
+            self.assertIn(f"{option[0]} cannot be combined with --shard", error)
+        self.assertFalse(os.path.exists(self.output))
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from manifest import MANIFEST_NAME, MANIFEST_VERSION, Manifest, PageEntry, StaticEntry, hash_file
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, MANIFEST_NAME)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        manifest = Manifest("abc", {"index.md": PageEntry("123", 10, 20, "index.html", "Home", ("about.html",), ("logo.png",))}, {"styles.css": StaticEntry(5, 6)}, {"index.html": StaticEntry(7, 8, "456")}, (1, 4))
+        manifest.save(self.path)
+        loaded = Manifest.load(self.path)
+        self.assertEqual(loaded.template_hash, "abc")
+        self.assertEqual(loaded.pages, manifest.pages)
+        self.assertEqual(loaded.static, manifest.static)
+        self.assertEqual(loaded.compressed, manifest.compressed)
+        self.assertEqual(loaded.shard, (1, 4))
+
+    def test_missing_file(self):
+        manifest = Manifest.load(self.path)
+        self.assertIsNone(manifest.template_hash)
+        self.assertEqual(manifest.pages, {})
+
+    def test_corrupt_file(self):
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(Manifest.load(self.path).pages, {})
+
+    def test_other_version(self):
+        with open(self.path, "w") as f:
+            f.write('{"version": -1, "pages": {}}')
+        self.assertEqual(Manifest.load(self.path).pages, {})
+
+    def test_malformed_entries(self):
+        for body in ('"template": {"hash": "abc"}',
+                     '"pages": {}',
+                     '"template": {"hash": "abc"}, "pages": {"index.md": {"unknown": 1}}',
+                     '"template": {"hash": "abc"}, "pages": {}, "static": {"a.css": [1, 2]}',
+                     '"template": {"hash": "abc"}, "pages": []'):
+            with open(self.path, "w") as f:
+                f.write(f'{{"version": {MANIFEST_VERSION}, {body}}}')
+            manifest = Manifest.load(self.path)
+            self.assertIsNone(manifest.template_hash, body)
+            self.assertEqual(manifest.pages, {}, body)
+
+    def test_hash_file(self):
+        path = os.path.join(self.tmp.name, "page.md")
+        with open(path, "w") as f:
+            f.write("one")
+        first = hash_file(path)
+        with open(path, "w") as f:
+            f.write("two")
+        self.assertNotEqual(hash_file(path), first)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from blocks import markdown_to_html_node
+from profiling import Profile, active_profile, capture_page, count, disable_profiling, enable_profiling, span, take_profile
+
+class TestProfiling(unittest.TestCase):
+
+    def tearDown(self):
+        disable_profiling()
+
+    def test_disabled_records_nothing(self):
+        with span("parse"):
+            count("blocks")
+        with capture_page("index.html"):
+            pass
+        self.assertIsNone(active_profile())
+        self.assertIsNone(take_profile())
+
+    def test_spans_and_counters(self):
+        profile = Profile()
+        enable_profiling(profile)
+        markdown_to_html_node("# Title\n\nSome *text*\n\n- one\n- two")
+        self.assertEqual(profile.spans["inline"][0], 4)
+        self.assertEqual(profile.spans["convert"][0], 4)
+        self.assertEqual(profile.counters["text_nodes"], 6)
+        self.assertIn("inline", profile.summary())
+
+    def test_summary_columns_fit_longest_label(self):
+        profile = Profile()
+        profile.add_time("render", 1.0)
+        profile.count("tree_cache_misses", 3)
+        lines = profile.summary().splitlines()
+        self.assertEqual(lines[3], "tree_cache_misses          3")
+        self.assertEqual(lines[0].index("calls") + len("calls"), len(lines[3]))
+        self.assertTrue(lines[1].startswith("render            "))
+
+    def test_take_profile(self):
+        enable_profiling(Profile())
+        count("pages", 2)
+        taken = take_profile()
+        self.assertEqual(taken.counters, {"pages": 2})
+        self.assertEqual(active_profile().counters, {})
+
+    def test_merge(self):
+        first, second = Profile(), Profile()
+        first.add_time("render", 1.0)
+        second.add_time("render", 2.0, calls=3)
+        second.count("blocks", 5)
+        first.merge(second)
+        self.assertEqual(first.spans["render"], [4, 3.0])
+        self.assertEqual(first.counters, {"blocks": 5})
+
+    def test_tracemalloc_capture(self):
+        profile = Profile("tracemalloc")
+        enable_profiling(profile)
+        with capture_page("index.html"):
+            data = [str(i) for i in range(1000)]
+        self.assertEqual(profile.pages[0].page, "index.html")
+        self.assertGreater(profile.pages[0].peak_memory, 0)
+        self.assertEqual(profile.spans["page"][0], 1)
+
+    def test_cprofile_capture(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            enable_profiling(Profile("cprofile", tmp))
+            with capture_page("blog/post.html"):
+                markdown_to_html_node("Some **text**")
+            self.assertTrue(os.path.exists(os.path.join(tmp, "blog", "post.html.prof")))
+
+    def test_invalid_capture(self):
+        with self.assertRaises(ValueError):
+            Profile("perf")
+        with self.assertRaises(ValueError):
+            Profile("cprofile")
+
+if __name__ == "__main__":
+    unittest.main()
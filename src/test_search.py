@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from blocks import iter_block_nodes
+from search import CHUNK_DIR, INDEX_NAME, SEARCH_DIR, chunk_name, load_search_state, page_terms, remove_index, save_search_state, search_state_path, write_index
+
+class TestPageTerms(unittest.TestCase):
+
+    def test_positions_are_delta_encoded(self):
+        nodes = iter_block_nodes("# Fast sites\n\nA **fast** site, *fast* `code`.")
+        self.assertEqual(page_terms(nodes), {"fast": [0, 3, 2], "sites": [1], "a": [2], "site": [4], "code": [6]})
+
+    def test_link_and_image_text_is_skipped(self):
+        nodes = iter_block_nodes("See [the docs](docs.html) and ![a logo](logo.png) here.")
+        self.assertEqual(page_terms(nodes), {"see": [0], "and": [1], "here": [2]})
+
+    def test_adjacent_leaves_stay_separate_words(self):
+        self.assertEqual(page_terms(iter_block_nodes("foo**bar**")), {"foo": [0], "bar": [1]})
+
+
+class TestChunkName(unittest.TestCase):
+
+    def test_names(self):
+        self.assertEqual(chunk_name("search"), "se")
+        self.assertEqual(chunk_name("a"), "a")
+        self.assertEqual(chunk_name("_x"), "_x")
+        self.assertEqual(chunk_name("été"), "u-e9-74")
+        self.assertEqual(chunk_name("日本"), "u-65e5-672c")
+
+
+class TestWriteIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, *path):
+        with open(os.path.join(self.output, SEARCH_DIR, *path), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_postings_are_delta_encoded_by_page(self):
+        report = write_index(self.output, [
+            ("a.html", "A", {"site": [0, 3], "fast": [1]}),
+            ("b.html", "B", {"fast": [0]}),
+            ("c.html", "C", {"site": [2]}),
+        ])
+        self.assertEqual((report.pages, report.terms, report.written), (3, 2, 2))
+        self.assertEqual(self.read(INDEX_NAME), {"version": 1, "prefix": 2, "pages": [["a.html", "A"], ["b.html", "B"], ["c.html", "C"]]})
+        self.assertEqual(self.read(CHUNK_DIR, "si.json"), {"site": [0, 2, 0, 3, 2, 1, 2]})
+        self.assertEqual(self.read(CHUNK_DIR, "fa.json"), {"fast": [0, 1, 1, 1, 1, 0]})
+
+    def test_only_changed_chunks_are_written(self):
+        write_index(self.output, [("a.html", "A", {"site": [0], "fast": [1]})])
+        report = write_index(self.output, [("a.html", "A", {"site": [0], "slow": [1]})])
+        self.assertEqual((report.written, report.unchanged, report.removed), (1, 1, 1))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.output, SEARCH_DIR, CHUNK_DIR))), ["si.json", "sl.json"])
+
+    def test_state_round_trip_and_removal(self):
+        cache_dir = os.path.join(self.output, "cache")
+        path = search_state_path(cache_dir, os.path.join(self.output, "public"))
+        self.assertTrue(path.startswith(cache_dir + os.sep))
+        self.assertNotEqual(path, search_state_path(cache_dir, os.path.join(self.output, "other")))
+        self.assertEqual(load_search_state(path), {})
+        save_search_state(path, {"a.md": {"site": [0]}})
+        self.assertEqual(load_search_state(path), {"a.md": {"site": [0]}})
+        write_index(self.output, [("a.html", "A", {"site": [0]})])
+        self.assertTrue(remove_index(self.output, path))
+        self.assertEqual(load_search_state(path), {})
+        self.assertFalse(os.path.exists(os.path.join(self.output, SEARCH_DIR)))
+        self.assertFalse(remove_index(self.output, path))
+
+if __name__ == "__main__":
+    unittest.main()
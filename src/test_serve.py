@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
+from build import BuildOptions, build_site
+from serve import LIVE_RELOAD_PATH, LIVE_RELOAD_SCRIPT, ReloadSignal, changed_pages, inject_live_reload, make_handler, rebuild
+
+TEMPLATE = "<html><body>{{ Content }}</body></html>"
+
+class TestServe(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write(TEMPLATE)
+        self.write_page("index.md", "# Home")
+        self.write_page("blog/post.md", "# Post")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, name, text):
+        path = os.path.join(self.content, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_inject_live_reload(self):
+        self.assertEqual(inject_live_reload(b"<body></body>"), b"<body>" + LIVE_RELOAD_SCRIPT + b"</body>")
+        self.assertEqual(inject_live_reload(b"<p></p>"), b"<p></p>" + LIVE_RELOAD_SCRIPT)
+
+    def test_changed_pages(self):
+        index = os.path.join(self.content, "index.md")
+        self.assertEqual(changed_pages(self.content, [index, self.template]), ["index.md"])
+        self.assertIsNone(changed_pages(self.content, [os.path.join(self.content, "gone")]))
+
+    def test_rebuild_only_changed_page(self):
+        manifest = build_site(self.content, self.output, self.template, BuildOptions(jobs=1)).manifest
+        path = self.write_page("blog/post.md", "# Edited")
+        report = rebuild(self.content, self.output, self.template, manifest, [path], BuildOptions(jobs=1))
+        self.assertEqual([result.output for result in report.rendered], ["blog/post.html"])
+        self.assertEqual(report.unchanged, 1)
+        os.remove(path)
+        report = rebuild(self.content, self.output, self.template, report.manifest, [path], BuildOptions(jobs=1))
+        self.assertEqual(report.removed, ["blog/post.html"])
+
+    def test_server(self):
+        build_site(self.content, self.output, self.template, BuildOptions(jobs=1))
+        signal = ReloadSignal()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(self.output, signal))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            with urllib.request.urlopen(base + "/index.html") as response:
+                self.assertIn(LIVE_RELOAD_SCRIPT, response.read())
+            with urllib.request.urlopen(base + LIVE_RELOAD_PATH, timeout=5) as events:
+                signal.notify()
+                self.assertEqual(events.readline(), b"data: reload\n")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_reload_signal(self):
+        signal = ReloadSignal()
+        self.assertEqual(signal.wait(0, timeout=0.01), 0)
+        signal.notify()
+        self.assertEqual(signal.wait(0), 1)
+
+if __name__ == "__main__":
+    unittest.main()
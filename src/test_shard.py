@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from build import BuildOptions, build_site
+from manifest import MANIFEST_NAME
+from shard import merge_shards, parse_shard, shard_of
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestShardAssignment(unittest.TestCase):
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("0/1"), (0, 1))
+        self.assertEqual(parse_shard("3/8"), (3, 8))
+        for text in ("8/8", "1/0", "-1/4", "1", "a/b", "1/2/3"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_shard(text)
+
+    def test_shard_of_is_stable_and_spread(self):
+        pages = [f"blog/post{i}.md" for i in range(200)]
+        shards = [shard_of(page, 4) for page in pages]
+        self.assertEqual(shards, [shard_of(page, 4) for page in pages])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertEqual(shard_of("index.md", 1), 0)
+
+
+class TestShardedBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write(TEMPLATE)
+        for i in range(20):
+            self.write(self.content, f"section{i % 3}/page{i}.md", f"# Page {i}\n\nText of page {i}.")
+        for i in range(5):
+            self.write(self.static, f"images/image{i}.png", f"image {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, directory, name, text):
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def output(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def build_shards(self, count):
+        shards = []
+        for index in range(count):
+            output = self.output(f"shard{index}")
+            build_site(self.content, output, self.template, BuildOptions(jobs=1, static_dir=self.static, shard=(index, count)))
+            shards.append(output)
+        return shards
+
+    def files(self, directory):
+        found = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                if name != MANIFEST_NAME:
+                    with open(path) as f:
+                        found[os.path.relpath(path, directory)] = f.read()
+        return found
+
+    def test_shards_partition_the_site(self):
+        shards = self.build_shards(3)
+        counts = [len(self.files(shard)) for shard in shards]
+        self.assertEqual(sum(counts), 25)
+        self.assertTrue(all(counts))
+
+    def test_merge_matches_full_build(self):
+        full = build_site(self.content, self.output("full"), self.template, BuildOptions(jobs=1, static_dir=self.static))
+        manifest, report = merge_shards(self.build_shards(3), self.output("merged"))
+        self.assertEqual(self.files(self.output("merged")), self.files(self.output("full")))
+        self.assertEqual(len(report.copied), 25)
+        self.assertEqual(manifest.pages, full.manifest.pages)
+        self.assertIsNone(manifest.shard)
+
+    def test_merge_again_copies_only_changes(self):
+        shards = self.build_shards(2)
+        merge_shards(shards, self.output("merged"))
+        os.remove(os.path.join(self.content, "section0/page0.md"))
+        self.write(self.content, "section1/page1.md", "# Edited")
+        shards = self.build_shards(2)
+        _, report = merge_shards(shards, self.output("merged"))
+        self.assertEqual(report.copied, ["section1/page1.html"])
+        self.assertEqual(report.removed, ["section0/page0.html"])
+        self.assertEqual(report.unchanged, 23)
+
+    def test_missing_shard(self):
+        shards = self.build_shards(3)
+        with self.assertRaisesRegex(ValueError, "shards 0 to 2"):
+            merge_shards(shards[:2], self.output("merged"))
+
+    def test_unsharded_output(self):
+        build_site(self.content, self.output("full"), self.template, BuildOptions(jobs=1))
+        with self.assertRaisesRegex(ValueError, "not the output of a sharded build"):
+            merge_shards([self.output("full")], self.output("merged"))
+
+    def test_overlapping_shards(self):
+        shards = self.build_shards(2)
+        self.write(shards[1], "images/image0.png", "copy")
+        self.write(shards[0], "images/image0.png", "copy")
+        with self.assertRaisesRegex(ValueError, "overlap on images/image0.png"):
+            merge_shards(shards, self.output("merged"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from blocks import iter_block_nodes
+from manifest import Manifest, PageEntry
+from sitemap import FEED_NAME, SITEMAP_NAME, format_time, page_summary, page_url, write_sitemaps
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+class TestPageSummary(unittest.TestCase):
+
+    def test_first_paragraph(self):
+        nodes = iter_block_nodes("# Title\n\n- item\n\nSee [the docs](docs.html)\nfor **more**.\n\nLater text.")
+        self.assertEqual(page_summary(nodes), "See the docs for more.")
+
+    def test_cut_at_word_boundary(self):
+        self.assertEqual(page_summary(iter_block_nodes("one two, three four"), 12), "one two…")
+        self.assertEqual(page_summary(iter_block_nodes("# Only a heading")), "")
+
+
+class TestPageUrl(unittest.TestCase):
+
+    def test_urls(self):
+        self.assertEqual(page_url("https://example.com", "index.html"), "https://example.com/")
+        self.assertEqual(page_url("https://example.com/docs/", "blog/index.html"), "https://example.com/docs/blog/")
+        self.assertEqual(page_url("https://example.com", "a b.html"), "https://example.com/a%20b.html")
+
+    def test_format_time(self):
+        self.assertEqual(format_time(1_700_000_000_123_456_789), "2023-11-14T22:13:20Z")
+
+
+class TestWriteSitemaps(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = self.tmp.name
+        self.manifest = Manifest(pages={
+            f"p{i}.md": PageEntry(str(i), 1, 1, f"p{i}.html", f"Page & {i}", updated=i * 1_000_000_000, summary=f"Summary {i}")
+            for i in range(5)
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def parse(self, name):
+        return ET.parse(os.path.join(self.output, name)).getroot()
+
+    def test_sitemap_and_feed(self):
+        generated, report = write_sitemaps(self.output, self.manifest, "https://example.com", {}, feed_size=2)
+        self.assertEqual(report.written, [FEED_NAME, SITEMAP_NAME])
+        urls = [(url.find(SITEMAP + "loc").text, url.find(SITEMAP + "lastmod").text) for url in self.parse(SITEMAP_NAME)]
+        self.assertEqual(urls[0], ("https://example.com/p0.html", "1970-01-01T00:00:00Z"))
+        self.assertEqual(len(urls), 5)
+        entries = self.parse(FEED_NAME).findall(ATOM + "entry")
+        self.assertEqual([entry.find(ATOM + "title").text for entry in entries], ["Page & 4", "Page & 3"])
+        self.assertEqual(entries[0].find(ATOM + "summary").text, "Summary 4")
+
+    def test_only_changed_files_are_rewritten(self):
+        # With limit=2 the five pages need four hash buckets: p3, then p0 and p4, then p1
+        # and p2, with the last one empty.
+        generated, _ = write_sitemaps(self.output, self.manifest, "https://example.com", {}, limit=2, feed_size=2)
+        self.assertEqual(sorted(generated), [FEED_NAME, "sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml", SITEMAP_NAME])
+        self.assertEqual([loc.text for loc in self.parse(SITEMAP_NAME).iter(SITEMAP + "loc")],
+                         ["https://example.com/sitemap-1.xml", "https://example.com/sitemap-2.xml", "https://example.com/sitemap-3.xml"])
+        self.assertEqual([loc.text for loc in self.parse("sitemap-2.xml").iter(SITEMAP + "loc")],
+                         ["https://example.com/p0.html", "https://example.com/p4.html"])
+        self.manifest.pages["p0.md"].updated = 10_000_000_000
+        generated, report = write_sitemaps(self.output, self.manifest, "https://example.com", generated, limit=2, feed_size=2)
+        self.assertEqual(report.written, [FEED_NAME, "sitemap-2.xml", SITEMAP_NAME])
+        self.assertEqual(report.unchanged, 2)
+        # A page sorting before the others only changes the sitemap it hashes to.
+        self.manifest.pages["c.md"] = PageEntry("c", 1, 1, "c.html", "Page c", updated=0)
+        generated, report = write_sitemaps(self.output, self.manifest, "https://example.com", generated, limit=2, feed_size=2)
+        self.assertEqual(report.written, ["sitemap-1.xml"])
+        self.assertEqual(report.unchanged, 4)
+        self.assertEqual([loc.text for loc in self.parse("sitemap-1.xml").iter(SITEMAP + "loc")],
+                         ["https://example.com/c.html", "https://example.com/p3.html"])
+        del self.manifest.pages["p4.md"], self.manifest.pages["p3.md"], self.manifest.pages["c.md"]
+        generated, report = write_sitemaps(self.output, self.manifest, "https://example.com", generated, limit=4, feed_size=2)
+        self.assertEqual(report.removed, ["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"])
+        self.assertEqual(len(self.parse(SITEMAP_NAME)), 3)
+        self.assertEqual(sorted(os.listdir(self.output)), [FEED_NAME, SITEMAP_NAME])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from static import copy_file, find_static_files, sync_static
+
+class TestSyncStatic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.output = os.path.join(self.tmp.name, "public")
+        self.write("styles.css", "body {}")
+        self.write("images/logo.png", "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.static, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read_output(self, name):
+        with open(os.path.join(self.output, name)) as f:
+            return f.read()
+
+    def test_find_static_files(self):
+        self.assertEqual(sorted(path for path, _ in find_static_files(self.static)), ["images/logo.png", "styles.css"])
+        self.assertEqual(list(find_static_files(os.path.join(self.tmp.name, "missing"))), [])
+
+    def test_copies_then_skips_unchanged(self):
+        entries, report = sync_static(self.static, self.output, {})
+        self.assertEqual(report.copied, ["images/logo.png", "styles.css"])
+        self.assertEqual(self.read_output("images/logo.png"), "png")
+        entries, report = sync_static(self.static, self.output, entries)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(report.unchanged, 2)
+
+    def test_changed_file_is_copied(self):
+        entries, _ = sync_static(self.static, self.output, {})
+        self.write("styles.css", "body { color: red; }")
+        _, report = sync_static(self.static, self.output, entries)
+        self.assertEqual(report.copied, ["styles.css"])
+        self.assertEqual(self.read_output("styles.css"), "body { color: red; }")
+
+    def test_missing_output_is_copied(self):
+        entries, _ = sync_static(self.static, self.output, {})
+        os.remove(os.path.join(self.output, "styles.css"))
+        _, report = sync_static(self.static, self.output, entries)
+        self.assertEqual(report.copied, ["styles.css"])
+
+    def test_checksum_skips_touched_file(self):
+        entries, _ = sync_static(self.static, self.output, {}, checksum=True)
+        os.utime(os.path.join(self.static, "styles.css"), ns=(1, 1))
+        entries, report = sync_static(self.static, self.output, entries, checksum=True)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(entries["styles.css"].mtime_ns, 1)
+
+    def test_removed_source_is_pruned(self):
+        entries, _ = sync_static(self.static, self.output, {})
+        os.remove(os.path.join(self.static, "images/logo.png"))
+        _, report = sync_static(self.static, self.output, entries)
+        self.assertEqual(report.removed, ["images/logo.png"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "images")))
+
+    def test_exclude(self):
+        entries, report = sync_static(self.static, self.output, {}, exclude={"styles.css"})
+        self.assertEqual(report.copied, ["images/logo.png"])
+        self.assertNotIn("styles.css", entries)
+
+    def test_link(self):
+        sync_static(self.static, self.output, {}, link=True)
+        self.assertTrue(os.path.samefile(os.path.join(self.static, "styles.css"), os.path.join(self.output, "styles.css")))
+
+    def test_copy_file_keeps_mtime(self):
+        source = self.write("big.bin", "x" * 100_000)
+        os.utime(source, ns=(1, 2_000_000_000))
+        destination = os.path.join(self.output, "big.bin")
+        copy_file(source, destination)
+        self.assertEqual(self.read_output("big.bin"), "x" * 100_000)
+        self.assertEqual(os.stat(destination).st_mtime_ns, 2_000_000_000)
+
+if __name__ == "__main__":
+    unittest.main()
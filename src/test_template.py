@@ -0,0 +1,81 @@
+import io
+import os
+import tempfile
+import unittest
+from template import Template, load_template
+
+class TestTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_compile(self):
+        template = Template.compile("<title>{{ Title }}</title><body>{{Content}}</body>")
+        self.assertEqual(template.literals, ("<title>", "</title><body>", "</body>"))
+        self.assertEqual(template.slots, ("Title", "Content"))
+
+    def test_render(self):
+        template = Template.compile("{{ Title }} - {{ Site }}: {{ Title }}")
+        self.assertEqual(template.render({"Title": "Home", "Site": "Blog"}), "Home - Blog: Home")
+
+    def test_no_slots(self):
+        self.assertEqual(Template.compile("plain").render({}), "plain")
+
+    def test_missing_slot(self):
+        with self.assertRaises(ValueError):
+            Template.compile("{{ Title }}").render({})
+
+    def test_write_to(self):
+        stream = io.StringIO()
+        written = Template.compile("<p>{{ Content }}</p>").write_to(stream, {"Content": "hi"})
+        self.assertEqual(stream.getvalue(), "<p>hi</p>")
+        self.assertEqual(written, 9)
+
+    def test_include(self):
+        self.write("partials/head.html", "<head><title>{{ Title }}</title></head>")
+        path = self.write("page.html", '<html>{% include "partials/head.html" %}<body>{{ Content }}</body></html>')
+        template = Template.from_file(path)
+        self.assertEqual(template.slots, ("Title", "Content"))
+        self.assertEqual(template.render({"Title": "T", "Content": "C"}), "<html><head><title>T</title></head><body>C</body></html>")
+        self.assertEqual(len(template.files), 2)
+
+    def test_nested_include_is_relative(self):
+        self.write("partials/footer.html", '<footer>{% include "copyright.html" %}</footer>')
+        self.write("partials/copyright.html", "(c)")
+        path = self.write("page.html", '{% include "partials/footer.html" %}')
+        self.assertEqual(Template.from_file(path).render({}), "<footer>(c)</footer>")
+
+    def test_include_cycle(self):
+        self.write("a.html", '{% include "b.html" %}')
+        self.write("b.html", '{% include "a.html" %}')
+        with self.assertRaises(ValueError):
+            Template.from_file(os.path.join(self.tmp.name, "a.html"))
+
+    def test_include_needs_file(self):
+        with self.assertRaises(ValueError):
+            Template.compile('{% include "head.html" %}')
+
+    def test_load_template_is_cached_until_a_partial_changes(self):
+        partial = self.write("head.html", "<h1>{{ Title }}</h1>")
+        path = self.write("page.html", '{% include "head.html" %}{{ Content }}')
+        template = load_template(path)
+        self.assertIs(load_template(path), template)
+        self.write("head.html", "<h2>{{ Title }}</h2>")
+        os.utime(partial, ns=(1, 1))
+        reloaded = load_template(path)
+        self.assertIsNot(reloaded, template)
+        self.assertNotEqual(reloaded.digest, template.digest)
+        self.assertEqual(reloaded.render({"Title": "T", "Content": ""}), "<h2>T</h2>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,8 +14,12 @@ class TestTextNode(unittest.TestCase):
 
     def test_type(self):
         node = TextNode("This is a text node", TextType.BOLD)
-        self.assertEqual(node.text_type, "bold")
+        self.assertEqual(node.text_type, TextType.BOLD)
         
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
     def test_url(self):
         node = TextNode("This is a text node", TextType.BOLD, url="URL.com")
         self.assertEqual(node.url, "URL.com")
@@ -0,0 +1,97 @@
+import marshal
+import os
+import tempfile
+import unittest
+import treecache
+from blocks import iter_block_nodes
+from htmlnode import LeafNode, ParentNode
+from treecache import TreeCache, decode_tree, encode_tree
+
+MARKDOWN = """# Title
+
+Some **bold** and a [link](https://example.com?a=1&b=2) and ![image](pic.png).
+
+```python
+print("<hi>")
+```
+
+- one
+- two [link](https://example.com?a=1&b=2)
+
+> quoted *text*
+"""
+
+class TestTreeEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        nodes = list(iter_block_nodes(MARKDOWN))
+        decoded = decode_tree(encode_tree(nodes))
+        self.assertEqual(decoded, nodes)
+        self.assertEqual([node.to_html() for node in decoded], [node.to_html() for node in nodes])
+
+    def test_repeated_props_are_shared(self):
+        decoded = decode_tree(encode_tree(list(iter_block_nodes(MARKDOWN))))
+        first = decoded[1].children[3].props
+        second = decoded[3].children[1].children[1].props
+        self.assertIs(first, second)
+
+    def test_deep_tree_round_trip(self):
+        node = LeafNode("", "deep")
+        for _ in range(100_000):
+            node = ParentNode("blockquote", [node])
+        decoded = decode_tree(marshal.loads(marshal.dumps(encode_tree([node, LeafNode("p", "after")]))))
+        self.assertEqual(decoded, [node, LeafNode("p", "after")])
+
+
+class TestTreeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TreeCache(os.path.join(self.tmp.name, "trees"))
+        self.nodes = list(iter_block_nodes(MARKDOWN))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("abc"))
+        self.cache.put("abc", "Title", self.nodes)
+        self.assertEqual(self.cache.get("abc"), ("Title", self.nodes))
+        self.cache.put("untitled", None, [])
+        self.assertEqual(self.cache.get("untitled"), (None, []))
+
+    def test_other_parser_version_misses(self):
+        self.cache.put("abc", "Title", self.nodes)
+        version = treecache.PARSER_VERSION
+        treecache.PARSER_VERSION = version + 1
+        try:
+            self.assertIsNone(self.cache.get("abc"))
+        finally:
+            treecache.PARSER_VERSION = version
+
+    def test_corrupt_entry_misses(self):
+        self.cache.put("abc", "Title", self.nodes)
+        with open(self.cache.path_for("abc"), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(self.cache.get("abc"))
+
+    def test_evict_oldest_first(self):
+        for index, key in enumerate(("a", "b", "c")):
+            self.cache.put(key, "Title", self.nodes)
+            os.utime(self.cache.path_for(key), ns=(index, index))
+        size = os.path.getsize(self.cache.path_for("a"))
+        self.cache.get("a")
+        self.cache.max_bytes = 2 * size
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_clear(self):
+        self.cache.put("abc", "Title", self.nodes)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("abc"))
+        self.assertEqual(self.cache.evict(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
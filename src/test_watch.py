@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from watch import InotifyWatcher, PollingWatcher, create_watcher
+
+class WatcherTests:
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write("content/index.md", "# Home")
+        self.write("template.html", "{{ Content }}")
+        self.watcher = self.create([self.content, self.template])
+
+    def tearDown(self):
+        self.watcher.close()
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.changes(timeout=0.1), set())
+
+    def test_modified_file(self):
+        path = self.write("content/index.md", "# Changed")
+        self.assertEqual(self.watcher.changes(timeout=1), {path})
+
+    def test_new_directory(self):
+        path = self.write("content/blog/post.md", "# Post")
+        self.assertIn(path, self.watcher.changes(timeout=1))
+
+    def test_deleted_file(self):
+        path = os.path.join(self.content, "index.md")
+        os.remove(path)
+        self.assertEqual(self.watcher.changes(timeout=1), {path})
+
+    def test_replaced_template(self):
+        replacement = self.write("template.tmp", "<main>{{ Content }}</main>")
+        os.replace(replacement, self.template)
+        self.assertEqual(self.watcher.changes(timeout=1), {self.template})
+
+class TestPollingWatcher(WatcherTests, unittest.TestCase):
+
+    def create(self, paths):
+        return PollingWatcher(paths, interval=0.01)
+
+    def write(self, name, text):
+        path = super().write(name, text)
+        # Make sure the mtime moves even on filesystems with coarse timestamps.
+        os.utime(path, ns=(1, os.stat(path).st_mtime_ns + 1_000_000_000))
+        return path
+
+class TestInotifyWatcher(WatcherTests, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        watcher = create_watcher([])
+        available = isinstance(watcher, InotifyWatcher)
+        watcher.close()
+        if not available:
+            raise unittest.SkipTest("inotify is not available")
+
+    def create(self, paths):
+        return InotifyWatcher(paths)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import threading
+import unittest
+from profiling import Profile
+from writer import PageWriter
+
+class TestPageWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_output(self, name):
+        with open(os.path.join(self.output, name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_pages(self):
+        for writers in (0, 1, 4):
+            for sync in ("none", "page", "build"):
+                with PageWriter(self.output, writers, sync=sync) as writer:
+                    for i in range(20):
+                        writer.write(f"dir{i % 3}/page{i}.html", f"<p>{writers} {sync} {i} é</p>")
+                self.assertEqual(writer.written, 20)
+                self.assertEqual(self.read_output("dir1/page4.html"), f"<p>{writers} {sync} 4 é</p>")
+
+    def test_invalid_sync_policy(self):
+        with self.assertRaises(ValueError):
+            PageWriter(self.output, sync="always")
+
+    def test_error_is_raised_on_close(self):
+        with open(os.path.join(self.output, "file"), "w"):
+            pass
+        writer = PageWriter(self.output, 2)
+        writer.write("file/page.html", "<p></p>")
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_full_queue_blocks(self):
+        release = threading.Event()
+        writer = PageWriter(self.output, 1, queue_size=1)
+        write = writer._write
+        writer._write = lambda output, html: (release.wait(), write(output, html))
+        writer.write("a.html", "a")
+        writer.write("b.html", "b")
+        third = threading.Thread(target=writer.write, args=("c.html", "c"))
+        third.start()
+        third.join(0.1)
+        self.assertTrue(third.is_alive())
+        release.set()
+        third.join()
+        writer.close()
+        self.assertEqual(writer.written, 3)
+
+    def test_record(self):
+        profile = Profile()
+        with PageWriter(self.output) as writer:
+            writer.write("index.html", "héllo")
+        writer.record(profile)
+        self.assertEqual(profile.spans["write"][0], 1)
+        self.assertEqual(profile.counters["bytes_written"], 6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,8 +28,8 @@ class TextNode:
     -----------
     text : str
         The text content of the node.
-    text_type : str
-        The type of the text, derived from the provided enum value.
+    text_type : TextType
+        The type of the text.
     url : Optional[str]
         An optional URL associated with the text node.
 
@@ -42,15 +42,65 @@ class TextNode:
     __repr__() -> str:
         Returns a string representation of the TextNode instance.
     """
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type_enum: TextType, url: Optional[str] = None):
         if not isinstance(text_type_enum, TextType):
             raise ValueError("text_type_enum must be an instance of TextType")
         self.text = text
-        self.text_type = text_type_enum.value
+        self.text_type = text_type_enum
         self.url = url
     
     def __eq__(self, other: 'TextNode') -> bool:
         return self.text == other.text and self.text_type == other.text_type and self.url == other.url
     
     def __repr__(self) -> str:
-        return f"TextNode({self.text}, {self.text_type}, {self.url})"
+        return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
+
+# The slot holding TextNode.text, which SpanTextNode uses to cache its text once materialized.
+_TEXT_SLOT = TextNode.text
+
+class SpanTextNode(TextNode):
+    """
+    A TextNode whose text is a span of a larger buffer, sliced out only when first read.
+
+    The buffer is a str, or any bytes-like object holding UTF-8, such as bytes or an mmap
+    of the markdown file, in which case start and end are byte offsets. The buffer must
+    stay open until the text of every node has been read.
+
+    Attributes:
+    -----------
+    buffer : Union[str, bytes, mmap.mmap]
+        The source the span points into.
+    start : int
+        Offset of the first character of the text in buffer.
+    end : int
+        Offset just past the last character of the text in buffer.
+    """
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer, start: int, end: int, text_type_enum: TextType, url: Optional[str] = None):
+        if not isinstance(text_type_enum, TextType):
+            raise ValueError("text_type_enum must be an instance of TextType")
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.text_type = text_type_enum
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        try:
+            return _TEXT_SLOT.__get__(self)
+        except AttributeError:
+            text = slice_text(self.buffer, self.start, self.end)
+            _TEXT_SLOT.__set__(self, text)
+            return text
+
+def slice_text(buffer, start: int, end: int) -> str:
+    """
+    Returns buffer[start:end] as a str, decoding it as UTF-8 unless buffer is a str already.
+    """
+    if isinstance(buffer, str):
+        return buffer[start:end]
+    return str(buffer[start:end], "utf-8")
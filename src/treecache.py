@@ -0,0 +1,163 @@
+from typing import List, Optional, Tuple
+import marshal
+import os
+import shutil
+import zlib
+
+from htmlnode import EMPTY_PROPS, FrozenProps, HTMLNode, LeafNode, ParentNode, walk
+from profiling import count
+
+# Bump whenever parsing the same markdown would produce a different tree, or the
+# encoding of trees changes, so entries written by older versions are never loaded.
+PARSER_VERSION = 2
+TREE_EXTENSION = ".tree"
+TREE_CACHE_SIZE = 256 * 1024 * 1024
+# The fastest zlib level already shrinks marshalled trees about fourfold.
+TREE_COMPRESSION = 1
+
+def encode_tree(nodes: List[HTMLNode]) -> tuple:
+    """
+    Converts nodes into a flat tuple that marshal can store however deep the tree is.
+
+    Nodes are listed in document order. A leaf becomes (tag, value, props) and a parent
+    (tag, number of children, props), followed by its descendants, where props is a
+    tuple of (name, value) pairs.
+    """
+    encoded = []
+    for node in walk(nodes):
+        if isinstance(node, LeafNode):
+            encoded.append((node.tag, node.value, node.props.pairs))
+        else:
+            encoded.append((node.tag, len(node.children), node.props.pairs))
+    return tuple(encoded)
+
+def decode_tree(data: tuple) -> List[HTMLNode]:
+    """
+    Rebuilds the nodes encoded by encode_tree.
+    """
+    # Pages repeat the same few attribute sets, e.g. links to one URL, so each distinct
+    # set becomes one FrozenProps shared by every node using it.
+    props = {(): EMPTY_PROPS}
+    roots = []
+    # The children list and number of children still to come of each open parent.
+    parents = []
+    for tag, value, pairs in data:
+        node_props = props.get(pairs)
+        if node_props is None:
+            node_props = props[pairs] = FrozenProps(pairs)
+        if value.__class__ is str:
+            node = LeafNode(tag, value, node_props)
+        else:
+            children = []
+            node = ParentNode(tag, children, node_props)
+        if parents:
+            parent = parents[-1]
+            parent[0].append(node)
+            parent[1] -= 1
+            if not parent[1]:
+                parents.pop()
+        else:
+            roots.append(node)
+        if value.__class__ is not str and value:
+            parents.append([children, value])
+    return roots
+
+class TreeCache:
+    """
+    Parsed pages stored on disk, so a page whose markdown did not change is not parsed
+    again when it has to be re-rendered, e.g. after a template change.
+
+    Each entry holds a page's title and block nodes in the flat form produced by
+    encode_tree, marshalled and compressed with zlib, in a file named after the content
+    hash of the source, PARSER_VERSION and the marshal format version. Reading an entry
+    marks it as used; once the entries take up more than max_bytes, evict deletes the
+    ones used longest ago.
+
+    Attributes:
+    -----------
+    directory : str
+        Directory holding the entries, created on the first write.
+    max_bytes : int
+        Total size the entries are trimmed back to by evict.
+    """
+    def __init__(self, directory: str, max_bytes: int = TREE_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path_for(self, source_hash: str) -> str:
+        return os.path.join(self.directory, f"{source_hash}-{PARSER_VERSION}-{marshal.version}{TREE_EXTENSION}")
+
+    def get(self, source_hash: str) -> Optional[Tuple[Optional[str], List[HTMLNode]]]:
+        """
+        Returns the title, or None for a page without a "# " heading, and the block nodes
+        of the source with this hash, or None when it is not cached.
+        """
+        path = self.path_for(source_hash)
+        try:
+            with open(path, "rb") as f:
+                title, data = marshal.loads(zlib.decompress(f.read()))
+            os.utime(path)
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            count("tree_cache_misses")
+            return None
+        count("tree_cache_hits")
+        return title, decode_tree(data)
+
+    def put(self, source_hash: str, title: Optional[str], nodes: List[HTMLNode]) -> None:
+        """
+        Stores the title and block nodes parsed from the source with this hash.
+        """
+        path = self.path_for(source_hash)
+        os.makedirs(self.directory, exist_ok=True)
+        # Worker processes may store the same page at once, so each writes its own file.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(marshal.dumps((title, encode_tree(nodes))), TREE_COMPRESSION))
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """
+        Deletes the entries used longest ago until the rest fit in max_bytes, returning
+        the number deleted.
+        """
+        try:
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            return 0
+        with entries:
+            files = [(entry.stat().st_mtime_ns, entry.stat().st_size, entry.path) for entry in entries if entry.name.endswith(TREE_EXTENSION)]
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Deletes every entry along with the cache directory.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+# Cache used by render_markdown, or None when parsed trees are not cached.
+_tree_cache: Optional[TreeCache] = None
+
+def enable_tree_cache(cache: TreeCache) -> None:
+    """
+    Makes page rendering in the current process read and store parsed trees in cache.
+    """
+    global _tree_cache
+    _tree_cache = cache
+
+def disable_tree_cache() -> None:
+    global _tree_cache
+    _tree_cache = None
+
+def active_tree_cache() -> Optional[TreeCache]:
+    return _tree_cache
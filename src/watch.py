@@ -0,0 +1,192 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Editors often save in several steps (write, rename, chmod), so once something
+# changes the watcher keeps collecting events until this long has passed quietly.
+SETTLE_TIME = 0.01
+POLL_INTERVAL = 0.05
+
+def _walk_files(root: str) -> Iterable[str]:
+    if os.path.isfile(root):
+        yield root
+        return
+    for directory, _, files in os.walk(root):
+        for name in files:
+            yield os.path.join(directory, name)
+
+class PollingWatcher:
+    """
+    Detects changes to files by comparing the size and mtime of every file under the
+    watched paths, scanning them every `interval` seconds. Works on any platform.
+
+    Attributes:
+    -----------
+    paths : List[str]
+        Absolute paths of the watched files and directories.
+    interval : float
+        Seconds between scans.
+    """
+    def __init__(self, paths: Iterable[str], interval: float = POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.paths:
+            for path in _walk_files(root):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Waits until files are created, modified or deleted, or until timeout seconds
+        have passed, and returns the absolute paths of the changed files.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys() if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+class InotifyWatcher:
+    """
+    Detects changes to files with Linux inotify, so edits are seen as soon as they are
+    written without rescanning the watched trees.
+
+    Directories are watched recursively, including ones created later. A watched file
+    is tracked through its parent directory so it survives editors replacing it.
+
+    Raises:
+    OSError: If inotify is not available.
+    """
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, paths: Iterable[str]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Dict[int, str] = {}
+        self._files: Set[str] = set()
+        self._recursive: Set[str] = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self._recursive.add(path)
+                self._watch_tree(path)
+            else:
+                self._files.add(path)
+                self._watch(os.path.dirname(path))
+
+    def _watch(self, directory: str) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+        self._directories[wd] = directory
+
+    def _watch_tree(self, root: str) -> List[str]:
+        files = []
+        for directory, _, names in os.walk(root):
+            try:
+                self._watch(directory)
+            except OSError:
+                # Removed again before it could be watched.
+                continue
+            files.extend(os.path.join(directory, name) for name in names)
+        return files
+
+    def _is_watched(self, path: str) -> bool:
+        return path in self._files or any(path.startswith(root + os.sep) for root in self._recursive)
+
+    def _read_events(self, changed: Set[str]) -> None:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped: report every watched file as changed.
+                for root in self._recursive | self._files:
+                    changed.update(_walk_files(root))
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if not self._is_watched(path):
+                continue
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    changed.update(self._watch_tree(path))
+                else:
+                    changed.add(path)
+            else:
+                changed.add(path)
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Waits until files are created, modified or deleted, or until timeout seconds
+        have passed, and returns the absolute paths of the changed files. A moved or
+        deleted directory is reported as the directory path itself.
+        """
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            self._read_events(changed)
+            ready, _, _ = select.select([self.fd], [], [], SETTLE_TIME)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+def create_watcher(paths: Iterable[str], polling: bool = False):
+    """
+    Returns an InotifyWatcher where inotify is available, otherwise a PollingWatcher.
+
+    Args:
+        paths (Iterable[str]): Files and directories to watch.
+        polling (bool): Always use the PollingWatcher.
+    """
+    paths = list(paths)
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
@@ -0,0 +1,130 @@
+from typing import List, Optional, Set
+import os
+import queue
+import threading
+import time
+
+from profiling import Profile
+
+# What is flushed to disk and when: "none" leaves it to the operating system, "page"
+# fsyncs every page before the next is written, "build" syncs once when writing ends.
+SYNC_POLICIES = ("none", "page", "build")
+WRITERS = 4
+QUEUE_SIZE = 64
+
+class PageWriter:
+    """
+    Writes rendered pages to the output directory from a pool of threads, so the
+    filesystem work of one page overlaps with rendering the next.
+
+    Pages wait in a queue of at most `queue_size` entries; once it is full, write
+    blocks until a thread has taken one off, so a fast renderer cannot pile up pages
+    in memory. With no threads, write saves the page before returning.
+
+    Errors raised while writing are re-raised by the next write or by close.
+
+    Attributes:
+    -----------
+    output_dir : str
+        Directory the pages are written to.
+    writers : int
+        Number of writing threads, started with the first page.
+    sync : str
+        One of SYNC_POLICIES.
+    written : int
+        Number of pages written so far.
+    bytes_written : int
+        Number of bytes written so far.
+    """
+    def __init__(self, output_dir: str, writers: int = WRITERS, queue_size: int = QUEUE_SIZE, sync: str = "none"):
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Invalid sync policy: {sync}")
+        self.output_dir = output_dir
+        self.writers = writers
+        self.sync = sync
+        self.written = 0
+        self.bytes_written = 0
+        self._seconds = 0.0
+        self._lock = threading.Lock()
+        self._directories: Set[str] = set()
+        self._error: Optional[BaseException] = None
+        self._queue = queue.Queue(queue_size)
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> 'PageWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, output: str, html: str) -> None:
+        """
+        Queues html to be written to output, a path relative to output_dir.
+        """
+        if self._error is not None:
+            raise self._error
+        if not self.writers:
+            self._write(output, html)
+            return
+        if not self._threads:
+            for _ in range(self.writers):
+                thread = threading.Thread(target=self._run, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._queue.put((output, html))
+
+    def close(self) -> None:
+        """
+        Waits for every queued page to be written, applies the "build" sync policy and
+        stops the threads.
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._error is not None:
+            raise self._error
+        if self.sync == "build" and self.written and hasattr(os, "sync"):
+            os.sync()
+
+    def record(self, profile: Profile) -> None:
+        """
+        Adds the time spent writing and the bytes written to profile, as the "write"
+        span and the "bytes_written" counter.
+        """
+        if self.written:
+            profile.add_time("write", self._seconds, self.written)
+            profile.count("bytes_written", self.bytes_written)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                # Keep draining so write never blocks on a queue nobody empties.
+                continue
+            try:
+                self._write(*item)
+            except BaseException as e:
+                self._error = e
+
+    def _write(self, output: str, html: str) -> None:
+        start = time.perf_counter()
+        path = os.path.join(self.output_dir, output)
+        directory = os.path.dirname(path)
+        if directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+        data = html.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+            if self.sync == "page":
+                f.flush()
+                os.fsync(f.fileno())
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.written += 1
+            self.bytes_written += len(data)
+            self._seconds += seconds